@@ -0,0 +1,85 @@
+import os
+import bpy
+from bpy.props import BoolProperty
+from .importer.importer import Importer
+from .exporter.exporter import Exporter
+from .util.profiler import Profiler
+from bpy_extras.io_utils import ImportHelper, ExportHelper
+ 
+class ImportFLVER(bpy.types.Operator, ImportHelper):
+    bl_idname = "import_scene.flver"
+    bl_label = "Import FLVER File"
+    bl_options = {'PRESET'}
+    filepath = ""
+
+    filename_ext = ".flver"
+
+    profile: BoolProperty(name="Profile", description="Print a per-section timing report to the console", default=False)
+
+    def execute(self, context):
+        self.report({'INFO'}, f"Importing FLVER file: {self.filepath}")
+
+        profiler = Profiler() if self.profile else None
+        Importer.do_import(self.filepath, profiler)
+        if profiler is not None:
+            print(profiler.format())
+        
+        return {'FINISHED'}
+    
+def menu_func_import(self, context):
+    self.layout.operator(ImportFLVER.bl_idname, text="FLVER (.flver)")
+
+class ExportFLVER(bpy.types.Operator, ExportHelper):
+    bl_idname = "export_scene.flver"
+    bl_label = "Export FLVER File"
+    bl_options = {'PRESET'}
+    filepath = ""
+
+    filename_ext = ".flver"
+
+    def execute(self, context):
+        self.report({'INFO'}, f"Exporting FLVER file: {self.filepath}")
+
+        try:
+            Exporter.do_export(self.filepath, context.selected_objects)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        return {'FINISHED'}
+
+def menu_func_export(self, context):
+    self.layout.operator(ExportFLVER.bl_idname, text="FLVER (.flver)")
+
+class FLVEREditor_PT_MainPanel(bpy.types.Panel):
+    bl_idname = "FLVEREditor_PT_MainPanel"
+    bl_label = "FLVER Editor"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Test Addon"
+    bl_context = "objectmode"
+ 
+    def draw(self, context):
+ 
+        layout = self.layout
+ 
+        row = layout.row()
+        row.label(text="How cool is this!")
+        row = layout.row()
+        row.label(text=os.getcwd())
+ 
+ 
+def register():
+    bpy.utils.register_class(ImportFLVER)
+    bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    bpy.utils.register_class(ExportFLVER)
+    bpy.types.TOPBAR_MT_file_export.append(menu_func_export)
+    bpy.utils.register_class(FLVEREditor_PT_MainPanel)
+ 
+ 
+def unregister():
+    bpy.utils.unregister_class(ImportFLVER)
+    bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
+    bpy.utils.unregister_class(ExportFLVER)
+    bpy.types.TOPBAR_MT_file_export.remove(menu_func_export)
+    bpy.utils.unregister_class(FLVEREditor_PT_MainPanel)
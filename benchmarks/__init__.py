@@ -0,0 +1,2 @@
+from .fixtures import Fixtures
+from .benchmark import Benchmark
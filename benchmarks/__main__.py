@@ -0,0 +1,4 @@
+import sys
+from .benchmark import main
+
+sys.exit(main())
@@ -0,0 +1,209 @@
+import gc
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from typing import Callable, Dict, List
+from .fixtures import Fixtures
+from ..binder.bnd4 import BND4
+from ..formats.dcx import DCX
+from ..formats.flver2.flver2 import FLVER2
+from ..util.binary_reader_ex import BinaryReaderEx
+from ..util.binary_writer_ex import BinaryWriterEx
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Times the parsing and writing stack on synthetic fixtures:
+#   python -m <addon directory>.benchmarks [--quick] [-o results.json] [--compare baseline.json]
+# Every case reports the best of several runs as MB/s of input and items/s (vertices, or
+# indices for triangulation), plus the tracemalloc peak of one extra, untimed run.
+
+class Benchmark:
+    class Case:
+        def __init__(self, name: str, function: Callable, size: int, items: int = 0, unit: str = "vertices"):
+            self.name = name
+            self.function = function
+            self.size = size
+            self.items = items
+            self.unit = unit
+
+    # (name, meshes, vertices, layouts, strip, index_size)
+    FLVERS = [
+        ("static_list16", 8, 4000, ("static",), False, 16),
+        ("skinned_strip16", 8, 4000, ("skinned",), True, 16),
+        ("wide_list32", 4, 8000, ("wide",), False, 32),
+        ("mixed_strip32", 12, 2000, ("static", "skinned", "wide"), True, 32),
+    ]
+    QUICK_SCALE = 8
+    # Entries of the binders BND4.find is timed on, every entry is looked up once per run.
+    LOOKUP_ENTRIES = 2000
+
+    @staticmethod
+    def read_flver(data: bytes, lazy: bool = False) -> FLVER2:
+        flver = FLVER2()
+        flver.read(BinaryReaderEx(False, data), lazy)
+        return flver
+
+    @staticmethod
+    def write_flver(flver: FLVER2) -> bytearray:
+        bw = BinaryWriterEx(False)
+        flver.write(bw)
+        return bw.finish()
+
+    @staticmethod
+    def read_bnd4(data: bytes) -> BND4:
+        bnd = BND4()
+        bnd.read(BinaryReaderEx(False, data))
+        return bnd
+
+    @staticmethod
+    def find_all(data: bytes, names: List[str]):
+        bnd = BND4()
+        bnd.open(BinaryReaderEx(False, data))
+        for name in names:
+            if bnd.find(name) is None:
+                raise RuntimeError(f"{name} not found.")
+
+    @staticmethod
+    def triangulate(flver: FLVER2):
+        for mesh in flver.meshes:
+            for face_set in mesh.face_sets:
+                face_set.triangluate(True)
+
+    @staticmethod
+    def cases(quick: bool = False) -> List["Benchmark.Case"]:
+        cases = []
+        flvers = {}
+        for name, meshes, vertices, layouts, strip, index_size in Benchmark.FLVERS:
+            if quick:
+                vertices //= Benchmark.QUICK_SCALE
+            data = Fixtures.flver(meshes, vertices, layouts, strip, index_size)
+            flvers[name] = data
+            vertex_count = meshes * vertices
+            cases.append(Benchmark.Case(f"FLVER2.read {name}", lambda data=data: Benchmark.read_flver(data), len(data), vertex_count))
+            cases.append(Benchmark.Case(f"FLVER2.read lazy {name}", lambda data=data: Benchmark.read_flver(data, True), len(data), vertex_count))
+
+            flver = Benchmark.read_flver(data)
+            index_count = sum(len(face_set.indices) for mesh in flver.meshes for face_set in mesh.face_sets)
+            cases.append(Benchmark.Case(f"FLVER2.write {name}", lambda flver=flver: Benchmark.write_flver(flver), len(data), vertex_count))
+            cases.append(Benchmark.Case(f"FaceSet.triangluate {name}", lambda flver=flver: Benchmark.triangulate(flver),
+                                        index_count * (2 if index_size == 16 else 4), index_count, "indices"))
+
+        binder = Fixtures.binder(flvers)
+        compressed_binder = Fixtures.binder(flvers, True)
+        vertex_count = sum(meshes * (vertices // Benchmark.QUICK_SCALE if quick else vertices) for _, meshes, vertices, *_ in Benchmark.FLVERS)
+        cases.append(Benchmark.Case("BND4.read", lambda: Benchmark.read_bnd4(binder), len(binder)))
+        cases.append(Benchmark.Case("BND4.read compressed entries", lambda: Benchmark.read_bnd4(compressed_binder), len(compressed_binder)))
+
+        for name, dcx in (("DFLT", Fixtures.dcx_dflt(binder)), ("EDGE", Fixtures.dcx_edge(binder))):
+            # Throughput is measured against the decompressed size for both.
+            cases.append(Benchmark.Case(f"DCX.decompress {name}", lambda dcx=dcx: DCX.decompress(BinaryReaderEx(False, dcx), DCX.CompressionType.UNKOWN), len(binder)))
+
+        entry_count = Benchmark.LOOKUP_ENTRIES // (Benchmark.QUICK_SCALE if quick else 1)
+        names = [f"c{i:04}_0000" for i in range(entry_count)]
+        queries = [Fixtures.entry_name(name).upper().replace("\\", "/") for name in names]
+        for label, hash_table in (("hash table", True), ("name index", False)):
+            lookup_binder = Fixtures.binder({name: bytes(0x10) for name in names}, hash_table=hash_table)
+            cases.append(Benchmark.Case(f"BND4.open + find {label}", lambda data=lookup_binder: Benchmark.find_all(data, queries),
+                                        len(lookup_binder), entry_count, "lookups"))
+
+        def read_all():
+            bnd = BND4()
+            bnd.open(BinaryReaderEx(False, binder))
+            for file in bnd.iter_files():
+                Benchmark.read_flver(file.bytes)
+        cases.append(Benchmark.Case("BND4.open + FLVER2.read all", read_all, len(binder), vertex_count))
+        return cases
+
+    @staticmethod
+    def measure(case: "Benchmark.Case", repeat: int) -> Dict:
+        case.function()
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            case.function()
+            times.append(time.perf_counter() - start)
+
+        gc.collect()
+        tracemalloc.start()
+        case.function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        best = min(times)
+        result = {"name": case.name, "seconds": best, "median_seconds": sorted(times)[len(times) // 2],
+                  "bytes": case.size, "mb_per_second": case.size / best / 1e6, "peak_memory": peak}
+        if case.items:
+            result["items"] = case.items
+            result["unit"] = case.unit
+            result["items_per_second"] = case.items / best
+        return result
+
+    @staticmethod
+    def run(quick: bool = False, repeat: int = 5, filter: str = None) -> Dict:
+        results = []
+        for case in Benchmark.cases(quick):
+            if filter and filter.lower() not in case.name.lower():
+                continue
+            result = Benchmark.measure(case, repeat)
+            results.append(result)
+            print(Benchmark.format(result), flush=True)
+        return {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__ if np is not None else None,
+            "quick": quick,
+            "repeat": repeat,
+            "results": results,
+        }
+
+    @staticmethod
+    def format(result: Dict) -> str:
+        line = f"{result['name']:42} {result['seconds'] * 1000:9.2f} ms {result['mb_per_second']:9.1f} MB/s"
+        if "items_per_second" in result:
+            line += f" {result['items_per_second'] / 1e6:8.2f} M {result['unit']}/s"
+        return line + f"   peak {result['peak_memory'] / 2 ** 20:.1f} MiB"
+
+    @staticmethod
+    def compare(report: Dict, baseline: Dict, threshold: float) -> List[str]:
+        # Cases that got slower than the baseline by more than threshold (0.1 = 10%).
+        baseline_seconds = {result["name"]: result["seconds"] for result in baseline["results"]}
+        regressions = []
+        for result in report["results"]:
+            before = baseline_seconds.get(result["name"])
+            if before and result["seconds"] > before * (1 + threshold):
+                regressions.append(f"{result['name']}: {before * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms "
+                                   f"(+{(result['seconds'] / before - 1) * 100:.0f}%)")
+        return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark FLVER2, BND4, DCX and face set triangulation on synthetic files.")
+    parser.add_argument("--quick", action="store_true", help=f"fixtures {Benchmark.QUICK_SCALE}x smaller, for a fast sanity run")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="timed runs per case, the best one is reported")
+    parser.add_argument("-k", "--filter", default=None, help="only run cases whose name contains this")
+    parser.add_argument("-o", "--output", default=None, help="write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="JSON results of an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown that counts as a regression, default 0.1")
+    args = parser.parse_args(argv)
+
+    report = Benchmark.run(args.quick, args.repeat, args.filter)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = Benchmark.compare(report, json.load(f), args.threshold)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
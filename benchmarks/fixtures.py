@@ -0,0 +1,330 @@
+import zlib
+import random
+from struct import Struct
+from typing import Dict, List, Tuple
+from ..util.sf_util import SFUtil
+from ..util.binary_writer_ex import BinaryWriterEx
+
+class Fixtures:
+    # Synthetic FLVER2 files and the containers they ship in, deterministic for a given seed.
+    # Layout members are (semantic, type) pairs, the sizes and values follow FLVER.LayoutMember.
+    TYPES = {"FLOAT2": (0x01, 8), "FLOAT3": (0x02, 12), "FLOAT4": (0x03, 16), "BYTE4A": (0x10, 4), "BYTE4B": (0x11, 4),
+             "SHORT2TOFLOAT2": (0x12, 4), "BYTE4C": (0x13, 4), "UV": (0x15, 4), "UVPAIR": (0x16, 8), "SHORTBONEINDICES": (0x18, 8),
+             "SHORT4TOFLOAT4A": (0x1A, 8), "SHORT4TOFLOAT4B": (0x2E, 8), "BYTE4E": (0x2F, 4)}
+    SEMANTICS = {"POSITION": 0, "BONEWEIGHTS": 1, "BONEINDICES": 2, "NORMAL": 3, "UV": 5, "TANGENT": 6, "BITANGENT": 7, "VERTEXCOLOR": 10}
+
+    LAYOUTS = {
+        "static": [("POSITION", "FLOAT3"), ("NORMAL", "BYTE4C"), ("TANGENT", "BYTE4C"), ("VERTEXCOLOR", "BYTE4C"), ("UV", "UV"), ("UV", "UVPAIR")],
+        "skinned": [("POSITION", "FLOAT3"), ("BONEWEIGHTS", "SHORT4TOFLOAT4A"), ("BONEINDICES", "BYTE4B"), ("NORMAL", "BYTE4A"),
+                    ("TANGENT", "BYTE4A"), ("BITANGENT", "BYTE4A"), ("UV", "SHORT2TOFLOAT2"), ("VERTEXCOLOR", "FLOAT4")],
+        "wide": [("POSITION", "FLOAT4"), ("NORMAL", "FLOAT4"), ("BONEWEIGHTS", "BYTE4C"), ("BONEINDICES", "SHORTBONEINDICES"),
+                 ("UV", "FLOAT2"), ("UV", "FLOAT3"), ("UV", "SHORT4TOFLOAT4B"), ("TANGENT", "FLOAT4")],
+    }
+
+    structs: Dict[Tuple[bool, str], Struct] = {}
+
+    @staticmethod
+    def write(w: BinaryWriterEx, f: str, *values):
+        # Records of several fields, packed with one Struct per format and byte order.
+        key = (w.big_endian, f)
+        s = Fixtures.structs.get(key)
+        if s is None:
+            s = Fixtures.structs[key] = Struct((">" if w.big_endian else "<") + f)
+        w.pack_struct(s, *values)
+
+    @staticmethod
+    def write_member(w: BinaryWriterEx, semantic: str, type: str, rnd: random.Random):
+        if type == "FLOAT2":
+            Fixtures.write(w, "2f", rnd.random(), rnd.random())
+        elif type == "FLOAT3":
+            Fixtures.write(w, "3f", *(rnd.uniform(-10, 10) for _ in range(3)))
+        elif type == "FLOAT4" and semantic == "POSITION":
+            Fixtures.write(w, "4f", rnd.uniform(-10, 10), rnd.uniform(-10, 10), rnd.uniform(-10, 10), 0)
+        elif type == "FLOAT4" and semantic == "NORMAL":
+            Fixtures.write(w, "4f", rnd.uniform(-1, 1), rnd.uniform(-1, 1), rnd.uniform(-1, 1), rnd.randint(0, 3))
+        elif type == "FLOAT4":
+            Fixtures.write(w, "4f", *(rnd.uniform(-1, 1) for _ in range(4)))
+        elif semantic == "UV" and type == "SHORT4TOFLOAT4B":
+            Fixtures.write(w, "4h", rnd.randint(-2048, 2048), rnd.randint(-2048, 2048), rnd.randint(-2048, 2048), 0)
+        elif semantic == "UV" or type == "UV":
+            count = 4 if type == "UVPAIR" else 2
+            Fixtures.write(w, f"{count}h", *(rnd.randint(-2048, 2048) for _ in range(count)))
+        elif type == "SHORTBONEINDICES":
+            Fixtures.write(w, "4H", *(rnd.randint(0, 300) for _ in range(4)))
+        elif type == "SHORT4TOFLOAT4A":
+            Fixtures.write(w, "4h", *(rnd.randint(-32767, 32767) for _ in range(4)))
+        elif type == "SHORT4TOFLOAT4B":
+            Fixtures.write(w, "4H", *(rnd.randint(0, 65535) for _ in range(4)))
+        else:
+            Fixtures.write(w, "4B", *(rnd.randint(0, 255) for _ in range(4)))
+
+    @staticmethod
+    def strip_indices(vertex_count: int, count: int, rnd: random.Random) -> List[int]:
+        # Random runs of 3 to 12 indices separated by primitive restarts.
+        indices = []
+        while len(indices) < count:
+            indices.extend(rnd.randrange(vertex_count) for _ in range(rnd.randint(3, 12)))
+            indices.append(0xFFFF)
+        return indices[:count]
+
+    @staticmethod
+    def flver(meshes: int = 2, vertices: int = 1000, layouts=("static",), strip: bool = False, index_size: int = 16,
+              version: int = 0x20014, dummies: int = 8, bones: int = 16, big_endian: bool = False, seed: int = 0) -> bytes:
+        # Mesh i uses layouts[i % len(layouts)]; every mesh has one face set of vertices * 3 indices.
+        rnd = random.Random(seed)
+        w = BinaryWriterEx(big_endian)
+        layout_defs = [Fixtures.LAYOUTS[layout] if isinstance(layout, str) else layout for layout in layouts]
+        index_format = "H" if index_size == 16 else "I"
+
+        w.write_bytes(b"FLVER\0" + (b"B\0" if big_endian else b"L\0"))
+        Fixtures.write(w, "i", version)
+        w.reserve_int32("data_offset")
+        w.reserve_int32("data_size")
+        Fixtures.write(w, "5i", dummies, meshes, bones, meshes, meshes)
+        Fixtures.write(w, "6f", -1, -1, -1, 1, 1, 1)
+        Fixtures.write(w, "2i", 0, 0)
+        Fixtures.write(w, "4B", 0 if version >= 0x20013 else index_size, 1, 0, 0)
+        Fixtures.write(w, "i", 0)
+        Fixtures.write(w, "3i", meshes, len(layout_defs), meshes * 2)
+        Fixtures.write(w, "4B", 0, 0, 0, 0)
+        Fixtures.write(w, "8i", *([0] * 8))
+
+        for i in range(dummies):
+            Fixtures.write(w, "3f4B3f2h", i, i + 1, i + 2, 255, 255, 255, 255, 0, 0, 1, 100 + i, -1)
+            Fixtures.write(w, "3fh2B4i", 0, 1, 0, i % max(bones, 1), 0, 1, 0, 0, 0, 0)
+        for i in range(meshes):
+            w.reserve_int32(f"material_name{i}")
+            w.reserve_int32(f"material_mtd{i}")
+            Fixtures.write(w, "3i", 2, 2 * i, 0)
+            w.reserve_int32(f"gx_offset{i}")
+            Fixtures.write(w, "2i", 0, 0)
+        for i in range(bones):
+            Fixtures.write(w, "3f", i, 0, 0)
+            w.reserve_int32(f"bone_name{i}")
+            Fixtures.write(w, "3f2h", 0, 0.5, 0, i - 1, i + 1 if i + 1 < bones else -1)
+            Fixtures.write(w, "3f2h3fi3f", 1, 1, 1, -1, -1, -1, -1, -1, 0, 1, 1, 1)
+            w.write_bytes(bytes(0x34))
+        for i in range(meshes):
+            Fixtures.write(w, "4B4i", 1, 0, 0, 0, i, 0, 0, 0)
+            Fixtures.write(w, "i", 3)
+            w.reserve_int32(f"bounding_box{i}")
+            w.reserve_int32(f"bone_indices{i}")
+            Fixtures.write(w, "i", 1)
+            w.reserve_int32(f"face_set_indices{i}")
+            Fixtures.write(w, "i", 1)
+            w.reserve_int32(f"vertex_buffer_indices{i}")
+
+        indices = []
+        for i in range(meshes):
+            if strip:
+                indices.append(Fixtures.strip_indices(vertices, vertices * 3, rnd))
+            else:
+                indices.append([rnd.randrange(vertices) for _ in range(vertices * 3)])
+            Fixtures.write(w, "I2Bhi", 0, 1 if strip else 0, 1, 0, len(indices[i]))
+            w.reserve_int32(f"face_set_data{i}")
+            if version > 0x20005:
+                Fixtures.write(w, "4i", len(indices[i]) * index_size // 8, 0, index_size if version >= 0x20013 else 0, 0)
+        for i in range(meshes):
+            layout_index = i % len(layout_defs)
+            size = sum(Fixtures.TYPES[type][1] for _, type in layout_defs[layout_index])
+            Fixtures.write(w, "6i", 0, layout_index, size, vertices, 0, 0)
+            Fixtures.write(w, "i", size * vertices)
+            w.reserve_int32(f"vertex_buffer_data{i}")
+        for i, layout in enumerate(layout_defs):
+            Fixtures.write(w, "3i", len(layout), 0, 0)
+            w.reserve_int32(f"layout_members{i}")
+        for i in range(meshes * 2):
+            w.reserve_int32(f"texture_path{i}")
+            w.reserve_int32(f"texture_type{i}")
+            Fixtures.write(w, "2f4B3f", 1, 1, 1, 0, 0, 0, 0, 0, 0)
+        if version >= 0x2001A:
+            Fixtures.write(w, "2h2I5i", 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        w.pad(0x10)
+
+        for i, layout in enumerate(layout_defs):
+            w.fill(f"layout_members{i}", w.position)
+            struct_offset = 0
+            counts = {}
+            for semantic, type in layout:
+                counts[semantic] = counts.get(semantic, -1) + 1
+                Fixtures.write(w, "2i2Ii", 0, struct_offset, Fixtures.TYPES[type][0], Fixtures.SEMANTICS[semantic], counts[semantic])
+                struct_offset += Fixtures.TYPES[type][1]
+        for i in range(meshes):
+            w.fill(f"bounding_box{i}", w.position)
+            Fixtures.write(w, "6f", -1, -1, -1, 1, 1, 1)
+            if version >= 0x2001A:
+                Fixtures.write(w, "3f", 0, 0, 0)
+        for i in range(meshes):
+            w.fill(f"bone_indices{i}", w.position)
+            Fixtures.write(w, "3i", 0, 1, 2)
+        for i in range(meshes):
+            w.fill(f"face_set_indices{i}", w.position)
+            Fixtures.write(w, "i", i)
+        for i in range(meshes):
+            w.fill(f"vertex_buffer_indices{i}", w.position)
+            Fixtures.write(w, "i", i)
+        for i in range(meshes):
+            w.fill(f"gx_offset{i}", w.position)
+            w.write_bytes(b"GX00")
+            Fixtures.write(w, "2i", 100, 0xC + 8)
+            w.write_bytes(bytes(range(8)))
+            Fixtures.write(w, "3i", 0x7FFFFFFF, 100, 0xC + 4)
+            w.write_bytes(bytes(4))
+        for i in range(meshes):
+            w.fill(f"material_name{i}", w.position)
+            w.write_utf16(f"Material_{i}")
+            w.fill(f"material_mtd{i}", w.position)
+            w.write_utf16(f"N:\\FDP\\material\\mtd\\p[ARSN]_{i % 3}.mtd")
+        for i in range(meshes * 2):
+            w.fill(f"texture_path{i}", w.position)
+            w.write_utf16(f"N:\\FDP\\tex\\t{i}_{'a' if i % 2 == 0 else 'n'}.tif")
+            w.fill(f"texture_type{i}", w.position)
+            w.write_utf16("g_DiffuseTexture" if i % 2 == 0 else "g_BumpmapTexture")
+        for i in range(bones):
+            w.fill(f"bone_name{i}", w.position)
+            w.write_utf16(f"Bone_{i}")
+        w.pad(0x20)
+
+        data_offset = w.position
+        w.fill("data_offset", data_offset)
+        for i in range(meshes):
+            w.fill(f"face_set_data{i}", w.position - data_offset)
+            restart = 0xFFFF if index_size == 16 else 0xFFFFFFFF
+            Fixtures.write(w, f"{len(indices[i])}{index_format}", *(restart if index == 0xFFFF else index for index in indices[i]))
+            w.pad(0x10)
+        for i in range(meshes):
+            w.fill(f"vertex_buffer_data{i}", w.position - data_offset)
+            layout = layout_defs[i % len(layout_defs)]
+            for _ in range(vertices):
+                for semantic, type in layout:
+                    Fixtures.write_member(w, semantic, type, rnd)
+            w.pad(0x10)
+        w.fill("data_size", w.position - data_offset)
+        return bytes(w.finish())
+
+    @staticmethod
+    def bnd4(entries: List[Tuple[int, str, bytes]], compressed=(), big_endian: bool = False, hash_table: bool = False) -> bytes:
+        # Unicode BND4 with IDs, names and 64-bit offsets. Entries whose index is in compressed are stored as zlib.
+        # With hash_table the binder is extended with a path hash table, laid out like SoulsFormats writes it.
+        w = BinaryWriterEx(big_endian)
+        w.write_bytes(b"BND4")
+        Fixtures.write(w, "6B", 0, 0, 0, 0, 0, 1 if big_endian else 0)
+        Fixtures.write(w, "2B", 0, 0)
+        Fixtures.write(w, "i", len(entries))
+        Fixtures.write(w, "q", 0x40)
+        w.write_bytes(b"07D7R6\0\0")
+        Fixtures.write(w, "q", 0x28)
+        w.reserve_int64("headers_end")
+        Fixtures.write(w, "4Bi", 1, 0x3E, 4 if hash_table else 0, 0, 0)
+        if hash_table:
+            w.reserve_int64("hash_table")
+        else:
+            Fixtures.write(w, "q", 0)
+
+        payloads = []
+        for i, (id, name, data) in enumerate(entries):
+            payload = zlib.compress(data) if i in compressed else data
+            payloads.append(payload)
+            Fixtures.write(w, "4Biqq", 0x41 if i in compressed else 0x40, 0, 0, 0, -1, len(payload), len(data))
+            w.reserve_int64(f"data_offset{i}")
+            Fixtures.write(w, "i", id)
+            w.reserve(f"name_offset{i}", "I")
+        for i, (id, name, data) in enumerate(entries):
+            w.fill(f"name_offset{i}", w.position)
+            w.write_utf16(name)
+        if hash_table:
+            w.pad(0x8)
+            w.fill("hash_table", w.position)
+            Fixtures.hash_table(w, [name for _, name, _ in entries])
+        w.pad(0x10)
+        w.fill("headers_end", w.position)
+
+        for i, payload in enumerate(payloads):
+            w.pad(0x10)
+            w.fill(f"data_offset{i}", w.position)
+            w.write_bytes(payload)
+        return bytes(w.finish())
+
+    @staticmethod
+    def hash_table(w: BinaryWriterEx, names: List[str]):
+        # Path hashes bucketed by hash % group count, the group count being the first prime from a
+        # seventh of the entry count. Groups are (length, index), path hashes (hash, entry index).
+        group_count = max(len(names) // 7, 2)
+        while any(group_count % d == 0 for d in range(2, int(group_count ** 0.5) + 1)):
+            group_count += 1
+
+        groups = [[] for _ in range(group_count)]
+        for i, name in enumerate(names):
+            hash = SFUtil.from_path_hash(name)
+            groups[hash % group_count].append((hash, i))
+
+        w.reserve_int64("path_hashes")
+        Fixtures.write(w, "I4B", group_count, 0x10, 8, 8, 0)
+        index = 0
+        for group in groups:
+            Fixtures.write(w, "2i", len(group), index)
+            index += len(group)
+        w.fill("path_hashes", w.position)
+        for group in groups:
+            for hash, i in sorted(group):
+                Fixtures.write(w, "Ii", hash, i)
+
+    @staticmethod
+    def dcx_dflt(data: bytes, level: int = 9) -> bytes:
+        # DCX_DFLT_10000_24_9
+        compressed = zlib.compress(data, level)
+        w = BinaryWriterEx(True)
+        w.write_bytes(b"DCX\0")
+        Fixtures.write(w, "5i", 0x10000, 0x18, 0x24, 0x44, 0x4C)
+        w.write_bytes(b"DCS\0")
+        Fixtures.write(w, "2I", len(data), len(compressed))
+        w.write_bytes(b"DCP\0DFLT")
+        Fixtures.write(w, "i4Bi4B2i", 0x20, 9, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0x10100)
+        w.write_bytes(b"DCA\0")
+        Fixtures.write(w, "i", 8)
+        w.write_bytes(compressed)
+        return bytes(w.finish())
+
+    @staticmethod
+    def dcx_edge(data: bytes, level: int = 9) -> bytes:
+        # Raw deflate chunks of 64 KiB, stored uncompressed when deflate does not help.
+        chunks = []
+        for start in range(0, len(data), 0x10000):
+            raw = data[start:start + 0x10000]
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+            compressed = compressor.compress(raw) + compressor.flush()
+            chunks.append((compressed, 1) if len(compressed) < len(raw) else (raw, 0))
+
+        blob = bytearray()
+        chunk_offsets = []
+        for chunk, _ in chunks:
+            chunk_offsets.append(len(blob))
+            blob += chunk
+            blob += bytes(-len(blob) % 0x10)
+
+        egdt_size = 0x24 + len(chunks) * 0x10
+        w = BinaryWriterEx(True)
+        w.write_bytes(b"DCX\0")
+        Fixtures.write(w, "5i", 0x10000, 0x18, 0x24, 0x24, 0x50 + len(chunks) * 0x10)
+        w.write_bytes(b"DCS\0")
+        Fixtures.write(w, "2I", len(data), len(blob))
+        w.write_bytes(b"DCP\0EDGE")
+        Fixtures.write(w, "6i", 0x20, 0x9000000, 0x10000, 0, 0, 0x00100100)
+        w.write_bytes(b"DCA\0")
+        Fixtures.write(w, "i", 8 + egdt_size)
+        w.write_bytes(b"EgdT")
+        Fixtures.write(w, "8i", 0x00010100, 0x24, 0x10, 0x10000, len(data) % 0x10000 or 0x10000, egdt_size, len(chunks), 0x100000)
+        for (chunk, flag), offset in zip(chunks, chunk_offsets):
+            Fixtures.write(w, "4i", 0, offset, len(chunk), flag)
+        w.write_bytes(bytes(blob))
+        return bytes(w.finish())
+
+    @staticmethod
+    def binder(flvers: Dict[str, bytes], compressed: bool = False, hash_table: bool = False) -> bytes:
+        names = sorted(flvers)
+        entries = [(i, Fixtures.entry_name(name), flvers[name]) for i, name in enumerate(names)]
+        return Fixtures.bnd4(entries, range(len(entries)) if compressed else (), hash_table=hash_table)
+
+    @staticmethod
+    def entry_name(name: str) -> str:
+        return f"N:\\FDP\\data\\Model\\parts\\{name}.flver"
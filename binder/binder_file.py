@@ -1,3 +1,4 @@
+from typing import Union
 from .binder import Binder
 from ..formats.dcx import DCX
 from ..util.util import Util
@@ -6,7 +7,7 @@ class BinderFile:
     flags: Binder.FileFlags
     id: int
     name: str
-    bytes: bytes
+    bytes: Union[bytes, memoryview]
     compression_type: DCX.CompressionType
 
     def __init__(self, *params):
@@ -17,7 +18,7 @@ class BinderFile:
         self.compression_type = DCX.CompressionType.ZLIB
 
         if params:
-            Util.assert_params(params, Binder.FileFlags, int, str, bytes)
+            Util.assert_params(params, Binder.FileFlags, int, (str, type(None)), (bytes, bytearray, memoryview))
             self.flags = params[0]
             self.id = params[1]
             self.name = params[2]
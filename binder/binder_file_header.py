@@ -1,7 +1,8 @@
 from .binder import Binder
 from .binder_file import BinderFile
-from ..util.binary_reader_ex import BinaryReaderEx
+from ..util.binary_reader_ex import BinaryReaderEx, Encoding
 from ..formats.dcx import DCX
+from ..formats.sniffer import Sniffer
 
 class BinderFileHeader:
     file_flags: Binder.FileFlags
@@ -12,6 +13,9 @@ class BinderFileHeader:
     uncompressed_size: int
     data_offset: int
 
+    __name: str
+    __name_source: tuple
+
     def __init__(self, *args):
         self.file_flags = Binder.FileFlags.FLAG1
         self.id = -1
@@ -23,7 +27,7 @@ class BinderFileHeader:
         
         if args:
             if isinstance(args[0], Binder.FileFlags):
-                self.flags = args[0]
+                self.file_flags = args[0]
 
             if len(args) > 1 and isinstance(args[1], int):
                 self.id = args[1]
@@ -41,16 +45,36 @@ class BinderFileHeader:
                 self.data_offset = args[5]
 
 
+    @property
+    def name(self) -> str:
+        # Names read from a binder are only decoded when first needed, with the encoding the
+        # binder had when its header was read, whatever byte order the shared reader has since.
+        if self.__name_source is not None:
+            br, offset, encoding = self.__name_source
+            self.__name = br.get_terminated(offset, encoding)[0]
+            self.__name_source = None
+        return self.__name
+
+    @name.setter
+    def name(self, name: str):
+        self.__name_source = None
+        self.__name = name
+
+    def sniff(self, br: BinaryReaderEx) -> Sniffer.FormatKind:
+        # Format of the stored data, DCX for compressed entries.
+        return Sniffer.sniff(br.get_view(self.data_offset, min(self.compressed_size, Sniffer.PREFIX_SIZE)))
+
     def read_file_data(self, br: BinaryReaderEx):
-        bytes = bytearray()
         compression_type = DCX.CompressionType.ZLIB
         if Binder.is_compressed(self.file_flags):
-            bytes = br.get_bytes(self.data_offset, self.compressed_size)
-            bytes = DCX.decompress(bytes, compression_type)
+            compressed = BinaryReaderEx(False, br.get_view(self.data_offset, self.compressed_size))
+            compression_type = DCX.detect(compressed)
+            bytes = DCX.decompress(compressed, compression_type)
         else:
-            bytes = br.get_bytes(self.data_offset, self.compressed_size)
+            # Uncompressed entries stay a view into the binder's buffer.
+            bytes = br.get_view(self.data_offset, self.compressed_size)
         
-        binder_file = BinderFile(self.flags, self.id, self.name, bytes)
+        binder_file = BinderFile(self.file_flags, self.id, self.name, bytes)
         binder_file.compression_type = compression_type
 
         return binder_file
@@ -80,19 +104,21 @@ class BinderFileHeader:
         if Binder.has_ids(format):
             id = br.read_int32()
         
-        name: str = None
+        name_offset: int = -1
         if Binder.has_names(format):
             name_offset = br.read_uint32()
-            if unicode:
-                name = br.get_utf16(name_offset)
-            else:
-                name = br.get_shit_jis(name_offset)
         
         if format == Binder.Format.NAMES1:
             id = br.read_int32()
             br.assert_int32(0)
 
-        return BinderFileHeader(flags, id, name, compressed_size, uncompressed_size, data_offset)
+        file_header = BinderFileHeader(flags, id, None, compressed_size, uncompressed_size, data_offset)
+        if name_offset != -1:
+            encoding = Encoding.SHIFT_JIS
+            if unicode:
+                encoding = Encoding.UTF_16_BE if big_endian else Encoding.UTF_16_LE
+            file_header.__name_source = (br, name_offset, encoding)
+        return file_header
 
     
 
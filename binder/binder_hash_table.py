@@ -1,6 +1,48 @@
+from array import array
+from typing import Iterator
+from ..util.util import Util
+from ..util.sf_util import SFUtil
 from ..util.binary_reader_ex import BinaryReaderEx
 
 class BinderHashTable:
+    # Path hashes of a BND4 grouped into buckets by hash % group count. Both arrays are
+    # kept interleaved as read: groups are (length, index) and path hashes (hash, file index).
+    groups: array
+    path_hashes: array
+
+    def __init__(self, *params):
+        self.groups = array("i")
+        self.path_hashes = array("I")
+
+        if len(params) == 1:
+            Util.assert_params(params, BinaryReaderEx)
+            br: BinaryReaderEx = params[0]
+
+            path_hashes_offset = br.read_int64()
+            group_count = br.read_uint32()
+            br.assert_byte(0x10)
+            br.assert_byte(8)
+            br.assert_byte(8)
+            br.assert_byte(0)
+
+            self.groups = br.read_array("i", group_count * 2)
+            path_hash_count = sum(self.groups[0::2])
+            self.path_hashes = br.get_array("I", path_hashes_offset, path_hash_count * 2)
+
+    def find(self, path: str) -> Iterator[int]:
+        # Indices of the files whose path hash matches, normally exactly one.
+        group_count = len(self.groups) // 2
+        if group_count == 0:
+            return
+
+        hash = SFUtil.from_path_hash(path)
+        group = hash % group_count
+        length = self.groups[group * 2]
+        index = self.groups[group * 2 + 1]
+        for i in range(index, index + length):
+            if self.path_hashes[i * 2] == hash:
+                yield self.path_hashes[i * 2 + 1]
+
     @staticmethod
     def Assert(br: BinaryReaderEx):
         br.read_int64()
@@ -1,9 +1,11 @@
-from typing import List
+from fnmatch import fnmatchcase
+from typing import List, Dict, Iterator
 from datetime import *
 from .binder import Binder
 from .binder_file import BinderFile
 from .binder_hash_table import BinderHashTable
 from .binder_file_header import BinderFileHeader
+from ..formats.sniffer import Sniffer
 from ..util.sf_util import SFUtil
 from ..util.binary_reader_ex import BinaryReaderEx
 
@@ -17,26 +19,89 @@ class BND4:
     bit_big_endian: bool
     unicode: bool
     extended: int
+    file_headers: List[BinderFileHeader]
+    # Keyed by normalized path, filled by the first find on a binder without a hash table.
+    names: Dict[str, BinderFileHeader]
+    ids: Dict[int, BinderFileHeader]
+    hash_table: BinderHashTable
+    br: BinaryReaderEx
 
     def __init__(self):
         self.files = []
+        self.file_headers = []
+        self.names = {}
+        self.ids = {}
+        self.hash_table = None
+        self.br = None
         self.version = SFUtil.date_to_binder_timestamp(datetime.now())
         self.format = Binder.Format.IDS | Binder.Format.NAMES1 | Binder.Format.NAMES1 | Binder.Format.COMPRESSION
         self.unicode = True
         self.extended = 4
 
     def Is(self, br: BinaryReaderEx):
-        if br.stream.getbuffer().nbytes < 4:
-            return False
-        
-        magic: str = br.get_ascii(0, 4)
-        return magic == "BND4"
+        return Sniffer.sniff(br.buffer) == Sniffer.FormatKind.BND4
     
     def read(self, br: BinaryReaderEx):
         file_headers = self.read_header(br)
         for file_header in file_headers:
             self.files.append(file_header.read_file_data(br))
 
+    def open(self, br: BinaryReaderEx):
+        # Random access mode: only the file headers are read and indexed, entries are
+        # fetched and decompressed one at a time by get, get_by_id and iter_matching.
+        self.br = br
+        self.hash_table = None
+        self.file_headers = self.read_header(br)
+        self.names = {}
+        self.ids = {}
+        for file_header in self.file_headers:
+            if file_header.id != -1:
+                self.ids.setdefault(file_header.id, file_header)
+
+    def find(self, name: str) -> BinderFileHeader:
+        # With a hash table only the names of entries sharing the path hash are decoded,
+        # otherwise every name is decoded once to build the index. Both compare normalized
+        # paths, so a query matches the same entry whether or not the binder has a hash table.
+        path = SFUtil.normalize_path(name)
+        if self.hash_table is not None:
+            for index in self.hash_table.find(path):
+                file_header = self.file_headers[index]
+                if file_header.name is not None and SFUtil.normalize_path(file_header.name) == path:
+                    return file_header
+            return None
+
+        if not self.names:
+            for file_header in self.file_headers:
+                if file_header.name is not None:
+                    self.names.setdefault(SFUtil.normalize_path(file_header.name), file_header)
+        return self.names.get(path)
+
+    def get(self, name: str) -> BinderFile:
+        file_header = self.find(name)
+        return None if file_header is None else file_header.read_file_data(self.br)
+
+    def get_by_id(self, id: int) -> BinderFile:
+        file_header = self.ids.get(id)
+        return None if file_header is None else file_header.read_file_data(self.br)
+
+    def iter_files(self) -> Iterator[BinderFile]:
+        for file_header in self.file_headers:
+            yield file_header.read_file_data(self.br)
+
+    def iter_kind(self, kind: Sniffer.FormatKind) -> Iterator[BinderFile]:
+        # Entries of the given format, sniffed in place so other entries are never read. Compressed
+        # entries can only be identified once inflated, so they are always yielded.
+        for file_header in self.file_headers:
+            if Binder.is_compressed(file_header.file_flags) or file_header.sniff(self.br) == kind:
+                yield file_header.read_file_data(self.br)
+
+    def iter_matching(self, pattern: str) -> Iterator[BinderFile]:
+        # Case-insensitive glob over the full entry names, e.g. "*.flver".
+        pattern = pattern.lower()
+        for file_header in self.file_headers:
+            if file_header.name is not None and fnmatchcase(file_header.name.lower(), pattern):
+                yield file_header.read_file_data(self.br)
+
     def read_header(self, br: BinaryReaderEx):
         br.assert_ascii("BND4")
 
@@ -68,7 +133,7 @@ class BND4:
         if self.extended == 4:
             hash_table_offset: int = br.read_int64()
             br.step_in(hash_table_offset)
-            BinderHashTable.Assert(br)
+            self.hash_table = BinderHashTable(br)
             br.step_out()
         else:
             br.assert_int64(0)
@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+from .binder.bnd4 import BND4
+from .formats.dcx import DCX
+from .formats.sniffer import Sniffer
+from .formats.tpf.tpf import TPF
+from .formats.flver2.flver2 import FLVER2
+from .util.sf_util import SFUtil
+from .util.binary_reader_ex import BinaryReaderEx
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Headless batch converter, runs without Blender:
+#   python -m <addon directory>.cli <input directory or file> <output directory> [-j JOBS]
+# Every input gets a .npz with its arrays and a .json with the rest of its metadata next to
+# its relative path in the output directory, plus a report.json with timings and failures.
+# The .npz files need NumPy, --no-arrays writes the metadata alone without it.
+
+class BatchConverter:
+    SUFFIXES = (".flver", ".flver.dcx", "bnd", "bnd.dcx", ".tpf", ".tpf.dcx")
+
+    @staticmethod
+    def find(root: str) -> List[str]:
+        if os.path.isfile(root):
+            return [root]
+
+        paths = []
+        for directory, _, files in os.walk(root):
+            for file in files:
+                if file.lower().endswith(BatchConverter.SUFFIXES):
+                    paths.append(os.path.join(directory, file))
+        return sorted(paths)
+
+    @staticmethod
+    def parse(br: BinaryReaderEx, name: str, models: List[Tuple[str, FLVER2]], tpfs: List[Tuple[str, TPF]]):
+        br = SFUtil.get_decompressed_br(br, DCX.CompressionType.UNKOWN)
+
+        kind = Sniffer.sniff(br.buffer)
+        if kind == Sniffer.FormatKind.BND4:
+            bnd = BND4()
+            bnd.open(br)
+            for file in bnd.iter_files():
+                BatchConverter.parse(BinaryReaderEx(False, file.bytes), file.name or str(file.id), models, tpfs)
+
+        elif kind == Sniffer.FormatKind.FLVER2:
+            flver = FLVER2()
+            flver.read(br)
+            models.append((name, flver))
+
+        elif kind == Sniffer.FormatKind.TPF:
+            tpf = TPF()
+            tpf.read(br)
+            tpfs.append((name, tpf))
+
+    @staticmethod
+    def model_metadata(name: str, flver: FLVER2) -> Dict:
+        return {
+            "name": name,
+            "version": flver.header.version,
+            "bounding_box": [list(flver.header.bounding_box_min), list(flver.header.bounding_box_max)],
+            "materials": [{
+                "name": material.name,
+                "mtd": material.mtd,
+                "flags": material.flags,
+                "gx_index": material.gx_index,
+                "textures": [{"type": texture.type, "path": texture.path, "scale": list(texture.scale)} for texture in material.textures],
+            } for material in flver.materials],
+            "bones": [{
+                "name": bone.name,
+                "parent_index": bone.parent_index,
+                "child_index": bone.child_index,
+                "next_sibling_index": bone.next_sibling_index,
+                "prev_sibling_index": bone.prev_sibling_index,
+            } for bone in flver.bones],
+            "meshes": [{
+                "material_index": mesh.material_index,
+                "default_bone_index": mesh.default_bone_index,
+                "bone_indices": list(mesh.bone_indices),
+                "vertex_count": mesh.vertex_data.vertex_count,
+                "attributes": [f"{semantic.name}{index}" for semantic, index in mesh.vertex_data.arrays],
+                "face_sets": [{
+                    "flags": int(face_set.flags),
+                    "triangle_strip": face_set.triangle_strip,
+                    "cull_backfaces": bool(face_set.cull_backfaces),
+                    "index_count": len(face_set.indices),
+                } for face_set in mesh.face_sets],
+            } for mesh in flver.meshes],
+        }
+
+    @staticmethod
+    def model_arrays(prefix: str, flver: FLVER2) -> Dict[str, "np.ndarray"]:
+        arrays = {}
+        if flver.bones:
+            arrays[f"{prefix}bone_translation"] = np.array([bone.translation for bone in flver.bones], np.float32)
+            arrays[f"{prefix}bone_rotation"] = np.array([bone.rotation for bone in flver.bones], np.float32)
+            arrays[f"{prefix}bone_scale"] = np.array([bone.scale for bone in flver.bones], np.float32)
+            arrays[f"{prefix}bone_parent_index"] = np.array([bone.parent_index for bone in flver.bones], np.int16)
+        if flver.dummies:
+            arrays[f"{prefix}dummy_position"] = np.array([dummy.position for dummy in flver.dummies], np.float32)
+            arrays[f"{prefix}dummy_forward"] = np.array([dummy.forward for dummy in flver.dummies], np.float32)
+            arrays[f"{prefix}dummy_upward"] = np.array([dummy.upward for dummy in flver.dummies], np.float32)
+            arrays[f"{prefix}dummy_reference_id"] = np.array([dummy.reference_id for dummy in flver.dummies], np.int16)
+            arrays[f"{prefix}dummy_attach_bone_index"] = np.array([dummy.attach_bone_index for dummy in flver.dummies], np.int16)
+
+        for i, mesh in enumerate(flver.meshes):
+            vertex_data = mesh.vertex_data
+            for (semantic, index), values in vertex_data.arrays.items():
+                components = vertex_data.components[(semantic, index)]
+                arrays[f"{prefix}mesh{i}_{semantic.name}{index}"] = np.asarray(values).reshape(-1, components)
+            for j, face_set in enumerate(mesh.face_sets):
+                arrays[f"{prefix}mesh{i}_face_set{j}"] = np.asarray(face_set.indices)
+        return arrays
+
+    @staticmethod
+    def convert(path: str, root: str, output: str, write_arrays: bool = True) -> Dict:
+        relative_path = os.path.relpath(path, root)
+        start = time.perf_counter()
+        try:
+            models: List[Tuple[str, FLVER2]] = []
+            tpfs: List[Tuple[str, TPF]] = []
+            BatchConverter.parse(BinaryReaderEx.from_path(path), os.path.basename(path), models, tpfs)
+            if not models and not tpfs:
+                raise ValueError("No FLVER or TPF data found.")
+
+            arrays = {}
+            metadata = {"source": relative_path, "models": [], "textures": []}
+            for i, (name, flver) in enumerate(models):
+                metadata["models"].append(BatchConverter.model_metadata(name, flver))
+                if write_arrays:
+                    arrays.update(BatchConverter.model_arrays(f"model{i}_", flver))
+            for name, tpf in tpfs:
+                for texture in tpf.textures:
+                    metadata["textures"].append({"tpf": name, "name": texture.name, "format": texture.format, "type": texture.type.name,
+                                                 "mip_maps": texture.mip_maps, "size": len(texture.bytes)})
+
+            destination = os.path.join(output, relative_path)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if arrays:
+                np.savez(destination + ".npz", **arrays)
+            with open(destination + ".json", "w", encoding="utf-8") as f:
+                json.dump(metadata, f, ensure_ascii=False)
+
+            return {"path": relative_path, "seconds": time.perf_counter() - start, "models": len(models),
+                    "textures": len(metadata["textures"]), "error": None}
+        except Exception as e:
+            return {"path": relative_path, "seconds": time.perf_counter() - start, "models": 0, "textures": 0,
+                    "error": f"{type(e).__name__}: {e}"}
+
+    @staticmethod
+    def run(input: str, output: str, jobs: int = None, write_arrays: bool = True) -> List[Dict]:
+        root = os.path.dirname(input) if os.path.isfile(input) else input
+        paths = BatchConverter.find(input)
+        results = []
+        with ProcessPoolExecutor(jobs) as executor:
+            futures = [executor.submit(BatchConverter.convert, path, root, output, write_arrays) for path in paths]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                status = "FAIL" if result["error"] else "ok"
+                print(f"{status:4} {result['seconds']:8.3f}s  {result['path']}" + (f"  {result['error']}" if result["error"] else ""), flush=True)
+        results.sort(key=lambda result: result["path"])
+        return results
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Parse FLVER, binder and TPF files without Blender and write their arrays and metadata.")
+    parser.add_argument("input", help="directory to walk, or a single file")
+    parser.add_argument("output", help="directory for the .npz/.json files and report.json")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes, defaults to the CPU count")
+    parser.add_argument("--no-arrays", action="store_true", help="only write the .json metadata, the .npz files need NumPy")
+    args = parser.parse_args(argv)
+    if np is None and not args.no_arrays:
+        parser.error("writing .npz files needs NumPy, install it or pass --no-arrays to only write the .json metadata")
+
+    start = time.perf_counter()
+    results = BatchConverter.run(args.input, args.output, args.jobs, not args.no_arrays)
+    failures = sum(1 for result in results if result["error"])
+    total = time.perf_counter() - start
+
+    os.makedirs(args.output, exist_ok=True)
+    with open(os.path.join(args.output, "report.json"), "w", encoding="utf-8") as f:
+        json.dump({"seconds": total, "files": len(results), "failures": failures, "results": results}, f, indent=1)
+
+    print(f"{len(results)} files in {total:.2f}s, {failures} failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import bpy
+import numpy as np
+from typing import List, Tuple
+from ..util.util import Util
+from ..formats.flver import FLVER
+from ..formats.flver2.flver2 import FLVER2
+from ..formats.flver2.face_set import FaceSet
+from ..formats.flver2.mesh import Mesh
+from ..formats.flver2.mesh_vertex_data import MeshVertexData
+
+LayoutSemantic = FLVER.LayoutMember.LayoutSemantic
+
+class Exporter:
+    # Writes imported objects back into the FLVER they came from. Importer tags every object with
+    # the source path and mesh index, the source is read again and each tagged mesh gets new
+    # vertex data and a single triangle list face set built from the Blender mesh. Everything
+    # Blender does not edit, like bone weights, tangents and colors, is carried over from the source
+    # vertex Importer stores on each Blender vertex.
+    PATH_PROPERTY = "flver_path"
+    MESH_INDEX_PROPERTY = "flver_mesh_index"
+    SOURCE_VERTEX_ATTRIBUTE = "flver_vertex"
+    # Blender normals at least this close to the source normal are written as the source normal.
+    NORMAL_TOLERANCE = 0.9999
+
+    @staticmethod
+    def do_export(path: str, objects: List["bpy.types.Object"]):
+        objects = [obj for obj in objects if obj.type == 'MESH' and Exporter.PATH_PROPERTY in obj and Exporter.MESH_INDEX_PROPERTY in obj]
+        if not objects:
+            raise ValueError("No imported FLVER meshes to export.")
+
+        source_paths = set(obj[Exporter.PATH_PROPERTY] for obj in objects)
+        if len(source_paths) != 1:
+            raise ValueError("Objects from more than one FLVER were selected.")
+
+        flver = FLVER2()
+        flver.read_path(source_paths.pop())
+
+        for obj in objects:
+            mesh_index = obj[Exporter.MESH_INDEX_PROPERTY]
+            if mesh_index < 0 or mesh_index >= len(flver.meshes):
+                raise ValueError(f"{obj.name} refers to mesh {mesh_index}, the FLVER has {len(flver.meshes)}.")
+            Exporter.export_mesh(obj.data, flver.meshes[mesh_index])
+
+        positions = [mesh.vertex_data.get(LayoutSemantic.POSITION) for mesh in flver.meshes]
+        positions = [p for p in positions if p is not None and len(p)]
+        if positions:
+            positions = np.concatenate(positions)
+            flver.header.bounding_box_min = tuple(positions.min(axis=0).tolist())
+            flver.header.bounding_box_max = tuple(positions.max(axis=0).tolist())
+
+        flver.write_path(path)
+
+    @staticmethod
+    def mesh_arrays(bpy_mesh) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[np.ndarray], np.ndarray]:
+        # Triangulated corners as loop indices, the per loop vertex indices and normals, every UV
+        # layer and the source vertex of every Blender vertex, -1 for vertices added in Blender.
+        bpy_mesh.calc_loop_triangles()
+        triangles = np.empty(len(bpy_mesh.loop_triangles) * 3, np.int32)
+        bpy_mesh.loop_triangles.foreach_get("loops", triangles)
+
+        loop_count = len(bpy_mesh.loops)
+        loop_vertices = np.empty(loop_count, np.int32)
+        bpy_mesh.loops.foreach_get("vertex_index", loop_vertices)
+
+        loop_normals = np.empty(loop_count * 3, np.float32)
+        if hasattr(bpy_mesh, "corner_normals"):
+            bpy_mesh.corner_normals.foreach_get("vector", loop_normals)
+        else:
+            bpy_mesh.calc_normals_split()
+            bpy_mesh.loops.foreach_get("normal", loop_normals)
+
+        uvs = []
+        for uv_layer in bpy_mesh.uv_layers:
+            uv = np.empty(loop_count * 2, np.float32)
+            uv_layer.data.foreach_get("uv", uv)
+            uvs.append(uv.reshape(-1, 2))
+
+        sources = np.zeros(len(bpy_mesh.vertices), np.int32)
+        attribute = bpy_mesh.attributes.get(Exporter.SOURCE_VERTEX_ATTRIBUTE)
+        if attribute is not None and attribute.domain == 'POINT' and attribute.data_type == 'INT':
+            attribute.data.foreach_get("value", sources)
+        sources -= 1
+
+        return triangles, loop_vertices, loop_normals.reshape(-1, 3), uvs, sources
+
+    @staticmethod
+    def unique_corners(corner_vertices: np.ndarray, corner_normals: np.ndarray, corner_uvs: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        # Corners that agree on vertex, normal and every UV become one FLVER vertex. Each corner is
+        # one fixed size row compared as raw bytes, so np.unique does the whole pass at once.
+        rows = np.concatenate([corner_vertices.view(np.float32)[:, None], corner_normals] + corner_uvs, axis=1)
+        rows = np.ascontiguousarray(rows, np.float32)
+        keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        # np.unique sorts by key, renumber so vertices keep the order the triangles first use them in.
+        order = np.argsort(first, kind="stable")
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+        return first[order], remap[inverse.ravel()].astype(np.int64)
+
+    @staticmethod
+    def source_normals(source: MeshVertexData, corner_sources: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        # Custom normals come back from Blender slightly off, snapping unedited ones back to the exact
+        # source value keeps a round trip lossless and stops them from splitting vertices.
+        values = source.get(LayoutSemantic.NORMAL)
+        mapped = np.flatnonzero((corner_sources >= 0) & (corner_sources < source.vertex_count))
+        if values is None or not len(mapped):
+            return normals
+
+        originals = np.asarray(values, np.float32).reshape(source.vertex_count, -1)[corner_sources[mapped], :3]
+        lengths = np.linalg.norm(originals, axis=1)
+        units = originals / np.maximum(lengths, 1e-12)[:, None]
+        unedited = np.einsum("ij,ij->i", units, normals[mapped]) >= Exporter.NORMAL_TOLERANCE
+
+        normals = normals.copy()
+        normals[mapped[unedited]] = originals[unedited]
+        return normals
+
+    @staticmethod
+    def export_mesh(bpy_mesh, mesh: Mesh):
+        triangles, loop_vertices, loop_normals, uvs, sources = Exporter.mesh_arrays(bpy_mesh)
+        corner_vertices = loop_vertices[triangles]
+        corner_normals = Exporter.source_normals(mesh.vertex_data, sources[corner_vertices], loop_normals[triangles])
+        corner_uvs = [uv[triangles] for uv in uvs]
+        first, inverse = Exporter.unique_corners(corner_vertices, corner_normals, corner_uvs)
+
+        positions = np.empty(len(bpy_mesh.vertices) * 3, np.float32)
+        bpy_mesh.vertices.foreach_get("co", positions)
+        positions = positions.reshape(-1, 3)
+
+        source = mesh.vertex_data
+        vertices = corner_vertices[first]
+        vertex_data = Exporter.vertex_data(source, sources[vertices], positions[vertices], corner_normals[first], [uv[first] for uv in corner_uvs])
+
+        # LOD and motion blur face sets are derived from the full detail one and are not kept.
+        flags, cull_backfaces, unk06 = FaceSet.FSFlags.NONE, True, 0
+        if mesh.face_sets:
+            flags = mesh.face_sets[0].flags & ~(FaceSet.FSFlags.LODLEVEL1 | FaceSet.FSFlags.LODLEVEL2 | FaceSet.FSFlags.MOTIONBLUR)
+            cull_backfaces, unk06 = mesh.face_sets[0].cull_backfaces, mesh.face_sets[0].unk06
+        # 0xFFFF is the primitive restart, so 16-bit indices can address one vertex less.
+        indices = inverse.astype(np.uint16 if vertex_data.vertex_count < Util.UShort.MAX_VALUE else np.uint32)
+        face_set = FaceSet(FaceSet.FSFlags(flags), False, cull_backfaces, unk06, indices)
+
+        mesh.face_sets = [face_set]
+        mesh.vertex_data = vertex_data
+        positions = vertex_data.get(LayoutSemantic.POSITION)
+        if mesh.bounding_box is not None and positions is not None and len(positions):
+            mesh.bounding_box.min = tuple(positions.min(axis=0).tolist())
+            mesh.bounding_box.max = tuple(positions.max(axis=0).tolist())
+
+    @staticmethod
+    def vertex_data(source: MeshVertexData, sources: np.ndarray, positions: np.ndarray, normals: np.ndarray, uvs: List[np.ndarray]) -> MeshVertexData:
+        # Same attributes as the source mesh in the same order, so the original buffer layouts still apply.
+        # Positions, normals and UVs come from Blender, everything else from the source vertex each new one maps to.
+        # Vertices without a valid source are new and get the attributes of vertex 0, with full weight on their first bone.
+        vertex_data = MeshVertexData(len(sources))
+        new_vertices = (sources < 0) | (sources >= source.vertex_count)
+        source_vertices = np.where(new_vertices, 0, sources)
+
+        for (semantic, index), values in source.arrays.items():
+            values = np.asarray(values).reshape(source.vertex_count, -1)
+            components = values.shape[1]
+            if semantic == LayoutSemantic.POSITION:
+                column = positions[:, :components]
+            elif semantic == LayoutSemantic.NORMAL:
+                column = np.empty((len(sources), components), np.float32)
+                column[:, :3] = normals
+                if components > 3:
+                    column[:, 3] = values[source_vertices, 3] if source.vertex_count else 0
+            elif semantic == LayoutSemantic.UV and index < len(uvs):
+                column = np.zeros((len(sources), components), np.float32)
+                column[:, :2] = uvs[index]
+                if components > 2 and source.vertex_count:
+                    column[:, 2:] = values[source_vertices, 2:]
+            elif source.vertex_count:
+                column = values[source_vertices]
+                if semantic == LayoutSemantic.BONEWEIGHTS and new_vertices.any():
+                    column = column.copy()
+                    column[new_vertices] = (1, 0, 0, 0)
+            else:
+                column = np.zeros((len(sources), components), values.dtype)
+            vertex_data.add(semantic, np.ascontiguousarray(column), components)
+        return vertex_data
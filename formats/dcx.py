@@ -1,8 +1,10 @@
 import zlib
+from io import RawIOBase
 from enum import Enum
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from ..util.binary_reader_ex import BinaryReaderEx
 from ..util.oodle26 import Oodle26
+from .sniffer import Sniffer
 
 class DCX:
     class CompressionType(Enum): 
@@ -19,26 +21,67 @@ class DCX:
         DCX_DFLT_11000_44_9_15 = 10
         DCX_KRAK = 11
 
+    DFLT_TYPES = (CompressionType.DCX_DFLT_10000_24_9, CompressionType.DCX_DFLT_10000_44_9, CompressionType.DCX_DFLT_11000_44_8,
+                  CompressionType.DCX_DFLT_11000_44_9, CompressionType.DCX_DFLT_11000_44_9_15)
+
+    class Stream(RawIOBase):
+        # Read-only file-like object over decompressed chunks, each chunk is only produced when reads reach it.
+        def __init__(self, chunks):
+            self.chunks = chunks
+            self.pending = memoryview(b"")
+
+        def readable(self) -> bool:
+            return True
+
+        def readinto(self, b) -> int:
+            while not self.pending:
+                chunk = next(self.chunks, None)
+                if chunk is None:
+                    return 0
+                self.pending = memoryview(chunk)
+
+            size = min(len(b), len(self.pending))
+            b[:size] = self.pending[:size]
+            self.pending = self.pending[size:]
+            return size
+
+        def __iter__(self):
+            # Iterates decompressed chunks rather than lines.
+            if self.pending:
+                yield self.pending.tobytes()
+                self.pending = memoryview(b"")
+            yield from self.chunks
+
+    # Every EDGE chunk inflates to 64 KiB except the last one.
+    EDGE_CHUNK_SIZE = 0x10000
+
+    # Upper bound on the compressed and decompressed pieces handled at once when inflating zlib data.
+    STREAM_CHUNK_SIZE = 0x100000
+
+    # Threads used to inflate EDGE chunks, None lets ThreadPoolExecutor pick and 1 decodes serially.
+    edge_workers: int = None
+
+    # Optional DCXCache used by SFUtil.get_decompressed_br, see formats/dcx_cache.py.
+    cache = None
+
     @staticmethod
     def is_dcx(br: BinaryReaderEx):
-        if br.stream.getbuffer().nbytes < 4: 
-            return False
-        magic = br.get_ascii(0, 4)
-        return magic == "DCP\0" or magic == "DCX\0"
+        return Sniffer.sniff(br.buffer) in (Sniffer.FormatKind.DCX, Sniffer.FormatKind.DCP)
 
     @staticmethod
-    def decompress(br: BinaryReaderEx, compression: CompressionType) -> bytearray:
+    def detect(br: BinaryReaderEx) -> CompressionType:
         br.set_big_endian(True)
+        br.seek(0)
         compression = DCX.CompressionType.UNKOWN
 
-        magic = br.read_ascii(4)
-        if magic == "DCP\0":
+        magic = br.read_bytes(4)
+        if magic == b"DCP\0":
             file_format = br.get_ascii(4,4)
             if file_format == "DFLT":
                 compression = DCX.CompressionType.DCP_DFLT
             elif file_format == "EDGE":
                 compression = DCX.CompressionType.DCP_EDGE
-        elif magic == "DCX\0":
+        elif magic == b"DCX\0":
             file_format = br.get_ascii(0x28, 4)
             if file_format == "EDGE":
                 compression = DCX.CompressionType.DCX_EDGE
@@ -67,33 +110,93 @@ class DCX:
                 compression = DCX.CompressionType.ZLIB
 
         br.seek(0)
+        return compression
+
+    @staticmethod
+    def decompress(br: BinaryReaderEx, compression: CompressionType) -> bytearray:
+        compression = DCX.detect(br)
 
         if compression == DCX.CompressionType.ZLIB:
-            return DCX.read_zlib(br, len(br.stream))
+            return DCX.read_zlib(br, br.length)
         elif compression == DCX.CompressionType.DCP_EDGE:
             return DCX.decompress_dcp_edge(br)
         elif compression == DCX.CompressionType.DCP_DFLT:
             return DCX.decompress_dcp_dflt(br)
-        elif compression == DCX.CompressionType.DCP_EDGE:
+        elif compression == DCX.CompressionType.DCX_EDGE:
             return DCX.decompress_dcx_edge(br)
-        elif (compression == DCX.CompressionType.DCX_DFLT_10000_24_9 or
-            compression == DCX.CompressionType.DCX_DFLT_10000_44_9 or
-            compression == DCX.CompressionType.DCX_DFLT_11000_44_8 or
-            compression == DCX.CompressionType.DCX_DFLT_11000_44_9 or
-            compression == DCX.CompressionType.DCX_DFLT_11000_44_9_15):
+        elif compression in DCX.DFLT_TYPES:
             return DCX.decompress_dcx_dflt(br, compression)
         elif compression == DCX.CompressionType.DCX_KRAK:
             return DCX.decompress_dcx_krak(br)
         else:
             raise TypeError("Unknown DCX format.")
 
+    @staticmethod
+    def open(br: BinaryReaderEx) -> "DCX.Stream":
+        # Like decompress, but zlib based formats are inflated piece by piece as the stream is read.
+        compression = DCX.detect(br)
+        if compression == DCX.CompressionType.ZLIB:
+            return DCX.Stream(DCX.iter_zlib(br, br.length))
+        elif compression == DCX.CompressionType.DCP_DFLT:
+            uncompressed_size, compressed_size = DCX.read_dcp_dflt_header(br)
+            return DCX.Stream(DCX.iter_zlib(br, compressed_size))
+        elif compression in DCX.DFLT_TYPES:
+            uncompressed_size, compressed_size = DCX.read_dcx_dflt_header(br, compression)
+            return DCX.Stream(DCX.iter_zlib(br, compressed_size))
+        return DCX.Stream(iter((DCX.decompress(br, compression),)))
+
     @staticmethod 
-    def read_zlib(br: BinaryReaderEx, compressed_size: int) -> bytearray:
+    def read_zlib(br: BinaryReaderEx, compressed_size: int, uncompressed_size: int = -1) -> bytearray:
+        if uncompressed_size < 0:
+            decompressed = bytearray()
+            for chunk in DCX.iter_zlib(br, compressed_size):
+                decompressed += chunk
+            return decompressed
+
+        decompressed = bytearray(uncompressed_size)
+        output = memoryview(decompressed)
+        position = 0
+        for chunk in DCX.iter_zlib(br, compressed_size):
+            end = position + len(chunk)
+            if end > uncompressed_size:
+                raise ValueError(f"Decompressed data is larger than the expected 0x{uncompressed_size:X} bytes.")
+            output[position:end] = chunk
+            position = end
+
+        if position != uncompressed_size:
+            raise ValueError(f"Decompressed 0x{position:X} bytes, expected 0x{uncompressed_size:X}.")
+        return decompressed
+
+    @staticmethod
+    def iter_zlib(br: BinaryReaderEx, compressed_size: int, chunk_size: int = 0):
+        start = br.position
         br.assert_byte(0x78)
         br.assert_byte(0x01, 0x5E, 0x9C, 0xDA)
-        compressed = br.read_bytes(compressed_size-2)
-        decompressed = zlib.decompress(compressed, wbits = -zlib.MAX_WBITS)
-        return bytearray(decompressed)
+        br.seek(start)
+        compressed = br.read_view(compressed_size)
+        return DCX.inflate_chunks(compressed, chunk_size or DCX.STREAM_CHUNK_SIZE)
+
+    @staticmethod
+    def inflate_chunks(compressed: memoryview, chunk_size: int):
+        # Feeds and drains the decompressor chunk_size bytes at a time, so only one chunk is alive at once.
+        # The whole zlib stream goes through, header and Adler-32 trailer included, so corruption is caught.
+        decompressor = zlib.decompressobj()
+        end = 0
+        while end < len(compressed) and not decompressor.eof:
+            start, end = end, end + chunk_size
+            data = decompressor.decompress(compressed[start:end], chunk_size)
+            while data:
+                yield data
+                data = decompressor.decompress(decompressor.unconsumed_tail, chunk_size)
+
+        data = decompressor.flush()
+        if data:
+            yield data
+
+        if not decompressor.eof:
+            raise ValueError("Zlib stream ended before its end marker.")
+        if decompressor.unused_data or end < len(compressed):
+            raise ValueError("Unexpected data after the end of the zlib stream.")
 
     @staticmethod
     def decompress_dcp_edge(br: BinaryReaderEx) -> bytearray:
@@ -129,27 +232,20 @@ class DCX:
         if egdt_size != 0x20 + chunk_count * 0x10:
             raise ValueError("Unexpected EgdT size in EDGE DCX.")
         
-        decompressed = bytearray(uncompressed_size)
-        dcmp_stream = BytesIO(decompressed)
-        for i in range(chunk_count):
-            br.assert_int32(0)
-            offset = br.read_int32()
-            size = br.read_int32()
-            compressed = br.assert_int32(0, 1) == 1
-
-            chunk = br.get_bytes(data_start + offset, size)
-
-            if compressed:
-                cmp_stream = BytesIO(chunk)
-                decompressed_chunk = zlib.decompress(cmp_stream.read())
-                dcmp_stream.write(decompressed_chunk)
-            else:
-                dcmp_stream.write(chunk)
-        
-        return dcmp_stream.getvalue()
+        return DCX.read_edge_chunks(br, chunk_count, data_start, uncompressed_size)
     
     @staticmethod
     def decompress_dcp_dflt(br: BinaryReaderEx) -> bytearray:
+        uncompressed_size, compressed_size = DCX.read_dcp_dflt_header(br)
+        decompressed = DCX.read_zlib(br, compressed_size, uncompressed_size)
+
+        br.assert_ascii("DCA\0")
+        br.assert_int32(8)
+
+        return decompressed
+
+    @staticmethod
+    def read_dcp_dflt_header(br: BinaryReaderEx):
         br.assert_ascii("DCP\0")
         br.assert_ascii("DFLT")
         br.assert_int32(0x20)
@@ -162,13 +258,7 @@ class DCX:
         br.assert_ascii("DCS\0")
         uncompressed_size = br.read_int32()
         compressed_size = br.read_int32()
-
-        decompressed = bytearray(uncompressed_size)
-
-        br.assert_ascii("DCA\0")
-        br.assert_int32(8)
-
-        return decompressed
+        return uncompressed_size, compressed_size
     
 
     @staticmethod
@@ -213,29 +303,60 @@ class DCX:
         
         if egdt_size != 0x24 + chunk_count * 0x10:
             raise ValueError("Unexpected EgdT value in EDGE DCX.")
+
+        if chunk_count and (chunk_count - 1) * DCX.EDGE_CHUNK_SIZE + trailing_uncompressed_size != uncompressed_size:
+            raise ValueError("Unexpected trailing uncompressed size in EDGE DCX.")
         
         
-        decompressed = bytearray(uncompressed_size)
-        dcmp_stream = BytesIO(decompressed)
+        return DCX.read_edge_chunks(br, chunk_count, dca_start + dca_size, uncompressed_size)
+
+    @staticmethod
+    def read_edge_chunks(br: BinaryReaderEx, chunk_count: int, data_start: int, uncompressed_size: int) -> bytearray:
+        # Every chunk but the last inflates to EDGE_CHUNK_SIZE, the last one to the rest.
+        if chunk_count != -(-uncompressed_size // DCX.EDGE_CHUNK_SIZE):
+            raise ValueError(f"Unexpected chunk count {chunk_count} for 0x{uncompressed_size:X} bytes in EDGE DCX.")
+
+        chunks = []
         for i in range(chunk_count):
             br.assert_int32(0)
             offset = br.read_int32()
             size = br.read_int32()
             compressed = br.assert_int32(0, 1) == 1
+            chunks.append((i, br.get_view(data_start + offset, size), compressed))
 
-            chunk = br.get_bytes(dca_start + dca_size + offset, size)
+        decompressed = bytearray(uncompressed_size)
+        output = memoryview(decompressed)
 
+        # Chunks are independent raw deflate streams and zlib releases the GIL,
+        # so each one is inflated straight into its slot of the output.
+        def inflate(chunk):
+            i, data, compressed = chunk
             if compressed:
-                cmp_stream = BytesIO(chunk)
-                decompressed_chunk = zlib.decompress(cmp_stream.read())
-                dcmp_stream.write(decompressed_chunk)
-            else:
-                dcmp_stream.write(chunk)
-        
-        return dcmp_stream.getvalue()
+                data = zlib.decompress(data, wbits=-zlib.MAX_WBITS)
+
+            start = i * DCX.EDGE_CHUNK_SIZE
+            end = min(start + DCX.EDGE_CHUNK_SIZE, uncompressed_size)
+            if len(data) != end - start:
+                raise ValueError(f"Unexpected size 0x{len(data):X} for EDGE chunk {i}.")
+            output[start:end] = data
+
+        if chunk_count > 1 and DCX.edge_workers != 1:
+            with ThreadPoolExecutor(DCX.edge_workers) as executor:
+                for _ in executor.map(inflate, chunks):
+                    pass
+        else:
+            for chunk in chunks:
+                inflate(chunk)
+
+        return decompressed
 
     @staticmethod
     def decompress_dcx_dflt(br: BinaryReaderEx, compression: CompressionType) -> bytearray:
+        uncompressed_size, compressed_size = DCX.read_dcx_dflt_header(br, compression)
+        return DCX.read_zlib(br, compressed_size, uncompressed_size)
+
+    @staticmethod
+    def read_dcx_dflt_header(br: BinaryReaderEx, compression: CompressionType):
         unk04 = 0x10000 if (compression == DCX.CompressionType.DCX_DFLT_10000_24_9 or compression == DCX.CompressionType.DCX_DFLT_10000_44_9) else 0x11000
         unk10 = 0x24 if compression == DCX.CompressionType.DCX_DFLT_10000_24_9 else 0x44
         unk14 = 0x2C if compression == DCX.CompressionType.DCX_DFLT_10000_24_9 else 0x4C
@@ -272,7 +393,7 @@ class DCX:
 
         compressed_header_length = br.read_int32()
 
-        return DCX.read_zlib(br, compressed_size)
+        return uncompressed_size, compressed_size
 
     @staticmethod
     def decompress_dcx_krak(br: BinaryReaderEx)-> bytearray:
@@ -0,0 +1,107 @@
+import os
+import hashlib
+from .dcx import DCX
+from ..util.binary_reader_ex import BinaryReaderEx
+
+class DCXCache:
+    # Persistent store of decompressed DCX payloads, enabled by assigning an instance to DCX.cache.
+    # Entries are keyed by the compression type and either the path, size and modification time of
+    # the file the reader was mapped from, or a hash of the bytes for readers over anything else, so
+    # hits on files never read the compressed data. Hits are memory-mapped straight from the cache
+    # directory. Modification times double as LRU order.
+    FILE_EXTENSION = ".bin"
+
+    directory: str
+    max_size: int
+    hits: int
+    misses: int
+
+    def __init__(self, directory: str, max_size: int = 4 * 1024 ** 3):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, br: BinaryReaderEx, compression: DCX.CompressionType) -> str:
+        stat = None
+        if br.path is not None:
+            try:
+                stat = os.stat(br.path)
+            except OSError:
+                pass
+
+        # A file that changed size since it was mapped no longer matches the mapping, so it is hashed.
+        if stat is not None and stat.st_size == br.length:
+            source = f"{os.path.abspath(br.path)}\0{stat.st_size}\0{stat.st_mtime_ns}"
+            digest = hashlib.blake2b(source.encode("utf-8", "surrogateescape"), digest_size=20, person=b"path")
+        else:
+            digest = hashlib.blake2b(br.buffer, digest_size=20)
+        digest.update(compression.name.encode("ascii"))
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + DCXCache.FILE_EXTENSION)
+
+    def decompress(self, br: BinaryReaderEx) -> BinaryReaderEx:
+        compression = DCX.detect(br)
+        path = self.path(self.key(br, compression))
+
+        if os.path.isfile(path):
+            try:
+                os.utime(path)
+                decompressed = BinaryReaderEx.from_path(path)
+                self.hits += 1
+                return decompressed
+            except OSError:
+                pass
+
+        self.misses += 1
+        decompressed = DCX.decompress(br, compression)
+        self.store(path, decompressed)
+        return BinaryReaderEx(False, decompressed)
+
+    def store(self, path: str, data: bytearray):
+        # Written under a temporary name first so a concurrent reader never maps a partial entry.
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self.evict()
+
+    def entries(self) -> list:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(DCXCache.FILE_EXTENSION):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                # Still mapped by a reader on platforms that lock mapped files.
+                pass
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -1,50 +1,108 @@
 from typing import List
 from enum import Enum, IntEnum
 from queue import Queue
-from mathutils import Vector, Color
+from struct import Struct
+from ..util.vector import Vector3, Vector4
 from ..util.util import Util
 from ..util.binary_reader_ex import BinaryReaderEx
+from ..util.binary_writer_ex import BinaryWriterEx
 
 class FLVER:
     class Dummy:
-        position: Vector
-        forward: Vector
-        upward: Vector
+        position: Vector3
+        forward: Vector3
+        upward: Vector3
         reference_id: int
         parent_bone_index: int
         attach_bone_index: int
-        color: Vector
+        color: Vector4
         flag1: bool
         use_upward_vector: bool
         unk30: int
         unk34: int
 
         def __init__(self, *args):
+            self.position = (0.0, 0.0, 0.0)
+            self.forward = (0.0, 0.0, 1.0)
+            self.upward = (0.0, 1.0, 0.0)
+            self.reference_id = -1
             self.parent_bone_index = -1
             self.attach_bone_index = -1
+            self.color = (1.0, 1.0, 1.0, 1.0)
+            self.flag1 = False
+            self.use_upward_vector = False
+            self.unk30 = 0
+            self.unk34 = 0
 
             if (len(args) == 2 and isinstance(args[0], BinaryReaderEx) and isinstance(args[1], int)):
                 br: BinaryReaderEx = args[0]
                 version: int = args[1]
-
-                self.position = br.read_vector3()
-                self.color = br.read_bgra() if version == 0x20010 else br.read_arbg()
-                self.forward = br.read_vector3()
-                self.reference_id = br.read_int16()
-                self.parent_bone_index = br.read_int16()
-                self.upward = br.read_vector3()
-                self.attach_bone_index = br.read_int16()
-                self.flag1 = br.read_boolean()
-                self.use_upward_vector = br.read_boolean()
-                self.unk30 = br.read_int32()
-                self.unk34 = br.read_int32()
-                br.assert_int32(0)
-                br.assert_int32(0)
+                self.set_record(FLVER.Dummy.read_records(br, 1)[0], version)
+
+        # One 0x40 byte record: position, color, forward, reference_id, parent_bone_index, upward,
+        # attach_bone_index, flag1, use_upward_vector, unk30, unk34 and two zero int32s.
+        STRUCTS = {endian: Struct(endian + "3f4B3f2h3fh2B4i") for endian in ("<", ">")}
+
+        @staticmethod
+        def read_records(br: BinaryReaderEx, count: int) -> List[tuple]:
+            # The whole table in one unpack, then each checked field is validated as a column.
+            s = FLVER.Dummy.STRUCTS[">" if br.big_endian else "<"]
+            records = list(s.iter_unpack(br.read_view(s.size * count)))
+            if records:
+                columns = list(zip(*records))
+                for column in columns[16:18]:
+                    if not set(column) <= {0, 1}:
+                        b = next(b for b in column if b > 1)
+                        raise ValueError(f"ReadBoolean encountered non-boolean value: 0x{b:X}")
+                for column in columns[20:22]:
+                    if any(column):
+                        i = next(i for i, value in enumerate(column) if value)
+                        raise AssertionError(f"Read Int32: 0x{column[i]:X} | Expected: 0x0 | Dummy: {i}")
+            return records
+
+        @staticmethod
+        def read_all(br: BinaryReaderEx, version: int, count: int) -> List["FLVER.Dummy"]:
+            dummies = []
+            for record in FLVER.Dummy.read_records(br, count):
+                dummy = FLVER.Dummy.__new__(FLVER.Dummy)
+                dummy.set_record(record, version)
+                dummies.append(dummy)
+            return dummies
+
+        def set_record(self, record: tuple, version: int):
+            (px, py, pz, c0, c1, c2, c3, fx, fy, fz, self.reference_id, self.parent_bone_index,
+             ux, uy, uz, self.attach_bone_index, flag1, use_upward_vector, self.unk30, self.unk34, _, _) = record
+            self.position = (px, py, pz)
+            # BGRA in 0x20010, ARBG otherwise, kept as an (a, r, b, g) tuple like BinaryReaderEx does.
+            if version == 0x20010:
+                self.color = (c3 / 255.0, c2 / 255.0, c0 / 255.0, c1 / 255.0)
+            else:
+                self.color = (c0 / 255.0, c1 / 255.0, c2 / 255.0, c3 / 255.0)
+            self.forward = (fx, fy, fz)
+            self.upward = (ux, uy, uz)
+            self.flag1 = flag1 == 1
+            self.use_upward_vector = use_upward_vector == 1
 
         def __str__(self):
             return f"{self.reference_id}"
-        
-        #TODO: add write method
+
+        def write(self, bw: BinaryWriterEx, version: int):
+            bw.write_vector3(self.position)
+            if version == 0x20010:
+                bw.write_bgra(self.color)
+            else:
+                bw.write_arbg(self.color)
+            bw.write_vector3(self.forward)
+            bw.write_int16(self.reference_id)
+            bw.write_int16(self.parent_bone_index)
+            bw.write_vector3(self.upward)
+            bw.write_int16(self.attach_bone_index)
+            bw.write_boolean(self.flag1)
+            bw.write_boolean(self.use_upward_vector)
+            bw.write_int32(self.unk30)
+            bw.write_int32(self.unk34)
+            bw.write_int32(0)
+            bw.write_int32(0)
     
     class Bone:
         name: str
@@ -52,11 +110,11 @@ class FLVER:
         child_index: int
         next_sibling_index: int
         prev_sibling_index: int
-        translation: Vector
-        rotation: Vector
-        scale: Vector
-        bounding_box_min: Vector
-        bounding_box_max: Vector
+        translation: Vector3
+        rotation: Vector3
+        scale: Vector3
+        bounding_box_min: Vector3
+        bounding_box_max: Vector3
         unk3c: int
 
         def __init__(self, *params):
@@ -65,95 +123,117 @@ class FLVER:
             self.child_index = -1
             self.next_sibling_index = -1
             self.prev_sibling_index = -1
-            self.scale = Vector((1,1,1))
+            self.translation = (0.0, 0.0, 0.0)
+            self.rotation = (0.0, 0.0, 0.0)
+            self.scale = (1.0, 1.0, 1.0)
+            self.bounding_box_min = (0.0, 0.0, 0.0)
+            self.bounding_box_max = (0.0, 0.0, 0.0)
+            self.unk3c = 0
         
             if len(params) == 2:
                 Util.assert_params(params, BinaryReaderEx, bool)
                 br:BinaryReaderEx = params[0]
                 unicode: bool = params[1]
-
-                self.translation = br.read_vector3()
-                name_offset: int = br.read_int32()
-                self.rotation = br.read_vector3()
-                self.parent_index = br.read_int16()
-                self.child_index = br.read_int16()
-                self.scale = br.read_vector3()
-                self.next_sibling_index = br.read_int16()
-                self.prev_sibling_index = br.read_int16()
-                self.bounding_box_min = br.read_vector3()
-                self.unk3c = br.read_int32()
-                self.bounding_box_max = br.read_vector3()
-                br.assert_pattern(0x34, 0x00)
-
-                if unicode:
-                    self.name = br.get_utf16(name_offset)
-                else:
-                    self.name = br.get_shit_jis(name_offset)
+                self.set_record(br, FLVER.Bone.read_records(br, 1)[0], unicode)
+
+        # One 0x80 byte record: translation, name offset, rotation, parent_index, child_index, scale,
+        # next_sibling_index, prev_sibling_index, bounding_box_min, unk3c, bounding_box_max and 0x34 zero bytes.
+        STRUCTS = {endian: Struct(endian + "3fi3f2h3f2h3fi3f52s") for endian in ("<", ">")}
+        PADDING = bytes(0x34)
+
+        @staticmethod
+        def read_records(br: BinaryReaderEx, count: int) -> List[tuple]:
+            s = FLVER.Bone.STRUCTS[">" if br.big_endian else "<"]
+            records = list(s.iter_unpack(br.read_view(s.size * count)))
+            if records:
+                padding = list(zip(*records))[-1]
+                if padding.count(FLVER.Bone.PADDING) != len(padding):
+                    i = next(i for i, value in enumerate(padding) if value != FLVER.Bone.PADDING)
+                    b = next(b for b in padding[i] if b != 0)
+                    raise AssertionError(f"Expected 52 0x00, got {b:02X} in bone {i}")
+            return records
+
+        @staticmethod
+        def read_all(br: BinaryReaderEx, unicode: bool, count: int) -> List["FLVER.Bone"]:
+            bones = []
+            for record in FLVER.Bone.read_records(br, count):
+                bone = FLVER.Bone.__new__(FLVER.Bone)
+                bone.set_record(br, record, unicode)
+                bones.append(bone)
+            return bones
+
+        def set_record(self, br: BinaryReaderEx, record: tuple, unicode: bool):
+            (tx, ty, tz, name_offset, rx, ry, rz, self.parent_index, self.child_index, sx, sy, sz,
+             self.next_sibling_index, self.prev_sibling_index, min_x, min_y, min_z, self.unk3c, max_x, max_y, max_z, _) = record
+            self.translation = (tx, ty, tz)
+            self.rotation = (rx, ry, rz)
+            self.scale = (sx, sy, sz)
+            self.bounding_box_min = (min_x, min_y, min_z)
+            self.bounding_box_max = (max_x, max_y, max_z)
+            self.name = br.get_utf16(name_offset) if unicode else br.get_shit_jis(name_offset)
+
+        def write(self, bw: BinaryWriterEx, index: int):
+            bw.write_vector3(self.translation)
+            bw.reserve_int32(f"BoneNameOffset{index}")
+            bw.write_vector3(self.rotation)
+            bw.write_int16(self.parent_index)
+            bw.write_int16(self.child_index)
+            bw.write_vector3(self.scale)
+            bw.write_int16(self.next_sibling_index)
+            bw.write_int16(self.prev_sibling_index)
+            bw.write_vector3(self.bounding_box_min)
+            bw.write_int32(self.unk3c)
+            bw.write_vector3(self.bounding_box_max)
+            bw.write_pattern(0x34, 0x00)
+
+        def write_strings(self, bw: BinaryWriterEx, unicode: bool, index: int):
+            bw.fill_int32(f"BoneNameOffset{index}", bw.position)
+            if unicode:
+                bw.write_utf16(self.name)
+            else:
+                bw.write_shift_jis(self.name)
 
     class VertexBoneWeights:
-        __A: float
-        __B: float
-        __C: float
-        __D: float
+        __values: List[float]
 
         length: int = 4
 
+        def __init__(self, *values):
+            self.__values = list(values) if values else [0.0] * 4
+
         def get(self, i: int) -> float:
-            if i == 0:
-                return self.__A
-            elif i == 1:
-                return self.__B
-            elif i == 2:
-                return self.__C
-            elif i == 3:
-                return self.__C
-            else:
-                IndexError(f"Index ({i}) was out of range. Must be non-negative and less than 4.")
-
-        def set(self, i: int):
-            if i == 0:
-                self.__A = i 
-            elif i == 1:
-                self.__B = i 
-            elif i == 2:
-                self.__C = i 
-            elif i == 3:
-                self.__C = i 
-            else:
-                IndexError(f"Index ({i}) was out of range. Must be non-negative and less than 4.")
+            if i < 0 or i > 3:
+                raise IndexError(f"Index ({i}) was out of range. Must be non-negative and less than 4.")
+            return self.__values[i]
+
+        def set(self, i: int, value: float):
+            if i < 0 or i > 3:
+                raise IndexError(f"Index ({i}) was out of range. Must be non-negative and less than 4.")
+            self.__values[i] = value
+
+        __getitem__ = get
+        __setitem__ = set
 
-            
     class VertexBoneIndices:
-        __A: float
-        __B: float
-        __C: float
-        __D: float
+        __values: List[int]
 
         length: int = 4
 
-        def get(self, i: int) -> float:
-            if i == 0:
-                return self.__A
-            elif i == 1:
-                return self.__B
-            elif i == 2:
-                return self.__C
-            elif i == 3:
-                return self.__C
-            else:
-                IndexError(f"Index ({i}) was out of range. Must be non-negative and less than 4.")
-
-        def set(self, i: int):
-            if i == 0:
-                self.__A = i 
-            elif i == 1:
-                self.__B = i 
-            elif i == 2:
-                self.__C = i 
-            elif i == 3:
-                self.__C = i 
-            else:
-                IndexError(f"Index ({i}) was out of range. Must be non-negative and less than 4.")
+        def __init__(self, *values):
+            self.__values = list(values) if values else [0] * 4
+
+        def get(self, i: int) -> int:
+            if i < 0 or i > 3:
+                raise IndexError(f"Index ({i}) was out of range. Must be non-negative and less than 4.")
+            return self.__values[i]
+
+        def set(self, i: int, value: int):
+            if i < 0 or i > 3:
+                raise IndexError(f"Index ({i}) was out of range. Must be non-negative and less than 4.")
+            self.__values[i] = value
+
+        __getitem__ = get
+        __setitem__ = set
 
     class VertexColor:
         A: float
@@ -192,22 +272,22 @@ class FLVER:
         
         @classmethod
         def read_byte_rgba(cls, br: BinaryReaderEx):
-            a = br.read_byte()
-            r = br.read_byte()
-            g = br.read_byte()
-            b = br.read_byte()
+            r = br.read_uint8()
+            g = br.read_uint8()
+            b = br.read_uint8()
+            a = br.read_uint8()
             return cls(a, r, g, b)
 
 
     class Vertex:
-        position: Vector
+        position: Vector3
         bone_weights: "FLVER.VertexBoneWeights"
         bone_indices: "FLVER.VertexBoneIndices"
-        normal: Vector
+        normal: Vector3
         normal_w: int
-        uvs: List[Vector]
-        tangents: List[Vector]
-        bitangent: Vector
+        uvs: List[Vector3]
+        tangents: List[Vector4]
+        bitangent: Vector4
         colors: List["FLVER.VertexColor"]
 
         __uv_queue: Queue
@@ -233,174 +313,11 @@ class FLVER:
                 tangent_capacity: int = params[1]
                 color_capacity: int = params[2]
 
+                self.bone_weights = FLVER.VertexBoneWeights()
+                self.bone_indices = FLVER.VertexBoneIndices()
                 self.uvs = []
                 self.tangents = []
                 self.colors = []
-        
-        def read(self, br: BinaryReaderEx, layout: List, uv_factor: float):
-            layout: List[FLVER.LayoutMember] = layout
-            for member in layout:
-                if member.semantic == FLVER.LayoutMember.LayoutSemantic.POSITION:
-                    if member.type == FLVER.LayoutMember.LayoutType.FLOAT3:
-                        self.position = br.read_vector3()
-                    elif member.type == FLVER.LayoutMember.LayoutType.FLOAT4:
-                        self.position = br.read_vector3()
-                        br.assert_single()
-                    elif member.type == FLVER.LayoutMember.LayoutType.EDGECOMPRESSED:
-                        sad = True
-                    else:
-                        raise NotImplementedError(f"Read not implemented for {member.type} {member.semantic}.")
-                
-                elif member.semantic == FLVER.LayoutMember.LayoutSemantic.BONEWEIGHTS:
-                    if member.type == FLVER.LayoutMember.LayoutType.BYTE4A:
-                        for i in range(4):
-                            self.bone_weights[i] = br.read_s_byte() / 127.0
-                    elif member.type == FLVER.LayoutMember.LayoutType.BYTE4C:
-                        for i in range(4):
-                            self.bone_weights[i] = br.read_byte() / 255.0
-                    elif (member.type == FLVER.LayoutMember.LayoutType.UVPAIR
-                            or member.type == FLVER.LayoutMember.LayoutType.SHORT4TOFLOAT4A):
-                        for i in range(4):
-                            self.bone_weights[i] = br.read_int16() / 32767.0
-                    else:
-                        raise NotImplementedError(f"Read not implemented for {member.type} {member.semantic}.")
-                
-                elif member.semantic == FLVER.LayoutMember.LayoutSemantic.BONEINDICES:
-                    if member.type == FLVER.LayoutMember.LayoutType.BYTE4B:
-                        for i in range(4):
-                            self.bone_indices[i] = br.read_byte()
-                    elif member.type == FLVER.LayoutMember.LayoutType.SHORTBONEINDICES:
-                        for i in range(4):
-                            self.bone_indices[i] = br.read_uint16()
-                    elif member.type == FLVER.LayoutMember.LayoutType.BYTE4E:
-                        for i in range(4):
-                            self.bone_indices[i] = br.read_byte()
-                    else:
-                        raise NotImplementedError(f"Read not implemented for {member.type} {member.semantic}.")
-                
-                elif member.semantic == FLVER.LayoutMember.LayoutSemantic.NORMAL:
-                    if member.type == FLVER.LayoutMember.LayoutType.FLOAT3:
-                        self.normal = br.read_vector3()
-                    elif member.type == FLVER.LayoutMember.LayoutType.FLOAT4:
-                        self.normal = br.read_vector3()
-                        w = br.read_single()
-                        self.normal_w = int(w)
-                        if w != self.normal_w:
-                            raise ValueError(f"Float4 Normal W was not a whole number: {w}")
-                    elif (member.type == FLVER.LayoutMember.LayoutType.BYTE4A
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4B
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4C
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4E):
-                        self.normal = self.read_byte_norm_xyz(br)
-                        self.normal_w = br.read_byte()
-                    elif member.type == FLVER.LayoutMember.LayoutType.SHORT2TOFLOAT2:
-                        self.normal_w = br.read_byte()
-                        self.normal = self.read_byte_norm_zyx(br)
-                    elif member.type == FLVER.LayoutMember.LayoutType.SHORT4TOFLOAT4A:
-                        self.normal = self.read_short_norm_xyz(br)
-                        self.normal_w = br.read_int16()
-                    elif member.type == FLVER.LayoutMember.LayoutType.SHORT4TOFLOAT4B:
-                        self.normal = self.read_ushort_norm_xyz(br)
-                        self.normal_w = br.read_int16()
-                    else:
-                        raise NotImplementedError(f"Read not implemented for {member.type} {member.semantic}.")
-                    
-                elif member.semantic == FLVER.LayoutMember.LayoutSemantic.UV:
-                    if member.type == FLVER.LayoutMember.LayoutType.FLOAT2:
-                        v = br.read_vector2()
-                        self.uvs.append(Vector((v[0], v[1], 0)))
-                    elif member.type == FLVER.LayoutMember.LayoutType.FLOAT3:
-                        self.uvs.append(br.read_vector3())
-                    elif member.type == FLVER.LayoutMember.LayoutType.FLOAT4:
-                        v = br.read_vector2()
-                        self.uvs.append(Vector((v[0], v[1], 0)))
-                        self.uvs.append(Vector((v[0], v[1], 0)))
-                    elif (member.type == FLVER.LayoutMember.LayoutType.BYTE4A
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4B
-                          or member.type == FLVER.LayoutMember.LayoutType.SHORT2TOFLOAT2
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4C
-                          or member.type == FLVER.LayoutMember.LayoutType.UV
-                          ):
-                        self.uvs.append(Vector((br.read_int16(), br.read_int16(), 0))/uv_factor)
-                    elif member.type == FLVER.LayoutMember.LayoutType.UVPAIR:
-                        self.uvs.append(Vector((br.read_int16(), br.read_int16(), 0))/ uv_factor)
-                        self.uvs.append(Vector((br.read_int16(), br.read_int16(), 0))/ uv_factor)
-                    elif member.type == FLVER.LayoutMember.LayoutType.SHORT4TOFLOAT4B:
-                        self.uvs.append(Vector((br.read_int16(), br.read_int16(), br.read_int16()))/ uv_factor)
-                        br.assert_int16()
-                    else:
-                        raise NotImplementedError(f"Read not implemented for {member.type} {member.semantic}.")
-
-                elif member.semantic == FLVER.LayoutMember.LayoutSemantic.TANGENT:
-                    if member.type == FLVER.LayoutMember.LayoutType.FLOAT4:
-                        self.tangents.append(br.read_vector4())
-                    elif (member.type == FLVER.LayoutMember.LayoutType.BYTE4A
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4B
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4C
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4E
-                          ):
-                        self.tangents.append(self.read_byte_norm_xyzw(br))
-                    elif member.type == FLVER.LayoutMember.LayoutType.SHORT4TOFLOAT4A:
-                        self.tangents.appen(self.read_short_norm_xyzw(br))
-                    else:
-                        raise NotImplementedError(f"Read not implemented for {member.type} {member.semantic}.")
-
-                elif member.semantic == FLVER.LayoutMember.LayoutSemantic.BITANGENT:
-                    if (member.type == FLVER.LayoutMember.LayoutType.BYTE4A
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4B
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4C
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4E
-                          ):
-                        self.bitangent = self.read_byte_norm_xyzw(br)
-                    else:
-                        raise NotImplementedError(f"Read not implemented for {member.type} {member.semantic}.")
-                
-                elif member.semantic == FLVER.LayoutMember.LayoutSemantic.VERTEXCOLOR:
-                    if member.type == FLVER.LayoutMember.LayoutType.FLOAT4:
-                        self.colors.append(FLVER.VertexColor.read_float_rgba(br))
-                    elif (member.type == FLVER.LayoutMember.LayoutType.BYTE4A
-                          or member.type == FLVER.LayoutMember.LayoutType.BYTE4C):
-                        self.colors.append(FLVER.VertexColor.read_byte_rgba(br))
-                    else:
-                        raise NotImplementedError(f"Read not implemented for {member.type} {member.semantic}.")
-                else:
-                    raise NotImplementedError(f"Read not implemented for {member.type} {member.semantic}.")
-
-
-        def read_byte_norm(self, br: BinaryReaderEx) -> float:
-            return ((int.from_bytes(br.read_byte(), 'big' if br.big_endian else 'little') - 127) / 127.0)
-
-        def read_byte_norm_xyz(self, br: BinaryReaderEx) -> Vector:
-            return Vector((self.read_byte_norm(br), self.read_byte_norm(br), self.read_byte_norm(br)))
-        
-        def read_byte_norm_xyzw(self, br:BinaryReaderEx) -> Vector:
-            return Vector((self.read_byte_norm(br), self.read_byte_norm(br), self.read_byte_norm(br), self.read_byte_norm(br)))
-
-        def read_s_byte_norm(self, br: BinaryReaderEx) -> float:
-            return br.read_s_byte() / 127.0
-
-        def read_byte_norm_zyx(self, br: BinaryReaderEx) -> Vector:
-            z = self.read_s_byte_norm(br)
-            y = self.read_s_byte_norm(br)
-            x= self.read_s_byte_norm(br)
-            return Vector((x, y, z))
-        
-        def read_short_norm(self, br: BinaryReaderEx) -> float:
-            return br.read_int16() / 32767.0
-        
-        def read_short_norm_xyz(self, br: BinaryReaderEx) -> Vector:
-            return Vector((self.read_short_norm(br), self.read_short_norm(br), self.read_short_norm(br)))
-        
-        def read_short_norm_xyzw(self, br: BinaryReaderEx) -> Vector:
-            return Vector((self.read_short_norm(br), self.read_short_norm(br), self.read_short_norm(br), self.read_short_norm(br)))
-
-        def read_ushort_norm(self, br: BinaryReaderEx) -> float:
-            return (br.read_uint16() - 32767) / 32767.0
-        
-        def read_ushort_norm_xyz(self, br: BinaryReaderEx) -> Vector:
-            return Vector((self.read_ushort_norm(br), self.read_ushort_norm(br), self.read_ushort_norm(br)))
-
-
 
     class LayoutMember:
         class LayoutType(IntEnum):
@@ -429,6 +346,23 @@ class FLVER:
             BITANGENT = 7
             VERTEXCOLOR = 10
 
+        SIZES = {
+            LayoutType.EDGECOMPRESSED: 1,
+            LayoutType.BYTE4A: 4,
+            LayoutType.BYTE4B: 4,
+            LayoutType.SHORT2TOFLOAT2: 4,
+            LayoutType.BYTE4C: 4,
+            LayoutType.UV: 4,
+            LayoutType.BYTE4E: 4,
+            LayoutType.FLOAT2: 8,
+            LayoutType.UVPAIR: 8,
+            LayoutType.SHORTBONEINDICES: 8,
+            LayoutType.SHORT4TOFLOAT4A: 8,
+            LayoutType.SHORT4TOFLOAT4B: 8,
+            LayoutType.FLOAT3: 12,
+            LayoutType.FLOAT4: 16,
+        }
+
         unk00: int
         type: LayoutType
         semantic: LayoutSemantic
@@ -459,31 +393,17 @@ class FLVER:
                     self.type = FLVER.LayoutMember.LayoutType(br.read_uint32())
                     self.semantic = FLVER.LayoutMember.LayoutSemantic(br.read_uint32())
                     self.index = br.read_int32()
+
+        def write(self, bw: BinaryWriterEx, struct_offset: int):
+            bw.write_int32(self.unk00)
+            bw.write_int32(struct_offset)
+            bw.write_uint32(self.type)
+            bw.write_uint32(self.semantic)
+            bw.write_int32(self.index)
         
         def size(self):
-            if self.type == FLVER.LayoutMember.LayoutType.EDGECOMPRESSED:
-                return 1
-            elif (self.type == FLVER.LayoutMember.LayoutType.BYTE4A or
-                self.type == FLVER.LayoutMember.LayoutType.BYTE4B or
-                self.type == FLVER.LayoutMember.LayoutType.SHORT2TOFLOAT2 or
-                self.type == FLVER.LayoutMember.LayoutType.BYTE4C or
-                self.type == FLVER.LayoutMember.LayoutType.UV or
-                self.type == FLVER.LayoutMember.LayoutType.BYTE4E):
-                return 4
-
-            elif (self.type == FLVER.LayoutMember.LayoutType.FLOAT2 or
-                self.type == FLVER.LayoutMember.LayoutType.UVPAIR or
-                self.type == FLVER.LayoutMember.LayoutType.SHORTBONEINDICES or
-                self.type == FLVER.LayoutMember.LayoutType.SHORT4TOFLOAT4A or
-                self.type == FLVER.LayoutMember.LayoutType.SHORT4TOFLOAT4B):
-                return 8
-
-            elif self.type == FLVER.LayoutMember.LayoutType.FLOAT3:
-                return 12
-
-            elif self.type == FLVER.LayoutMember.LayoutType.FLOAT4:
-                return 16
-
-            else:
-                raise NotImplementedError(f"No size defined for buffer layout type: {type}");
+            size = FLVER.LayoutMember.SIZES.get(self.type)
+            if size is None:
+                raise NotImplementedError(f"No size defined for buffer layout type: {self.type}")
+            return size
 
@@ -1,15 +1,22 @@
-from typing import List
+from collections import OrderedDict
+from typing import List, NamedTuple, Tuple
+from zlib import crc32
 from ..flver import FLVER
 from ...util.binary_reader_ex import BinaryReaderEx
+from ...util.binary_writer_ex import BinaryWriterEx
 
 class BufferLayout(List[FLVER.LayoutMember]):
+    # Layouts read with read_interned, keyed by byte order, length and checksum of the raw member
+    # bytes. Each entry keeps those bytes to rule out checksum collisions. The least recently used
+    # layout is dropped once the table holds INTERN_LIMIT of them.
+    interned: "OrderedDict[Tuple[bool, int, int], Tuple[bytes, FrozenBufferLayout]]" = OrderedDict()
+    INTERN_LIMIT = 1024
 
-    def __init__(self, br: BinaryReaderEx):
+    def __init__(self, br: BinaryReaderEx = None):
 
         if br:
             member_count: int = br.read_int32()
             br.assert_int32(0)
-            test = br.stream.tell()
             br.assert_int32(0)
             member_offset: int = br.read_int32()
 
@@ -22,8 +29,80 @@ class BufferLayout(List[FLVER.LayoutMember]):
                 self.append(member)
             br.step_out()
     
+    @staticmethod
+    def read_interned(br: BinaryReaderEx) -> "FrozenBufferLayout":
+        # Files of one archive mostly use the same few layouts, so identical member data is only
+        # parsed once and every FLVER using it shares one read only layout. FLVER2.edit_buffer_layout
+        # swaps in an editable copy when one has to change.
+        member_count: int = br.get_int32(br.position)
+        member_offset: int = br.get_int32(br.position + 12)
+        data = br.get_view(member_offset, member_count * 20)
+        key = (br.big_endian, len(data), crc32(data))
+        entry = BufferLayout.interned.get(key)
+        if entry is None or entry[0] != data:
+            layout = BufferLayout(br).freeze()
+            BufferLayout.interned[key] = (data.tobytes(), layout)
+            if len(BufferLayout.interned) > BufferLayout.INTERN_LIMIT:
+                BufferLayout.interned.popitem(last=False)
+            return layout
+
+        BufferLayout.interned.move_to_end(key)
+        br.skip(4)
+        br.assert_int32(0)
+        br.assert_int32(0)
+        br.skip(4)
+        return entry[1]
+
+    @staticmethod
+    def clear_interned():
+        BufferLayout.interned.clear()
+
+    def freeze(self) -> "FrozenBufferLayout":
+        return FrozenBufferLayout(FrozenLayoutMember(member.type, member.semantic, member.index, member.unk00) for member in self)
+
+    def thaw(self) -> "BufferLayout":
+        return self
+
+    def write(self, bw: BinaryWriterEx, index: int):
+        bw.write_int32(len(self))
+        bw.write_int32(0)
+        bw.write_int32(0)
+        bw.reserve_int32(f"VertexStructLayout{index}")
+
+    def write_members(self, bw: BinaryWriterEx, index: int):
+        bw.fill_int32(f"VertexStructLayout{index}", bw.position)
+        struct_offset: int = 0
+        for member in self:
+            member.write(bw, struct_offset)
+            struct_offset += member.size()
+    
     def size(self):
-        size: int = 0
-        for layout_member in self:
-            size += layout_member.size()
-        return size
\ No newline at end of file
+        return sum(member.size() for member in self)
+
+class FrozenLayoutMember(NamedTuple):
+    # Read only LayoutMember, shared by every layout interned from the same bytes.
+    type: FLVER.LayoutMember.LayoutType
+    semantic: FLVER.LayoutMember.LayoutSemantic
+    index: int
+    unk00: int
+
+    write = FLVER.LayoutMember.write
+    size = FLVER.LayoutMember.size
+
+    def thaw(self) -> FLVER.LayoutMember:
+        return FLVER.LayoutMember(self.type, self.semantic, self.index, self.unk00)
+
+class FrozenBufferLayout(Tuple[FrozenLayoutMember, ...]):
+    # Read only BufferLayout handed out by read_interned. Writes the same way, thaw() returns an
+    # editable BufferLayout with members of its own.
+    write = BufferLayout.write
+    write_members = BufferLayout.write_members
+    size = BufferLayout.size
+
+    def freeze(self) -> "FrozenBufferLayout":
+        return self
+
+    def thaw(self) -> BufferLayout:
+        layout = BufferLayout()
+        layout.extend(member.thaw() for member in self)
+        return layout
@@ -1,8 +1,15 @@
-from typing import List
+from array import array
+from typing import List, Union
 from enum import IntFlag
 from .flver_header import FLVERHeader
 from ...util.util import Util
 from ...util.binary_reader_ex import BinaryReaderEx
+from ...util.binary_writer_ex import BinaryWriterEx
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class FaceSet:
     class FSFlags(IntFlag):
@@ -16,18 +23,20 @@ class FaceSet:
     triangle_strip: bool
     cull_backfaces: bool
     unk06: int
-    indices: List[int]
+    __indices: Union[List[int], array]
+    __index_source: tuple
     
     def __init__(self, *params):
         self.flags = FaceSet.FSFlags.NONE
         self.triangle_strip = False
-        self.cull_backfaces = True,
+        self.cull_backfaces = True
+        self.unk06 = 0
         self.indices = []
 
         if len(params) == 5:
-            Util.assert_params(params, FaceSet.FSFlags, bool, bool, int, [int])
+            Util.assert_params(params, FaceSet.FSFlags, bool, bool, int, object)
             self.flags = params[0]
-            self.trianlge_strup = params[1]
+            self.triangle_strip = params[1]
             self.cull_backfaces = params[2]
             self.unk06 = params[3]
             self.indices = params[4]
@@ -56,45 +65,136 @@ class FaceSet:
             if index_size == 0:
                 index_size = header_index_size
 
+            # Indices are only read on first access, see read_indices.
             if index_size == 8:
-                br.step_in(data_offset + indices_offset)
-                #TODO: Check if you need to implement this
-                br.step_out()
+                self.__index_source = (br, "B", data_offset + indices_offset, index_count)
 
             elif index_size == 16:
-                self.indices = []
-                for index in br.get_uint16s(data_offset + indices_offset, index_count):
-                    self.indices.append(index)
-            
+                self.__index_source = (br, "H", data_offset + indices_offset, index_count)
+
             elif index_size == 32:
-                self.indices = br.get_int32s()
-            
+                self.__index_source = (br, "I", data_offset + indices_offset, index_count)
+
             else:
                 raise NotImplementedError(f"Unsupported index size: {index_size}")
 
+    @property
+    def indices(self) -> Union[List[int], array]:
+        if self.__index_source is not None:
+            self.read_indices()
+        return self.__indices
+
+    @indices.setter
+    def indices(self, indices: Union[List[int], array]):
+        self.__index_source = None
+        self.__indices = indices
+
+    def read_indices(self):
+        if self.__index_source is None:
+            return
+        br, typecode, offset, count = self.__index_source
+        self.__indices = br.get_array(typecode, offset, count)
+        self.__index_source = None
+
+    def vertex_index_size(self) -> int:
+        # Typed indices keep their width unless they no longer fit, plain lists get the smallest that fits.
+        indices = self.indices
+        itemsize = getattr(indices, "itemsize", 0)
+        if itemsize == 4:
+            return 32
+        if itemsize == 1 or itemsize == 2 or len(indices) == 0:
+            return 16
+        if np is not None:
+            indices = np.asarray(indices)
+            return 32 if np.any((indices > Util.UShort.MAX_VALUE) & (indices != 0xFFFFFFFF)) else 16
+        return 32 if any(i > Util.UShort.MAX_VALUE and i != 0xFFFFFFFF for i in indices) else 16
+
+    def packed_indices(self, index_size: int):
+        # Indices as an array of the given width, 32-bit primitive restarts become 0xFFFF in 16-bit data.
+        typecode = "B" if index_size == 8 else "H" if index_size == 16 else "I"
+        indices = self.indices
+        if isinstance(indices, array) and indices.typecode == typecode:
+            return indices
+        if np is not None:
+            values = np.asarray(indices, np.int64)
+            if index_size == 16:
+                values = np.where(values == 0xFFFFFFFF, Util.UShort.MAX_VALUE, values)
+            return values.astype(typecode)
+        if index_size == 16:
+            return array(typecode, (Util.UShort.MAX_VALUE if i == 0xFFFFFFFF else i for i in indices))
+        return array(typecode, indices)
+
+    def write(self, bw: BinaryWriterEx, header: FLVERHeader, index_size: int, index: int):
+        indices = self.indices
+        bw.write_uint32(self.flags)
+        bw.write_boolean(self.triangle_strip)
+        bw.write_boolean(self.cull_backfaces)
+        bw.write_int16(self.unk06)
+        bw.write_int32(len(indices))
+        bw.reserve_int32(f"FaceSetVertices{index}")
+
+        if header.version > 0x20005:
+            bw.write_int32(len(indices) * (index_size // 8))
+            bw.write_int32(0)
+            bw.write_int32(index_size if header.version >= 0x20013 else 0)
+            bw.write_int32(0)
+
+    def write_vertices(self, bw: BinaryWriterEx, index_size: int, index: int, data_start: int):
+        bw.fill_int32(f"FaceSetVertices{index}", bw.position - data_start)
+        bw.write_array(self.packed_indices(index_size))
+
 
     def triangluate(self, allow_primitive_restarts: bool, include_degenerate_faces: bool = False):
-        if(self.triangle_strip):
-            triangles = []
-            flip = False
-            for i in range(len(self.indices) - 2):
-                vi1 = self.indices[i]
-                vi2 = self.indices[i + 1]
-                vi3 = self.indices[i + 2]
-
-                if(allow_primitive_restarts  and (vi1 == 0xFFFF or vi2 == 0xFFFF or vi3 == 0xFFFF)):
-                    flip = False
-                else:
-                    if include_degenerate_faces or vi1 != vi2 and vi2 != vi3 and vi3 != vi1:
-                        if flip:
-                            triangles.append(vi3)
-                            triangles.append(vi2)
-                            triangles.append(vi1)
-                        else:
-                            triangles.append(vi1)
-                            triangles.append(vi2)
-                            triangles.append(vi3)
-                    
-                    flip = False
-                return triangles
-        return self.indices.copy()
+        # Returns an (N, 3) int32 array of triangles, or a list of index triples without NumPy.
+        if np is None:
+            return self.triangluate_list(allow_primitive_restarts, include_degenerate_faces)
+
+        indices = np.asarray(self.indices)
+        if not self.triangle_strip:
+            return indices[:len(indices) - len(indices) % 3].astype(np.int32).reshape(-1, 3)
+
+        count = len(indices) - 2
+        if count <= 0:
+            return np.empty((0, 3), np.int32)
+
+        triangles = np.stack((indices[:-2], indices[1:-1], indices[2:]), axis=1)
+        positions = np.arange(count)
+        if allow_primitive_restarts:
+            restarts = np.any(triangles == 0xFFFF, axis=1)
+            # Winding alternates per triangle and starts over after every restart.
+            last_restart = np.maximum.accumulate(np.where(restarts, positions, -1))
+            flip = ((positions - last_restart - 1) & 1).astype(bool)
+            keep = ~restarts
+        else:
+            flip = (positions & 1).astype(bool)
+            keep = np.ones(count, bool)
+
+        if not include_degenerate_faces:
+            vi1, vi2, vi3 = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+            keep &= (vi1 != vi2) & (vi2 != vi3) & (vi3 != vi1)
+
+        triangles[flip] = triangles[flip, ::-1]
+        return triangles[keep].astype(np.int32)
+
+    def triangluate_list(self, allow_primitive_restarts: bool, include_degenerate_faces: bool = False):
+        if not self.triangle_strip:
+            return [tuple(self.indices[i:i + 3]) for i in range(0, len(self.indices) - 2, 3)]
+
+        triangles = []
+        flip = False
+        for i in range(len(self.indices) - 2):
+            vi1 = self.indices[i]
+            vi2 = self.indices[i + 1]
+            vi3 = self.indices[i + 2]
+
+            if(allow_primitive_restarts  and (vi1 == 0xFFFF or vi2 == 0xFFFF or vi3 == 0xFFFF)):
+                flip = False
+            else:
+                if include_degenerate_faces or vi1 != vi2 and vi2 != vi3 and vi3 != vi1:
+                    if flip:
+                        triangles.append((vi3, vi2, vi1))
+                    else:
+                        triangles.append((vi1, vi2, vi3))
+
+                flip = not flip
+        return triangles
@@ -1,6 +1,4 @@
 from typing import List, Dict
-from mathutils import Vector
-from io import BytesIO
 from .flver_header import FLVERHeader
 from .gx_list import GXList
 from .mesh import Mesh
@@ -12,9 +10,12 @@ from .buffer_layout import BufferLayout
 from .sekiro_unk_struct import SekiroUnkStruct
 from ..flver import FLVER
 from ..dcx import DCX
+from ..sniffer import Sniffer
 from ...binder.bnd4 import BND4
 from ...util.sf_util import SFUtil
+from ...util.profiler import Profiler
 from ...util.binary_reader_ex import BinaryReaderEx
+from ...util.binary_writer_ex import BinaryWriterEx
 
 class FLVER2:
     
@@ -35,33 +36,37 @@ class FLVER2:
         self.bones = []
         self.meshes = []
         self.buffer_layouts = []
+        self.sekiro_unk = None
 
     def Is(self, br: BinaryReaderEx):
-        if br.stream.getbuffer().nbytes < 0xc:
-            return False
-
-        magic: str = br.get_ascii(0, 6)
-        endian: str = br.get_ascii(6, 2)
-        br.big_endian = endian == "B\0"
-        version: int = br.get_int32(8)
-        return magic == "FLVER\0" and version >= 0x20000 
+        return Sniffer.sniff(br.buffer) == Sniffer.FormatKind.FLVER2
     
-    def read_path(self, path: str):
-        f = open(path, "rb")
-        br = BinaryReaderEx(False, BytesIO(f.read()))
+    def read_path(self, path: str, lazy: bool = False, profiler: Profiler = None):
+        profiler = Profiler.get(profiler)
+        br = BinaryReaderEx.from_path(path)
         compression: DCX.CompressionType = DCX.CompressionType.UNKOWN
-        br = SFUtil.get_decompressed_br(br, compression)
+        if DCX.is_dcx(br):
+            with profiler.section("dcx", 1, br.length):
+                br = SFUtil.get_decompressed_br(br, compression)
         bnd = BND4()
         if(bnd.Is(br)):
-            bnd.read(br)
-            for f in bnd.files:
-                br = BinaryReaderEx(False, BytesIO(f.bytes))
+            profiler.start()
+            bnd.open(br)
+            profiler.lap("bnd4_headers", count=len(bnd.file_headers))
+            # Only entries that are FLVERs, or compressed and might be one, are read.
+            for f in bnd.iter_kind(Sniffer.FormatKind.FLVER2):
+                br = BinaryReaderEx(False, f.bytes)
+                profiler.lap("bnd4_entries", count=1, bytes=br.length)
                 if self.Is(br):
-                    self.read(br)
+                    self.read(br, lazy, profiler)
         else:
-            self.read(br)
+            self.read(br, lazy, profiler)
             
-    def read(self, br: BinaryReaderEx):
+    def read(self, br: BinaryReaderEx, lazy: bool = False, profiler: Profiler = None):
+        # With lazy set only the header tables are parsed, vertex and index data
+        # stay in br until Mesh.vertex_data or FaceSet.indices is first accessed.
+        profiler = Profiler.get(profiler)
+        profiler.start(br)
         br.set_big_endian(False)
 
         self.header = FLVERHeader()
@@ -96,8 +101,8 @@ class FLVER2:
         buffer_layout_count = br.read_int32()
         texture_count = br.read_int32()
 
-        self.header.unk5c = br.read_byte()
-        self.header.unk5d = br.read_byte()
+        self.header.unk5c = br.read_uint8()
+        self.header.unk5d = br.read_uint8()
         br.assert_byte(0)
         br.assert_byte(0)
 
@@ -109,36 +114,43 @@ class FLVER2:
         br.assert_int32(0)
         br.assert_int32(0)
         br.assert_int32(0)
+        profiler.lap("header", br, 1)
 
-        self.dummies = []
-        for i in range(dummy_count):
-            self.dummies.append(FLVER.Dummy(br, self.header.version))
+        self.dummies = FLVER.Dummy.read_all(br, self.header.version, dummy_count)
+        profiler.lap("dummies", br, dummy_count)
 
         self.materials = []
         gx_list_indices: Dict[int,int] = {}
         self.gx_lists: [GXList] = []
         for i in range(material_count):
             self.materials.append(Material(br, self.header, self.gx_lists, gx_list_indices))
+        profiler.lap("materials", br, material_count)
 
-        self.bones = []
-        for i in range(bone_count):
-            self.bones.append(FLVER.Bone(br, self.header.unicode))
+        self.bones = FLVER.Bone.read_all(br, self.header.unicode, bone_count)
+        profiler.lap("bones", br, bone_count)
 
         self.meshes = []
         for i in range(mesh_count):
             self.meshes.append(Mesh(br, self.header))
+        profiler.lap("meshes", br, mesh_count)
 
         face_sets = []
         for i in range(face_set_count):
             face_sets.append(FaceSet(br, self.header, vertex_indices_size, data_offset))
+        profiler.lap("face_sets", br, face_set_count)
 
         vertex_buffers = []
         for i in range(vertex_buffer_count):
             vertex_buffers.append(VertexBuffer(br))
+        # Totals for the profiler are only summed when it records them.
+        vertex_bytes = 0
+        if profiler.enabled:
+            vertex_bytes = sum(buffer.vertex_size * buffer.vertex_count for buffer in vertex_buffers)
 
         self.buffer_layouts = []
         for i in range(buffer_layout_count):
-            self.buffer_layouts.append(BufferLayout(br))
+            self.buffer_layouts.append(BufferLayout.read_interned(br))
+        profiler.lap("vertex_buffers", br, vertex_buffer_count + buffer_layout_count)
 
         textures = []
         for i in range(texture_count):
@@ -146,6 +158,7 @@ class FLVER2:
 
         if self.header.version >= 0x2001A:
             self.sekiro_unk = SekiroUnkStruct(br)
+        profiler.lap("textures", br, texture_count)
 
         texture_dict = SFUtil.dictionize(textures)
         for material in self.materials:
@@ -159,14 +172,191 @@ class FLVER2:
         for mesh in self.meshes:
             mesh.take_face_sets(face_set_dict)
             mesh.take_vertex_buffers(vertex_buffer_dict, self.buffer_layouts)
-            mesh.read_vertices(br, data_offset, self.buffer_layouts, self.header)
+            mesh.read_vertices(br, data_offset, self.buffer_layouts, self.header, lazy)
+        if lazy:
+            profiler.lap("meshes")
+        elif profiler.enabled:
+            profiler.lap("vertex_decode", count=sum(mesh.vertex_data.vertex_count for mesh in self.meshes), bytes=vertex_bytes)
         
         if len(face_set_dict) != 0:
             raise RuntimeError("Orphaned face sets found.")
         
         if len(vertex_buffer_dict) != 0:
             raise RuntimeError("Orphaned vertex buffers found.")
-        
 
-        
-        
+        if not lazy:
+            for face_set in face_sets:
+                face_set.read_indices()
+            if profiler.enabled:
+                profiler.lap("face_set_indices", count=sum(len(face_set.indices) for face_set in face_sets),
+                             bytes=sum(len(face_set.indices) * face_set.indices.itemsize for face_set in face_sets))
+
+    def edit_buffer_layout(self, index: int) -> BufferLayout:
+        # Layouts and GX lists read from a file are shared, read only copies. These swap in an
+        # editable copy the first time one is about to change, the shared one is left as is.
+        layout = self.buffer_layouts[index] = self.buffer_layouts[index].thaw()
+        return layout
+
+    def edit_gx_list(self, index: int) -> GXList:
+        gx_list = self.gx_lists[index] = self.gx_lists[index].thaw()
+        return gx_list
+
+    def write_path(self, path: str):
+        # Writes an uncompressed FLVER, DCX compression is not supported yet.
+        bw = BinaryWriterEx(self.header.big_endian)
+        self.write(bw)
+        with open(path, "wb") as f:
+            f.write(bw.finish())
+
+    def write(self, bw: BinaryWriterEx):
+        # Tables first with placeholders for every offset, then the data they point to. Index and
+        # vertex data are packed per face set and per vertex buffer from their arrays.
+        header = self.header
+        bw.big_endian = header.big_endian
+        face_sets = [face_set for mesh in self.meshes for face_set in mesh.face_sets]
+        textures = [texture for material in self.materials for texture in material.textures]
+
+        header_index_size = 0
+        if header.version < 0x20013:
+            header_index_size = max([16] + [face_set.vertex_index_size() for face_set in face_sets])
+
+        bw.write_bytes(b"FLVER\0")
+        bw.write_bytes(b"B\0" if header.big_endian else b"L\0")
+        bw.write_int32(header.version)
+
+        bw.reserve_int32("DataOffset")
+        bw.reserve_int32("DataSize")
+        bw.write_int32(len(self.dummies))
+        bw.write_int32(len(self.materials))
+        bw.write_int32(len(self.bones))
+        bw.write_int32(len(self.meshes))
+        bw.write_int32(sum(len(mesh.vertex_buffers) for mesh in self.meshes))
+
+        bw.write_vector3(header.bounding_box_min)
+        bw.write_vector3(header.bounding_box_max)
+
+        # Face counts, informational only and not read back.
+        true_face_count = 0
+        for face_set in face_sets:
+            if not face_set.flags & (FaceSet.FSFlags.LODLEVEL1 | FaceSet.FSFlags.LODLEVEL2 | FaceSet.FSFlags.MOTIONBLUR):
+                index_count = len(face_set.indices)
+                true_face_count += max(index_count - 2, 0) if face_set.triangle_strip else index_count // 3
+        bw.write_int32(true_face_count)
+        bw.write_int32(sum(len(face_set.indices) for face_set in face_sets))
+
+        bw.write_byte(header_index_size)
+        bw.write_boolean(header.unicode)
+        bw.write_boolean(header.unk4a)
+        bw.write_byte(0)
+
+        bw.write_int32(header.unk4c)
+
+        bw.write_int32(len(face_sets))
+        bw.write_int32(len(self.buffer_layouts))
+        bw.write_int32(len(textures))
+
+        bw.write_byte(header.unk5c)
+        bw.write_byte(header.unk5d)
+        bw.write_byte(0)
+        bw.write_byte(0)
+
+        bw.write_int32(0)
+        bw.write_int32(0)
+        bw.write_int32(header.unk68)
+        bw.write_pattern(0x14, 0x00)
+
+        for dummy in self.dummies:
+            dummy.write(bw, header.version)
+
+        texture_index = 0
+        for i, material in enumerate(self.materials):
+            material.write(bw, i, texture_index)
+            texture_index += len(material.textures)
+
+        for i, bone in enumerate(self.bones):
+            bone.write(bw, i)
+
+        for i, mesh in enumerate(self.meshes):
+            mesh.write(bw, i)
+
+        index_sizes = [header_index_size or face_set.vertex_index_size() for face_set in face_sets]
+        for i, face_set in enumerate(face_sets):
+            face_set.write(bw, header, index_sizes[i], i)
+
+        vertex_buffer_index = 0
+        for mesh in self.meshes:
+            for j, vertex_buffer in enumerate(mesh.vertex_buffers):
+                vertex_buffer.write(bw, header, vertex_buffer_index, j, self.buffer_layouts, mesh.vertex_data.vertex_count)
+                vertex_buffer_index += 1
+
+        for i, layout in enumerate(self.buffer_layouts):
+            layout.write(bw, i)
+
+        for i, texture in enumerate(textures):
+            texture.write(bw, i)
+
+        sekiro_unk = None
+        if header.version >= 0x2001A:
+            sekiro_unk = self.sekiro_unk or SekiroUnkStruct()
+            sekiro_unk.write(bw)
+
+        bw.pad(0x10)
+        for i, layout in enumerate(self.buffer_layouts):
+            layout.write_members(bw, i)
+
+        for i, mesh in enumerate(self.meshes):
+            mesh.write_bounding_box(bw, i, header)
+
+        for i, mesh in enumerate(self.meshes):
+            mesh.write_bone_indices(bw, i)
+
+        face_set_index = 0
+        for i, mesh in enumerate(self.meshes):
+            mesh.write_face_set_indices(bw, i, face_set_index)
+            face_set_index += len(mesh.face_sets)
+
+        vertex_buffer_index = 0
+        for i, mesh in enumerate(self.meshes):
+            mesh.write_vertex_buffer_indices(bw, i, vertex_buffer_index)
+            vertex_buffer_index += len(mesh.vertex_buffers)
+
+        gx_offsets = []
+        for gx_list in self.gx_lists:
+            gx_offsets.append(bw.position)
+            gx_list.write(bw, header)
+        for i, material in enumerate(self.materials):
+            bw.fill_int32(f"GXOffset{i}", gx_offsets[material.gx_index] if material.gx_index != -1 else 0)
+
+        for i, material in enumerate(self.materials):
+            material.write_strings(bw, header, i)
+
+        for i, texture in enumerate(textures):
+            texture.write_strings(bw, header, i)
+
+        for i, bone in enumerate(self.bones):
+            bone.write_strings(bw, header.unicode, i)
+
+        if sekiro_unk is not None:
+            sekiro_unk.write_members(bw)
+
+        alignment = 0x20 if header.version <= 0x2000E else 0x10
+        bw.pad(alignment)
+        if header.version == 0x2000F or header.version == 0x20010:
+            bw.pad(0x20)
+
+        data_start = bw.position
+        bw.fill_int32("DataOffset", data_start)
+
+        for i, face_set in enumerate(face_sets):
+            face_set.write_vertices(bw, index_sizes[i], i, data_start)
+            bw.pad(alignment)
+
+        vertex_buffer_index = 0
+        for mesh in self.meshes:
+            counts = {}
+            for vertex_buffer in mesh.vertex_buffers:
+                vertex_buffer.write_buffer(bw, vertex_buffer_index, self.buffer_layouts, mesh.vertex_data, data_start, header, counts)
+                vertex_buffer_index += 1
+                bw.pad(alignment)
+
+        bw.fill_int32("DataSize", bw.position - data_start)
@@ -0,0 +1,113 @@
+import os
+import sys
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, util
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple
+from .flver2 import FLVER2
+from ..dcx import DCX
+from ..sniffer import Sniffer
+from ...binder.bnd4 import BND4
+from ...binder.binder import Binder
+from ...util.sf_util import SFUtil
+from ...util.binary_reader_ex import BinaryReaderEx
+
+class FLVER2Batch:
+    # Parses every FLVER in a binder on a process pool. Workers are only sent the source and the
+    # byte range of their entry: they map the binder file themselves, or attach to a shared
+    # memory block when the binder had to be decompressed first. Entry decompression and
+    # FLVER2.read both run in the workers and only the parsed models are pickled back.
+    SOURCE_FILE = "file"
+    SOURCE_SHARED_MEMORY = "shm"
+
+    # Sources already opened by this worker process, keyed by (kind, name).
+    sources: Dict[Tuple[str, str], Tuple[object, BinaryReaderEx]] = {}
+
+    @staticmethod
+    def read_path(path: str, max_workers: int = None) -> List[Tuple[str, FLVER2]]:
+        br = BinaryReaderEx.from_path(path)
+        source = (FLVER2Batch.SOURCE_FILE, path)
+        decompressed = DCX.is_dcx(br)
+        if decompressed:
+            br = SFUtil.get_decompressed_br(br, DCX.CompressionType.UNKOWN)
+
+        bnd = BND4()
+        if not bnd.Is(br):
+            flver = FLVER2()
+            flver.read(br)
+            return [(path, flver)]
+
+        bnd.open(br)
+        entries = [(file_header.name, file_header.data_offset, file_header.compressed_size, Binder.is_compressed(file_header.file_flags))
+                   for file_header in bnd.file_headers
+                   if Binder.is_compressed(file_header.file_flags) or file_header.sniff(br) == Sniffer.FormatKind.FLVER2]
+
+        shared_memory = None
+        if decompressed:
+            shared_memory = SharedMemory(create=True, size=max(br.length, 1))
+            shared_memory.buf[:br.length] = br.buffer
+            source = (FLVER2Batch.SOURCE_SHARED_MEMORY, shared_memory.name)
+        del bnd, br
+
+        try:
+            workers = max_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(workers) as executor:
+                chunksize = max(1, len(entries) // (workers * 4))
+                flvers = executor.map(FLVER2Batch.read_entry, repeat(source),
+                                      [entry[1] for entry in entries], [entry[2] for entry in entries], [entry[3] for entry in entries],
+                                      chunksize=chunksize)
+                return [(entry[0], flver) for entry, flver in zip(entries, flvers) if flver is not None]
+        finally:
+            if shared_memory is not None:
+                shared_memory.close()
+                shared_memory.unlink()
+
+    @staticmethod
+    def read_entry(source: Tuple[str, str], offset: int, size: int, compressed: bool) -> FLVER2:
+        br = BinaryReaderEx(False, FLVER2Batch.open_source(source).get_view(offset, size))
+        if compressed:
+            br = BinaryReaderEx(False, DCX.decompress(br, DCX.detect(br)))
+
+        flver = FLVER2()
+        if not flver.Is(br):
+            return None
+        flver.read(br)
+        return flver
+
+    @staticmethod
+    def open_source(source: Tuple[str, str]) -> BinaryReaderEx:
+        if source not in FLVER2Batch.sources:
+            if not FLVER2Batch.sources:
+                # The pool only lives for one read_path, so worker exit is the end of the batch.
+                util.Finalize(None, FLVER2Batch.close_sources, exitpriority=10)
+            kind, name = source
+            if kind == FLVER2Batch.SOURCE_SHARED_MEMORY:
+                shared_memory = FLVER2Batch.attach(name)
+                FLVER2Batch.sources[source] = (shared_memory, BinaryReaderEx(False, shared_memory.buf))
+            else:
+                FLVER2Batch.sources[source] = (None, BinaryReaderEx.from_path(name))
+        return FLVER2Batch.sources[source][1]
+
+    @staticmethod
+    def attach(name: str) -> SharedMemory:
+        # read_path owns the block and unlinks it, workers must not track it as well: a worker with
+        # a resource tracker of its own would unlink it on exit, and one sharing the parent's would
+        # drop the parent's registration. Before 3.13 attaching always registers, so it is skipped
+        # for the duration of the call, as unregistering afterwards would do the latter.
+        if sys.version_info >= (3, 13):
+            return SharedMemory(name=name, track=False)
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+    @staticmethod
+    def close_sources():
+        # The readers hold views of the blocks, so they are dropped before the blocks are closed.
+        shared_memories = [shared_memory for shared_memory, br in FLVER2Batch.sources.values() if shared_memory is not None]
+        FLVER2Batch.sources.clear()
+        for shared_memory in shared_memories:
+            shared_memory.close()
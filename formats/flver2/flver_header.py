@@ -1,10 +1,10 @@
-from mathutils import Vector
+from ...util.vector import Vector3
 
 class FLVERHeader:
     big_endian: bool
     version: int
-    bounding_box_min: Vector
-    bounding_box_max: Vector
+    bounding_box_min: Vector3
+    bounding_box_max: Vector3
     unicode: bool
     unk4a: bool
     unk4c: int
@@ -15,4 +15,11 @@ class FLVERHeader:
     def __init__(self):
         self.big_endian = False
         self.version = 0x20014
+        self.bounding_box_min = (0.0, 0.0, 0.0)
+        self.bounding_box_max = (0.0, 0.0, 0.0)
         self.unicode = True
+        self.unk4a = False
+        self.unk4c = 0
+        self.unk5c = 0
+        self.unk5d = 0
+        self.unk68 = 0
@@ -1,7 +1,11 @@
+from collections import OrderedDict
 from sys import maxsize
+from typing import NamedTuple, Tuple
+from zlib import crc32
 from .flver_header import FLVERHeader
 from ...util.util import Util
 from ...util.binary_reader_ex import BinaryReaderEx
+from ...util.binary_writer_ex import BinaryWriterEx
 
 class GXList(list):
     class GXItem:
@@ -34,12 +38,28 @@ class GXList(list):
                 length = br.read_int32()
                 self.data = bytearray(br.read_bytes(length - 0xc))
 
+        def write(self, bw: BinaryWriterEx, header: FLVERHeader):
+            if header.version < 0x20010:
+                bw.write_int32(int(self.id))
+            else:
+                bw.write_fixed_str(self.id, 4)
+            bw.write_int32(self.unk04)
+            bw.write_int32(len(self.data) + 0xc)
+            bw.write_bytes(self.data)
+
 
     terminator_id: int
     terminator_length: int
 
+    # Lists read with read_interned, keyed by byte order, item format, length and checksum of the
+    # raw bytes. Each entry keeps those bytes to rule out checksum collisions. The least recently
+    # used list is dropped once the table holds INTERN_LIMIT of them.
+    interned: "OrderedDict[Tuple[bool, bool, int, int], Tuple[bytes, FrozenGXList]]" = OrderedDict()
+    INTERN_LIMIT = 1024
+
     def __init__(self, *params):
         self.terminator_id = Util.Int32.MAX_SIZE
+        self.terminator_length = 0
 
         if len(params) == 2:
             Util.assert_params(params, BinaryReaderEx, FLVERHeader)
@@ -49,14 +69,106 @@ class GXList(list):
             if header.version < 0x20010:
                 self.append(GXList.GXItem(br, header))
             else:
-                id: int = br.get_int32(br.stream.tell())
+                id: int = br.get_int32(br.position)
                 while id != Util.Int32.MAX_SIZE and id != -1:
                     self.append(GXList.GXItem(br, header))
-                    id = br.get_int32(br.stream.tell())
+                    id = br.get_int32(br.position)
                 
                 self.terminator_id = br.assert_int32(id)
                 br.assert_int32(100)
                 self.terminator_length = br.read_int32() - 0xc
                 br.assert_pattern(self.terminator_length, 0x00)
 
+    @staticmethod
+    def read_interned(br: BinaryReaderEx, header: FLVERHeader) -> "FrozenGXList":
+        # Same parameter blocks repeat across materials and files, so a list is only parsed the
+        # first time its bytes are seen and every material using it shares one read only list.
+        # The extent is found by following the item lengths. FLVER2.edit_gx_list swaps in an
+        # editable copy when one has to change.
+        start = end = br.position
+        if header.version < 0x20010:
+            end += br.get_int32(end + 8)
+        else:
+            id = None
+            while id != Util.Int32.MAX_SIZE and id != -1:
+                id = br.get_int32(end)
+                length = br.get_int32(end + 8)
+                if length < 0xc:
+                    # Malformed, let the regular read report it.
+                    return GXList(br, header).freeze()
+                end += length
+
+        data = br.get_view(start, end - start)
+        key = (br.big_endian, header.version < 0x20010, len(data), crc32(data))
+        entry = GXList.interned.get(key)
+        if entry is None or entry[0] != data:
+            gx_list = GXList(br, header).freeze()
+            GXList.interned[key] = (data.tobytes(), gx_list)
+            if len(GXList.interned) > GXList.INTERN_LIMIT:
+                GXList.interned.popitem(last=False)
+            return gx_list
+
+        GXList.interned.move_to_end(key)
+        br.seek(end)
+        return entry[1]
+
+    @staticmethod
+    def clear_interned():
+        GXList.interned.clear()
+
+    def freeze(self) -> "FrozenGXList":
+        items = (FrozenGXItem(item.id, item.unk04, bytes(item.data)) for item in self)
+        return FrozenGXList(items, self.terminator_id, self.terminator_length)
+
+    def thaw(self) -> "GXList":
+        return self
+
+    def write(self, bw: BinaryWriterEx, header: FLVERHeader):
+        if header.version < 0x20010:
+            self[0].write(bw, header)
+        else:
+            for item in self:
+                item.write(bw, header)
+            bw.write_int32(self.terminator_id)
+            bw.write_int32(100)
+            bw.write_int32(self.terminator_length + 0xc)
+            bw.write_pattern(self.terminator_length, 0x00)
+
+class FrozenGXItem(NamedTuple):
+    # Read only GXItem, shared by every list interned from the same bytes.
+    id: str
+    unk04: int
+    data: bytes
+
+    write = GXList.GXItem.write
+
+    def thaw(self) -> GXList.GXItem:
+        return GXList.GXItem(self.id, self.unk04, bytearray(self.data))
+
+class FrozenGXList(Tuple[FrozenGXItem, ...]):
+    # Read only GXList handed out by read_interned. Writes the same way, thaw() returns an
+    # editable GXList with items of its own.
+    terminator_id: int
+    terminator_length: int
+
+    def __new__(cls, items, terminator_id: int, terminator_length: int):
+        gx_list = super().__new__(cls, items)
+        gx_list.terminator_id = terminator_id
+        gx_list.terminator_length = terminator_length
+        return gx_list
+
+    def __reduce__(self):
+        # FLVER2Batch pickles parsed models back from its workers.
+        return (FrozenGXList, (tuple(self), self.terminator_id, self.terminator_length))
+
+    write = GXList.write
+
+    def freeze(self) -> "FrozenGXList":
+        return self
 
+    def thaw(self) -> GXList:
+        gx_list = GXList()
+        gx_list.terminator_id = self.terminator_id
+        gx_list.terminator_length = self.terminator_length
+        gx_list.extend(item.thaw() for item in self)
+        return gx_list
@@ -4,6 +4,7 @@ from .flver_header import FLVERHeader
 from .gx_list import GXList
 from ...util.util import Util
 from ...util.binary_reader_ex import BinaryReaderEx
+from ...util.binary_writer_ex import BinaryWriterEx
 
 class Material:
     name: str
@@ -20,8 +21,10 @@ class Material:
     def __init__(self, *params):
         self.name = ""
         self.mtd = ""
+        self.flags = 0
         self.textures = []
         self.gx_index = -1
+        self.unk18 = 0
 
         if len(params) == 3:
             Util.assert_params(params, str, str, int)
@@ -58,13 +61,35 @@ class Material:
                 if not gx_offset in gx_list_indices.keys():
                     br.step_in(gx_offset)
                     gx_list_indices[gx_offset] = len(gx_list)
-                    gx_list.append(GXList(br, header))
+                    gx_list.append(GXList.read_interned(br, header))
                     br.step_out()
 
-                    self.gx_index = gx_list_indices[gx_offset]
+                self.gx_index = gx_list_indices[gx_offset]
 
     def __str__(self):
         return f"{self.name} | {self.mtd}"
+
+    def write(self, bw: BinaryWriterEx, index: int, texture_index: int):
+        bw.reserve_int32(f"MaterialName{index}")
+        bw.reserve_int32(f"MaterialMTD{index}")
+        bw.write_int32(len(self.textures))
+        bw.write_int32(texture_index)
+        bw.write_int32(self.flags)
+        bw.reserve_int32(f"GXOffset{index}")
+        bw.write_int32(self.unk18)
+        bw.write_int32(0)
+
+    def write_strings(self, bw: BinaryWriterEx, header: FLVERHeader, index: int):
+        bw.fill_int32(f"MaterialName{index}", bw.position)
+        if header.unicode:
+            bw.write_utf16(self.name)
+        else:
+            bw.write_shift_jis(self.name)
+        bw.fill_int32(f"MaterialMTD{index}", bw.position)
+        if header.unicode:
+            bw.write_utf16(self.mtd)
+        else:
+            bw.write_shift_jis(self.mtd)
     
     def take_textures(self, texture_dict: Dict[int, Texture]):
         self.textures = []
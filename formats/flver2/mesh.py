@@ -1,34 +1,42 @@
 from sys import float_info
-from itertools import chain
 from typing import List, Dict
-from mathutils import Vector
+from ...util.vector import Vector3
 from .face_set import FaceSet
 from .flver_header import FLVERHeader
 from .buffer_layout import BufferLayout
 from ..flver import FLVER
 from .vertex_buffer import VertexBuffer
+from .mesh_vertex_data import MeshVertexData
 from ...util.util import Util
 from ...util.binary_reader_ex import BinaryReaderEx
+from ...util.binary_writer_ex import BinaryWriterEx
 
 class Mesh:
     class BoundingBoxes:
-        min: Vector
-        max: Vector
-        unk: Vector
+        min: Vector3
+        max: Vector3
+        unk: Vector3
 
         def __init__(self, *params):
-            min = Vector((float_info.min, float_info.min, float_info.min))
-            max = Vector((float_info.max, float_info.max, float_info.max))
+            self.min = (float_info.min, float_info.min, float_info.min)
+            self.max = (float_info.max, float_info.max, float_info.max)
+            self.unk = (0.0, 0.0, 0.0)
 
             if len(params) == 2:
                 Util.assert_params(params, BinaryReaderEx, FLVERHeader)
                 br: BinaryReaderEx = params[0]
                 header: FLVERHeader = params[1]
 
-                min = br.read_vector3()
-                max = br.read_vector3()
+                self.min = br.read_vector3()
+                self.max = br.read_vector3()
                 if header.version >= 0x2001A:
-                    unk = br.read_vector3()
+                    self.unk = br.read_vector3()
+
+        def write(self, bw: BinaryWriterEx, header: FLVERHeader):
+            bw.write_vector3(self.min)
+            bw.write_vector3(self.max)
+            if header.version >= 0x2001A:
+                bw.write_vector3(self.unk)
 
     dynamic: int
     material_index: int
@@ -36,18 +44,22 @@ class Mesh:
     bone_indices: List[int]
     face_sets: List[FaceSet]
     vertex_buffers: List[VertexBuffer]
-    vertices: List[FLVER.Vertex]
     bounding_box: BoundingBoxes
 
+    __vertex_data: MeshVertexData
+    __vertex_source: tuple
     __face_set_indices: List[int]
     __vertex_buffer_indices: List[int]
 
     def __init__(self, *params):
+        self.dynamic = 0
+        self.material_index = 0
         self.default_bone_index = -1
+        self.bounding_box = None
         self.bone_indices = []
         self.face_sets = []
         self.vertex_buffers = []
-        self.vertices = []
+        self.vertex_data = MeshVertexData()
 
         if len(params) == 2:
             Util.assert_params(params, BinaryReaderEx, FLVERHeader)
@@ -80,6 +92,27 @@ class Mesh:
             self.__face_set_indices = br.get_int32s(face_set_offset, face_set_count)
             self.__vertex_buffer_indices = br.get_int32s(vertex_buffer_offset, vertex_buffer_count)
 
+    @property
+    def vertex_data(self) -> MeshVertexData:
+        if self.__vertex_source is not None:
+            self.read_vertices(*self.__vertex_source)
+        return self.__vertex_data
+
+    @vertex_data.setter
+    def vertex_data(self, vertex_data: MeshVertexData):
+        self.__vertex_source = None
+        self.__vertex_data = vertex_data
+
+    @property
+    def vertices(self) -> List[FLVER.Vertex]:
+        return self.vertex_data.vertices()
+
+    @vertices.setter
+    def vertices(self, vertices: List[FLVER.Vertex]):
+        self.vertex_data = MeshVertexData(len(vertices))
+        if vertices:
+            self.vertex_data.add_vertices(vertices)
+
     def take_face_sets(self, face_set_dict: Dict[int, FaceSet]):
         self.face_sets = []
         
@@ -117,18 +150,50 @@ class Mesh:
             if (buffer.buffer_index & ~0x60000000) is not i:
                 raise ValueError("Unexpected vertex buffer index.")
     
-    def read_vertices(self, br: BinaryReaderEx, data_offset: int, layouts: List[BufferLayout], header: FLVERHeader):
-        layout_members = list(chain(*layouts))
-        uv_cap = len([m for m in layout_members if m.semantic == FLVER.LayoutMember.LayoutSemantic.UV])
-        tan_cap = len([m for m in layout_members if m.semantic == FLVER.LayoutMember.LayoutSemantic.TANGENT])
-        color_cap = len([m for m in layout_members if m.semantic == FLVER.LayoutMember.LayoutSemantic.VERTEXCOLOR])
-
-        vertex_count = self.vertex_buffers[0].vertex_count
-        self.vertices = []
-        for i in range(vertex_count):
-            self.vertices.append(FLVER.Vertex(uv_cap, tan_cap, color_cap))
-        
-        for buffer in self.vertex_buffers:
-            buffer.read_buffer(br, layouts, self.vertices, data_offset, header)
-            
+    def read_vertices(self, br: BinaryReaderEx, data_offset: int, layouts: List[BufferLayout], header: FLVERHeader, lazy: bool = False):
+        if lazy:
+            # Decoded on first access to vertex_data.
+            self.__vertex_source = (br, data_offset, layouts, header)
+            return
 
+        vertex_data = MeshVertexData(self.vertex_buffers[0].vertex_count)
+        for buffer in self.vertex_buffers:
+            buffer.read_buffer(br, layouts, vertex_data, data_offset, header)
+        self.vertex_data = vertex_data
+
+    def write(self, bw: BinaryWriterEx, index: int):
+        bw.write_byte(self.dynamic)
+        bw.write_byte(0)
+        bw.write_byte(0)
+        bw.write_byte(0)
+
+        bw.write_int32(self.material_index)
+        bw.write_int32(0)
+        bw.write_int32(0)
+        bw.write_int32(self.default_bone_index)
+        bw.write_int32(len(self.bone_indices))
+        bw.reserve_int32(f"MeshBoundingBox{index}")
+        bw.reserve_int32(f"MeshBoneIndices{index}")
+        bw.write_int32(len(self.face_sets))
+        bw.reserve_int32(f"MeshFaceSetIndices{index}")
+        bw.write_int32(len(self.vertex_buffers))
+        bw.reserve_int32(f"MeshVertexBufferIndices{index}")
+
+    def write_bounding_box(self, bw: BinaryWriterEx, index: int, header: FLVERHeader):
+        if self.bounding_box is None:
+            bw.fill_int32(f"MeshBoundingBox{index}", 0)
+        else:
+            bw.fill_int32(f"MeshBoundingBox{index}", bw.position)
+            self.bounding_box.write(bw, header)
+
+    def write_bone_indices(self, bw: BinaryWriterEx, index: int):
+        bw.fill_int32(f"MeshBoneIndices{index}", bw.position)
+        bw.write_int32s(self.bone_indices)
+
+    def write_face_set_indices(self, bw: BinaryWriterEx, index: int, face_set_index: int):
+        bw.fill_int32(f"MeshFaceSetIndices{index}", bw.position)
+        bw.write_int32s(range(face_set_index, face_set_index + len(self.face_sets)))
+
+    def write_vertex_buffer_indices(self, bw: BinaryWriterEx, index: int, vertex_buffer_index: int):
+        bw.fill_int32(f"MeshVertexBufferIndices{index}", bw.position)
+        bw.write_int32s(range(vertex_buffer_index, vertex_buffer_index + len(self.vertex_buffers)))
@@ -0,0 +1,155 @@
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple
+from ..flver import FLVER
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LayoutSemantic = FLVER.LayoutMember.LayoutSemantic
+
+class MeshVertexData:
+    # Struct-of-arrays vertex storage for a mesh. Every attribute is one contiguous array keyed
+    # by (semantic, index): an (N, C) ndarray when NumPy is available, otherwise a flat
+    # array.array of N * C values. See VertexDecoder for the layout of each semantic.
+
+    class Vertices(Sequence):
+        # Read-only List[FLVER.Vertex] view, vertices are only built when accessed.
+        def __init__(self, data: "MeshVertexData"):
+            self.data = data
+
+        def __len__(self) -> int:
+            return self.data.vertex_count
+
+        def __getitem__(self, i):
+            if isinstance(i, slice):
+                return [self.data.vertex(j) for j in range(*i.indices(self.data.vertex_count))]
+            if i < 0:
+                i += self.data.vertex_count
+            if i < 0 or i >= self.data.vertex_count:
+                raise IndexError(f"Vertex index ({i}) was out of range.")
+            return self.data.vertex(i)
+
+        def __iter__(self) -> Iterator[FLVER.Vertex]:
+            for i in range(self.data.vertex_count):
+                yield self.data.vertex(i)
+
+    vertex_count: int
+    arrays: Dict[Tuple[LayoutSemantic, int], object]
+    components: Dict[Tuple[LayoutSemantic, int], int]
+
+    def __init__(self, vertex_count: int = 0):
+        self.vertex_count = vertex_count
+        self.arrays = {}
+        self.components = {}
+
+    def __len__(self) -> int:
+        return self.vertex_count
+
+    def __contains__(self, key: Tuple[LayoutSemantic, int]) -> bool:
+        return key in self.arrays
+
+    def get(self, semantic: LayoutSemantic, index: int = 0):
+        return self.arrays.get((semantic, index))
+
+    def count(self, semantic: LayoutSemantic) -> int:
+        count = 0
+        while (semantic, count) in self.arrays:
+            count += 1
+        return count
+
+    def add(self, semantic: LayoutSemantic, values, components: int = None) -> int:
+        index = self.count(semantic)
+        if components is None:
+            components = values.shape[1]
+        self.arrays[(semantic, index)] = values
+        self.components[(semantic, index)] = components
+        return index
+
+    def add_arrays(self, arrays: Dict[Tuple[LayoutSemantic, int], object], components: Dict[Tuple[LayoutSemantic, int], int] = None):
+        # Indices restart for every vertex buffer, so append after what is already stored.
+        # Flat array.array columns need their component counts passed in.
+        for key, values in sorted(arrays.items(), key=lambda item: item[0][1]):
+            self.add(key[0], values, components[key] if components is not None else None)
+
+    def row(self, semantic: LayoutSemantic, index: int, i: int) -> list:
+        values = self.arrays[(semantic, index)]
+        if np is not None and isinstance(values, np.ndarray):
+            return values[i].tolist()
+        c = self.components[(semantic, index)]
+        return values[i * c:(i + 1) * c].tolist()
+
+    def vertices(self) -> "MeshVertexData.Vertices":
+        return MeshVertexData.Vertices(self)
+
+    def vertex(self, i: int) -> FLVER.Vertex:
+        vertex = FLVER.Vertex(self.count(LayoutSemantic.UV), self.count(LayoutSemantic.TANGENT), self.count(LayoutSemantic.VERTEXCOLOR))
+        for (semantic, index) in self.arrays:
+            row = self.row(semantic, index, i)
+            if semantic == LayoutSemantic.POSITION:
+                vertex.position = tuple(row)
+            elif semantic == LayoutSemantic.NORMAL:
+                vertex.normal = tuple(row[:3])
+                vertex.normal_w = int(row[3])
+            elif semantic == LayoutSemantic.UV:
+                vertex.uvs.append(tuple(row) if len(row) == 3 else (row[0], row[1], 0.0))
+            elif semantic == LayoutSemantic.TANGENT:
+                vertex.tangents.append(tuple(row))
+            elif semantic == LayoutSemantic.BITANGENT:
+                vertex.bitangent = tuple(row)
+            elif semantic == LayoutSemantic.VERTEXCOLOR:
+                r, g, b, a = row
+                vertex.colors.append(FLVER.VertexColor(a, r, g, b))
+            elif semantic == LayoutSemantic.BONEWEIGHTS:
+                vertex.bone_weights = FLVER.VertexBoneWeights(*row)
+            elif semantic == LayoutSemantic.BONEINDICES:
+                vertex.bone_indices = FLVER.VertexBoneIndices(*row)
+        return vertex
+
+    def add_vertices(self, vertices: List[FLVER.Vertex], layout: List[FLVER.LayoutMember] = None):
+        # Columnizes vertices read one at a time, either for the members of a single layout
+        # or, without a layout, for whatever attributes the vertices have.
+        LayoutType = FLVER.LayoutMember.LayoutType
+        if layout is None:
+            semantics = set(semantic for semantic, name in ((LayoutSemantic.POSITION, "position"), (LayoutSemantic.NORMAL, "normal"), (LayoutSemantic.BITANGENT, "bitangent"))
+                            if hasattr(vertices[0], name))
+            semantics.update((LayoutSemantic.BONEWEIGHTS, LayoutSemantic.BONEINDICES))
+            uv_components = [3 if any(v.uvs[j][2] for v in vertices) else 2 for j in range(len(vertices[0].uvs))]
+            layout = []
+        else:
+            semantics = set(member.semantic for member in layout)
+            uv_components = []
+        for member in layout:
+            if member.semantic == LayoutSemantic.UV:
+                if member.type == LayoutType.FLOAT3 or member.type == LayoutType.SHORT4TOFLOAT4B:
+                    uv_components.append(3)
+                elif member.type == LayoutType.FLOAT4 or member.type == LayoutType.UVPAIR:
+                    uv_components.extend((2, 2))
+                else:
+                    uv_components.append(2)
+
+        def column(typecode: str, rows: Iterator, components: int):
+            values = array(typecode)
+            for row in rows:
+                values.extend(row)
+            if np is not None:
+                return np.frombuffer(values, values.typecode).reshape(-1, components).astype(np.int32 if typecode == "i" else np.float32)
+            return values
+
+        if LayoutSemantic.POSITION in semantics and hasattr(vertices[0], "position"):
+            self.add(LayoutSemantic.POSITION, column("f", (v.position for v in vertices), 3), 3)
+        if LayoutSemantic.BONEWEIGHTS in semantics:
+            self.add(LayoutSemantic.BONEWEIGHTS, column("f", ((v.bone_weights[j] for j in range(4)) for v in vertices), 4), 4)
+        if LayoutSemantic.BONEINDICES in semantics:
+            self.add(LayoutSemantic.BONEINDICES, column("i", ((v.bone_indices[j] for j in range(4)) for v in vertices), 4), 4)
+        if LayoutSemantic.NORMAL in semantics:
+            self.add(LayoutSemantic.NORMAL, column("f", ((*v.normal, getattr(v, "normal_w", 0)) for v in vertices), 4), 4)
+        for j, components in enumerate(uv_components):
+            self.add(LayoutSemantic.UV, column("f", (v.uvs[j][:components] for v in vertices), components), components)
+        for j in range(len(vertices[0].tangents)):
+            self.add(LayoutSemantic.TANGENT, column("f", (v.tangents[j] for v in vertices), 4), 4)
+        if LayoutSemantic.BITANGENT in semantics:
+            self.add(LayoutSemantic.BITANGENT, column("f", (v.bitangent for v in vertices), 4), 4)
+        for j in range(len(vertices[0].colors)):
+            self.add(LayoutSemantic.VERTEXCOLOR, column("f", ((c.R, c.G, c.B, c.A) for c in (v.colors[j] for v in vertices)), 4), 4)
@@ -1,21 +1,30 @@
 from typing import List
 from ...util.binary_reader_ex import BinaryReaderEx
+from ...util.binary_writer_ex import BinaryWriterEx
 
 class SekiroUnkStruct:
     class Member:
         unk00: List[int]
         index: int
 
-        def __init__(self, br: BinaryReaderEx):
+        def __init__(self, br: BinaryReaderEx = None):
+            self.unk00 = [0, 0, 0, 0]
+            self.index = 0
+
             if br:
                 self.unk00 = br.read_int16s(4)
                 self.index = br.read_int32()
                 br.assert_int32(0)
 
+        def write(self, bw: BinaryWriterEx):
+            bw.write_int16s(self.unk00)
+            bw.write_int32(self.index)
+            bw.write_int32(0)
+
     members1: List[Member]
     members2: List[Member]
 
-    def __init__(self, br: BinaryReaderEx):
+    def __init__(self, br: BinaryReaderEx = None):
         self.members1 = []
         self.members2 = []
 
@@ -40,3 +49,18 @@ class SekiroUnkStruct:
                 self.members2.append(SekiroUnkStruct.Member(br))
             br.step_out()
 
+    def write(self, bw: BinaryWriterEx):
+        bw.write_int16(len(self.members1))
+        bw.write_int16(len(self.members2))
+        bw.reserve("SekiroUnkOffset1", "I")
+        bw.reserve("SekiroUnkOffset2", "I")
+        bw.write_pattern(0x14, 0x00)
+
+    def write_members(self, bw: BinaryWriterEx):
+        bw.fill("SekiroUnkOffset1", bw.position)
+        for member in self.members1:
+            member.write(bw)
+
+        bw.fill("SekiroUnkOffset2", bw.position)
+        for member in self.members2:
+            member.write(bw)
@@ -1,12 +1,13 @@
-from mathutils import Vector
+from ...util.vector import Vector2
 from .flver_header import FLVERHeader
 from ...util.util import Util
 from ...util.binary_reader_ex import BinaryReaderEx
+from ...util.binary_writer_ex import BinaryWriterEx
 
 class Texture:
     type: str
     path: str
-    scale: Vector
+    scale: Vector2
     unk10: int
     unk11: int
     unk14: float
@@ -17,10 +18,15 @@ class Texture:
     def __init__(self, *args):
         self.type = ""
         self.path = ""
-        self.scale = Vector((1,1))
+        self.scale = (1.0, 1.0)
+        self.unk10 = 1
+        self.unk11 = False
+        self.unk14 = 0.0
+        self.unk18 = 0.0
+        self.unk1c = 0.0
     
         if len(args) == 8:
-            Util.assert_params(args, str, str, Vector, int, int, float, float, float)
+            Util.assert_params(args, str, str, tuple, int, int, float, float, float)
             self.type = args[0]
             self.path = args[1]
             self.scale = args[2]
@@ -58,3 +64,29 @@ class Texture:
 
     def __str__(self):
         return f"{self.type} = {self.path}"
+
+    def write(self, bw: BinaryWriterEx, index: int):
+        bw.reserve_int32(f"TexturePath{index}")
+        bw.reserve_int32(f"TextureType{index}")
+        bw.write_vector2(self.scale)
+
+        bw.write_byte(self.unk10)
+        bw.write_boolean(self.unk11)
+        bw.write_byte(0)
+        bw.write_byte(0)
+
+        bw.write_single(self.unk14)
+        bw.write_single(self.unk18)
+        bw.write_single(self.unk1c)
+
+    def write_strings(self, bw: BinaryWriterEx, header: FLVERHeader, index: int):
+        bw.fill_int32(f"TexturePath{index}", bw.position)
+        if header.unicode:
+            bw.write_utf16(self.path)
+        else:
+            bw.write_shift_jis(self.path)
+        bw.fill_int32(f"TextureType{index}", bw.position)
+        if header.unicode:
+            bw.write_utf16(self.type)
+        else:
+            bw.write_shift_jis(self.type)
@@ -1,8 +1,13 @@
-from typing import List
+from typing import Dict, List
 from .flver_header import FLVERHeader
 from .buffer_layout import BufferLayout
+from .vertex_decoder import VertexDecoder
+from .layout_compiler import LayoutCompiler
+from .vertex_encoder import VertexEncoder
+from .mesh_vertex_data import MeshVertexData
 from ..flver import FLVER
 from ...util.binary_reader_ex import BinaryReaderEx
+from ...util.binary_writer_ex import BinaryWriterEx
 
 class VertexBuffer:
     layout_index: int
@@ -14,7 +19,7 @@ class VertexBuffer:
 
     def __init__(self, param):
         if isinstance(param, int):
-            self.layout_index(param)
+            self.layout_index = param
         
         elif isinstance(param, BinaryReaderEx):
             br: BinaryReaderEx = param
@@ -28,22 +33,48 @@ class VertexBuffer:
             br.read_int32()
             self.buffer_offset = br.read_int32()
     
-    def read_buffer(self, br: BinaryReaderEx, layouts: List[BufferLayout], vertices: List[FLVER.Vertex], data_offset: int, header: FLVERHeader):
+    def read_buffer(self, br: BinaryReaderEx, layouts: List[BufferLayout], vertex_data: MeshVertexData, data_offset: int, header: FLVERHeader):
         layout = layouts[self.layout_index]
-        if self.vertex_size is not layout.size():
+        if self.vertex_size != layout.size():
             raise ValueError("Mismatched vertex buffer and buffer layout sizes.")
 
-        br.step_in(data_offset + self.buffer_offset)
         uv_factor = 1024
         if header.version >= 0x2000F:
             uv_factor = 2048
-        
-        for vertice in vertices:
-            vertice.read(br, layout, uv_factor)
-        br.step_out()
+
+        if VertexDecoder.available():
+            buffer = br.get_view(data_offset + self.buffer_offset, self.vertex_size * vertex_data.vertex_count)
+            vertex_data.add_arrays(VertexDecoder.decode(layout, buffer, vertex_data.vertex_count, br.big_endian, uv_factor))
+        else:
+            plan = LayoutCompiler.compile(layout, br.big_endian, uv_factor)
+            buffer = br.get_view(data_offset + self.buffer_offset, plan.size * vertex_data.vertex_count)
+            vertex_data.add_arrays(*plan.decode(buffer, vertex_data.vertex_count))
         
         self.vertex_size = -1
         self.buffer_index = -1
         self.vertex_count = -1
         self.buffer_offset = -1
 
+    def write(self, bw: BinaryWriterEx, header: FLVERHeader, index: int, buffer_index: int, layouts: List[BufferLayout], vertex_count: int):
+        vertex_size = layouts[self.layout_index].size()
+        bw.write_int32(buffer_index)
+        bw.write_int32(self.layout_index)
+        bw.write_int32(vertex_size)
+        bw.write_int32(vertex_count)
+        bw.write_int32(0)
+        bw.write_int32(0)
+        bw.write_int32(vertex_size * vertex_count if header.version > 0x20005 else 0)
+        bw.reserve_int32(f"VertexBufferOffset{index}")
+
+    def write_buffer(self, bw: BinaryWriterEx, index: int, layouts: List[BufferLayout], vertex_data: MeshVertexData, data_start: int,
+                     header: FLVERHeader, counts: Dict[FLVER.LayoutMember.LayoutSemantic, int]):
+        # The whole buffer is encoded from the mesh's attribute arrays in one pass, see VertexEncoder.
+        if not VertexEncoder.available():
+            raise RuntimeError("Writing vertex buffers requires NumPy.")
+
+        uv_factor = 1024
+        if header.version >= 0x2000F:
+            uv_factor = 2048
+
+        bw.fill_int32(f"VertexBufferOffset{index}", bw.position - data_start)
+        bw.write_bytes(VertexEncoder.encode(layouts[self.layout_index], vertex_data.arrays, vertex_data.vertex_count, bw.big_endian, uv_factor, counts))
@@ -0,0 +1,74 @@
+from typing import Dict, List, Tuple
+from .vertex_format import VertexFormat
+from ..flver import FLVER
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LayoutSemantic = FLVER.LayoutMember.LayoutSemantic
+
+class VertexDecoder:
+    # Decodes a whole vertex buffer in one pass by viewing it as a structured array.
+    # Results are keyed by (semantic, index), the index counting members of the same
+    # semantic in layout order (a UVPAIR yields two UVs). NORMAL arrays carry the W in
+    # a fourth column, UVs have uv_factor applied and colors are RGBA.
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    @staticmethod
+    def dtype(layout: List[FLVER.LayoutMember], big_endian: bool) -> "np.dtype":
+        # One scalar field m{i}f{c} per VertexFormat field c of member i.
+        endian = ">" if big_endian else "<"
+        names, formats, offsets = [], [], []
+        offset = 0
+        for i, member in enumerate(layout):
+            format = VertexFormat.get(member)
+            for c, (code, field_offset) in enumerate(zip(format.codes, format.offsets())):
+                names.append(f"m{i}f{c}")
+                formats.append(endian + VertexFormat.NUMPY_TYPES[code])
+                offsets.append(offset + field_offset)
+            offset += member.size()
+        return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": offset})
+
+    @staticmethod
+    def decode(layout: List[FLVER.LayoutMember], buffer, vertex_count: int, big_endian: bool, uv_factor: float) -> Dict[Tuple[LayoutSemantic, int], "np.ndarray"]:
+        records = np.frombuffer(buffer, VertexDecoder.dtype(layout, big_endian), vertex_count)
+        arrays: Dict[Tuple[LayoutSemantic, int], np.ndarray] = {}
+        counts: Dict[LayoutSemantic, int] = {}
+
+        for i, member in enumerate(layout):
+            format = VertexFormat.get(member)
+            columns = [records[f"m{i}f{c}"] for c in range(len(format.codes))]
+
+            for field in format.zero_fields:
+                VertexDecoder.assert_column(columns[field], 0, member)
+            for field in format.whole_fields:
+                column = columns[field]
+                if np.any(column != np.trunc(column)):
+                    raise ValueError(f"Float4 Normal W was not a whole number: {column[column != np.trunc(column)][0]}")
+
+            for output in format.outputs:
+                # Scaled in double precision like LayoutCompiler, so both round to the same floats.
+                array = np.zeros((vertex_count, len(output.fields)), np.int32 if output.typecode == "i" else np.float32)
+                for c, (field, offset, scale) in enumerate(zip(output.fields, output.offsets, output.resolve_scales(uv_factor))):
+                    if field is None:
+                        continue
+                    if offset == 0 and scale == 1:
+                        array[:, c] = columns[field]
+                    else:
+                        array[:, c] = (columns[field].astype(np.float64) - offset) / scale
+                index = counts.get(member.semantic, 0)
+                counts[member.semantic] = index + 1
+                arrays[(member.semantic, index)] = array
+
+        return arrays
+
+    @staticmethod
+    def assert_column(column: "np.ndarray", value, member: FLVER.LayoutMember):
+        invalid = np.flatnonzero(column != value)
+        if len(invalid):
+            raise AssertionError(f"Read {member.type.name} {member.semantic.name}: {column[invalid[0]]} | Expected: {value} | Vertex: {invalid[0]}")
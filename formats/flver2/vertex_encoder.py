@@ -0,0 +1,63 @@
+from typing import Dict, List, Tuple
+from .vertex_decoder import VertexDecoder
+from .vertex_format import VertexFormat
+from ..flver import FLVER
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LayoutSemantic = FLVER.LayoutMember.LayoutSemantic
+
+class VertexEncoder:
+    # Inverse of VertexDecoder: packs MeshVertexData arrays into one vertex buffer by filling
+    # the fields of a structured array and returning its bytes. counts tracks how many arrays
+    # of each semantic earlier buffers of the same mesh have used, as indices continue across
+    # buffers.
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    @staticmethod
+    def quantize(values, scale: float, offset: float, dtype) -> "np.ndarray":
+        info = np.iinfo(dtype)
+        return np.clip(np.rint(np.asarray(values, np.float64) * scale + offset), info.min, info.max).astype(dtype)
+
+    @staticmethod
+    def encode(layout: List[FLVER.LayoutMember], arrays: Dict[Tuple[LayoutSemantic, int], object], vertex_count: int,
+               big_endian: bool, uv_factor: float, counts: Dict[LayoutSemantic, int]) -> bytes:
+        if vertex_count == 0:
+            return b""
+        formats = [VertexFormat.get(member, "Write") for member in layout]
+        for member, format in zip(layout, formats):
+            if not format.outputs:
+                # Nothing is decoded from these (EDGECOMPRESSED), so there is nothing to write back.
+                raise NotImplementedError(f"Write not implemented for {member.type} {member.semantic}.")
+        records = np.zeros(vertex_count, VertexDecoder.dtype(layout, big_endian))
+
+        def take(member: FLVER.LayoutMember, components: int) -> "np.ndarray":
+            index = counts.get(member.semantic, 0)
+            counts[member.semantic] = index + 1
+            values = arrays.get((member.semantic, index))
+            if values is None:
+                raise ValueError(f"No {member.semantic.name} {index} data for {member.type.name} layout member.")
+            values = np.asarray(values).reshape(vertex_count, -1)
+            if values.shape[1] < components:
+                raise ValueError(f"{member.semantic.name} {index} has {values.shape[1]} components, {member.type.name} needs {components}.")
+            return values[:, :components]
+
+        for i, (member, format) in enumerate(zip(layout, formats)):
+            for output in format.outputs:
+                values = take(member, output.components())
+                for c, (field, offset, scale) in enumerate(zip(output.fields, output.offsets, output.resolve_scales(uv_factor))):
+                    if field is None:
+                        continue
+                    name = f"m{i}f{field}"
+                    if format.codes[field] == "f":
+                        records[name] = values[:, c]
+                    else:
+                        records[name] = VertexEncoder.quantize(values[:, c], scale, offset, records.dtype[name])
+
+        return records.tobytes()
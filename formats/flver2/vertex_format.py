@@ -0,0 +1,113 @@
+from struct import calcsize
+from typing import Dict, Iterable, Optional, Tuple
+from ..flver import FLVER
+
+LayoutType = FLVER.LayoutMember.LayoutType
+LayoutSemantic = FLVER.LayoutMember.LayoutSemantic
+
+BYTE4_TYPES = (LayoutType.BYTE4A, LayoutType.BYTE4B, LayoutType.BYTE4C, LayoutType.BYTE4E)
+SHORT_UV_TYPES = (LayoutType.BYTE4A, LayoutType.BYTE4B, LayoutType.SHORT2TOFLOAT2, LayoutType.BYTE4C, LayoutType.UV)
+
+class VertexFormat:
+    # How every supported (semantic, type) layout member is stored, the one table VertexDecoder,
+    # LayoutCompiler and VertexEncoder all work from. A member is a run of fields given as struct
+    # codes. Each of its outputs is one (semantic, index) array, component c reading
+    # value = (raw - offset) / scale from field fields[c], or 0 for a None field. Scales of
+    # UV_FACTOR stand for the UV factor of the FLVER version.
+    UV_FACTOR = -1.0
+
+    # NumPy base type of each struct code.
+    NUMPY_TYPES = {"f": "f4", "b": "i1", "B": "u1", "h": "i2", "H": "u2"}
+
+    class Output:
+        fields: Tuple[Optional[int], ...]
+        offsets: Tuple[float, ...]
+        scales: Tuple[float, ...]
+        typecode: str
+
+        def __init__(self, fields: Tuple[Optional[int], ...], offset=0, scale=1, typecode: str = "f"):
+            self.fields = fields
+            self.offsets = offset if isinstance(offset, tuple) else (offset,) * len(fields)
+            self.scales = scale if isinstance(scale, tuple) else (scale,) * len(fields)
+            self.typecode = typecode
+
+        def resolve_scales(self, uv_factor: float) -> Tuple[float, ...]:
+            return tuple(uv_factor if scale == VertexFormat.UV_FACTOR else scale for scale in self.scales)
+
+        def components(self) -> int:
+            # Components an encoded array needs, trailing None fields are never written.
+            return max(c for c, field in enumerate(self.fields) if field is not None) + 1
+
+    class Member:
+        codes: str
+        outputs: Tuple["VertexFormat.Output", ...]
+        # Fields that must read 0, and fields that must hold whole numbers.
+        zero_fields: Tuple[int, ...]
+        whole_fields: Tuple[int, ...]
+
+        def __init__(self, codes: str, *outputs: "VertexFormat.Output", zero_fields: Tuple[int, ...] = (), whole_fields: Tuple[int, ...] = ()):
+            self.codes = codes
+            self.outputs = outputs
+            self.zero_fields = zero_fields
+            self.whole_fields = whole_fields
+
+        def offsets(self) -> Tuple[int, ...]:
+            # Byte offset of every field from the start of the member.
+            offsets, offset = [], 0
+            for code in self.codes:
+                offsets.append(offset)
+                offset += calcsize(code)
+            return tuple(offsets)
+
+    members: Dict[Tuple[LayoutSemantic, LayoutType], Member] = {}
+
+    @staticmethod
+    def register(semantics: Iterable[LayoutSemantic], types: Iterable[LayoutType], member: "VertexFormat.Member"):
+        for semantic in semantics:
+            for type in types:
+                VertexFormat.members[(semantic, type)] = member
+
+    @staticmethod
+    def get(member: FLVER.LayoutMember, action: str = "Read") -> "VertexFormat.Member":
+        format = VertexFormat.members.get((member.semantic, member.type))
+        if format is None:
+            raise NotImplementedError(f"{action} not implemented for {member.type} {member.semantic}.")
+        return format
+
+Output = VertexFormat.Output
+Member = VertexFormat.Member
+XYZ, XYZW = (0, 1, 2), (0, 1, 2, 3)
+
+VertexFormat.register((LayoutSemantic.POSITION,), (LayoutType.FLOAT3,), Member("fff", Output(XYZ)))
+VertexFormat.register((LayoutSemantic.POSITION,), (LayoutType.FLOAT4,), Member("ffff", Output(XYZ), zero_fields=(3,)))
+VertexFormat.register((LayoutSemantic.POSITION,), (LayoutType.EDGECOMPRESSED,), Member("B"))
+
+VertexFormat.register((LayoutSemantic.BONEWEIGHTS,), (LayoutType.BYTE4A,), Member("bbbb", Output(XYZW, 0, 127.0)))
+VertexFormat.register((LayoutSemantic.BONEWEIGHTS,), (LayoutType.BYTE4C,), Member("BBBB", Output(XYZW, 0, 255.0)))
+VertexFormat.register((LayoutSemantic.BONEWEIGHTS,), (LayoutType.UVPAIR, LayoutType.SHORT4TOFLOAT4A), Member("hhhh", Output(XYZW, 0, 32767.0)))
+
+VertexFormat.register((LayoutSemantic.BONEINDICES,), (LayoutType.BYTE4B, LayoutType.BYTE4E), Member("BBBB", Output(XYZW, typecode="i")))
+VertexFormat.register((LayoutSemantic.BONEINDICES,), (LayoutType.SHORTBONEINDICES,), Member("HHHH", Output(XYZW, typecode="i")))
+
+# Normals always have four components, the W being a whole number.
+VertexFormat.register((LayoutSemantic.NORMAL,), (LayoutType.FLOAT3,), Member("fff", Output(XYZ + (None,))))
+VertexFormat.register((LayoutSemantic.NORMAL,), (LayoutType.FLOAT4,), Member("ffff", Output(XYZW), whole_fields=(3,)))
+VertexFormat.register((LayoutSemantic.NORMAL,), BYTE4_TYPES, Member("BBBB", Output(XYZW, (127, 127, 127, 0), (127.0, 127.0, 127.0, 1))))
+# W first, then a signed ZYX.
+VertexFormat.register((LayoutSemantic.NORMAL,), (LayoutType.SHORT2TOFLOAT2,), Member("Bbbb", Output((3, 2, 1, 0), 0, (127.0, 127.0, 127.0, 1))))
+VertexFormat.register((LayoutSemantic.NORMAL,), (LayoutType.SHORT4TOFLOAT4A,), Member("hhhh", Output(XYZW, 0, (32767.0, 32767.0, 32767.0, 1))))
+VertexFormat.register((LayoutSemantic.NORMAL,), (LayoutType.SHORT4TOFLOAT4B,), Member("HHHh", Output(XYZW, (32767, 32767, 32767, 0), (32767.0, 32767.0, 32767.0, 1))))
+
+VertexFormat.register((LayoutSemantic.UV,), (LayoutType.FLOAT2,), Member("ff", Output((0, 1))))
+VertexFormat.register((LayoutSemantic.UV,), (LayoutType.FLOAT3,), Member("fff", Output(XYZ)))
+VertexFormat.register((LayoutSemantic.UV,), (LayoutType.FLOAT4,), Member("ffff", Output((0, 1)), Output((2, 3))))
+VertexFormat.register((LayoutSemantic.UV,), SHORT_UV_TYPES, Member("hh", Output((0, 1), 0, VertexFormat.UV_FACTOR)))
+VertexFormat.register((LayoutSemantic.UV,), (LayoutType.UVPAIR,), Member("hhhh", Output((0, 1), 0, VertexFormat.UV_FACTOR), Output((2, 3), 0, VertexFormat.UV_FACTOR)))
+VertexFormat.register((LayoutSemantic.UV,), (LayoutType.SHORT4TOFLOAT4B,), Member("hhhh", Output(XYZ, 0, VertexFormat.UV_FACTOR), zero_fields=(3,)))
+
+VertexFormat.register((LayoutSemantic.TANGENT,), (LayoutType.FLOAT4,), Member("ffff", Output(XYZW)))
+VertexFormat.register((LayoutSemantic.TANGENT, LayoutSemantic.BITANGENT), BYTE4_TYPES, Member("BBBB", Output(XYZW, 127, 127.0)))
+VertexFormat.register((LayoutSemantic.TANGENT,), (LayoutType.SHORT4TOFLOAT4A,), Member("hhhh", Output(XYZW, 0, 32767.0)))
+
+VertexFormat.register((LayoutSemantic.VERTEXCOLOR,), (LayoutType.FLOAT4,), Member("ffff", Output(XYZW)))
+VertexFormat.register((LayoutSemantic.VERTEXCOLOR,), (LayoutType.BYTE4A, LayoutType.BYTE4C), Member("BBBB", Output(XYZW, 0, 255.0)))
@@ -0,0 +1,57 @@
+from enum import Enum
+from struct import unpack_from
+from typing import Callable, Dict, List, Tuple
+
+class Sniffer:
+    # Identifies a buffer from the magic at its start, without building a reader. Only a short
+    # prefix is copied, so checking every entry of a binder costs next to nothing. Formats are
+    # registered by magic, with an optional check on the prefix for magics shared by versions
+    # this repo can't read.
+    class FormatKind(Enum):
+        UNKNOWN = 0
+        FLVER2 = 1
+        BND4 = 2
+        DCX = 3
+        DCP = 4
+        TPF = 5
+        DDS = 6
+        ZLIB = 7
+
+    # Longest prefix any check looks at.
+    PREFIX_SIZE = 0x10
+
+    registry: Dict[bytes, List[Tuple[Callable[[bytes], bool], FormatKind]]] = {}
+    magic_sizes: List[int] = []
+
+    @staticmethod
+    def register(kind: FormatKind, magic: bytes, check: Callable[[bytes], bool] = None):
+        Sniffer.registry.setdefault(magic, []).append((check, kind))
+        if len(magic) not in Sniffer.magic_sizes:
+            Sniffer.magic_sizes.append(len(magic))
+            Sniffer.magic_sizes.sort(reverse=True)
+
+    @staticmethod
+    def sniff(buffer) -> FormatKind:
+        prefix = bytes(memoryview(buffer)[:Sniffer.PREFIX_SIZE])
+        for size in Sniffer.magic_sizes:
+            for check, kind in Sniffer.registry.get(prefix[:size], ()):
+                if check is None or check(prefix):
+                    return kind
+        return Sniffer.FormatKind.UNKNOWN
+
+    @staticmethod
+    def is_flver2(prefix: bytes) -> bool:
+        # FLVER0 shares the magic, only versions from 0x20000 on are FLVER2.
+        if len(prefix) < 0xC or prefix[6:8] not in (b"L\0", b"B\0"):
+            return False
+        return unpack_from(">i" if prefix[6:8] == b"B\0" else "<i", prefix, 8)[0] >= 0x20000
+
+Sniffer.register(Sniffer.FormatKind.FLVER2, b"FLVER\0", Sniffer.is_flver2)
+Sniffer.register(Sniffer.FormatKind.BND4, b"BND4")
+Sniffer.register(Sniffer.FormatKind.DCX, b"DCX\0")
+Sniffer.register(Sniffer.FormatKind.DCP, b"DCP\0")
+Sniffer.register(Sniffer.FormatKind.TPF, b"TPF\0")
+Sniffer.register(Sniffer.FormatKind.DDS, b"DDS ")
+# Zlib header: deflate with a 32K window at each compression level.
+for magic in (b"\x78\x01", b"\x78\x5E", b"\x78\x9C", b"\x78\xDA"):
+    Sniffer.register(Sniffer.FormatKind.ZLIB, magic)
@@ -2,6 +2,7 @@ from enum import IntEnum
 from typing import List
 from .dds import DDS
 from ..dcx import DCX
+from ..sniffer import Sniffer
 from ...util.binary_reader_ex import BinaryReaderEx
 
 
@@ -33,19 +34,21 @@ class TPF:
 
         @classmethod
         def new(cls):
-            cls.values = []
-            return cls()
+            float_struct = cls()
+            float_struct.values = []
+            return float_struct
 
         @classmethod
         def from_binary_reader(cls, br: BinaryReaderEx):
-            cls.unk00 = br.read_int32()
+            float_struct = cls()
+            float_struct.unk00 = br.read_int32()
             length = br.read_int32()
 
-            if length < 0 or (length % 4 is not 0):
+            if length < 0 or length % 4 != 0:
                 raise ValueError(f"Unexpected FloatStruct length: {length}")
 
-            cls.values = [br.read_singles(length/4)]
-            return cls()
+            float_struct.values = br.read_singles(length // 4)
+            return float_struct
 
     class Texture:
         name: str
@@ -59,72 +62,109 @@ class TPF:
 
         @classmethod
         def new(cls):
-            cls.name = "Unnamed"
-            cls.bytes = bytearray()
-            return cls()
+            texture = cls()
+            texture.name = "Unnamed"
+            texture.bytes = bytearray()
+            return texture
 
         @classmethod
         def new_with_values(cls, name: str, format: int, flags1: int, bytes: bytearray):
-            cls.name = name
-            cls.format = format
-            cls.flags1 = flags1
-            cls.bytes = bytes
+            texture = cls()
+            texture.name = name
+            texture.format = format
+            texture.flags1 = flags1
+            texture.bytes = bytes
             
             dds = DDS.from_bytes(bytes)
             if dds.dw_caps2 == DDS.DDSCAPS2:
-                cls.type = TPF.TexType.Cubemap
+                texture.type = TPF.TexType.Cubemap
             elif dds.dw_caps2 == DDS.DDSCAPS2.VOLUME:
-                cls.type = TPF.TexType.Volume
+                texture.type = TPF.TexType.Volume
             else:
-                cls.type = TPF.TexType.Texture
-            cls.mip_maps = dds.dw_mip_map_count
-            return cls()
+                texture.type = TPF.TexType.Texture
+            texture.mip_maps = dds.dw_mip_map_count
+            return texture
         
         @classmethod
         def from_binary_reader(cls, br: BinaryReaderEx, platform: "TPF.TPFPlatform", flag2: int, encoding: int):
+            texture = cls()
             file_offset = br.read_uint32()
             file_size = br.read_int32()
 
-            cls.format = br.read_byte()
-            cls.type = TPF.TexType(br.read_byte())
-            cls.mip_maps = br.read_byte()
-            cls.flags1 = br.assert_byte(0, 1, 2, 3)
+            texture.format = br.read_uint8()
+            texture.type = TPF.TexType(br.read_uint8())
+            texture.mip_maps = br.read_uint8()
+            texture.flags1 = br.assert_byte(0, 1, 2, 3)
 
-            if platform is not TPF.TPFPlatform.PC:
-                cls.header = TPF.TexHeader()
-                cls.header.width = br.read_int16()
-                cls.header.height = br.read_int16()
+            texture.header = None
+            if platform != TPF.TPFPlatform.PC:
+                texture.header = TPF.TexHeader()
+                texture.header.width = br.read_int16()
+                texture.header.height = br.read_int16()
 
                 if platform == TPF.TPFPlatform.Xbox360:
                     br.assert_int32(0)
                 elif platform == TPF.TPFPlatform.PS3:
-                    cls.header.unk1 = br.read_int32()
-                    if flag2 is not 0:
-                        cls.header.unk2 = br.assert_int32(0, 0x69E0, 0xAAE4)
+                    texture.header.unk1 = br.read_int32()
+                    if flag2 != 0:
+                        texture.header.unk2 = br.assert_int32(0, 0x69E0, 0xAAE4)
                 elif (platform == TPF.TPFPlatform.PS4 or platform == TPF.TPFPlatform.Xbone):
-                    cls.header.texture_count = br.assert_int32(1, 6)
-                    cls.header.unk2 = br.assert_int32(0xD)
+                    texture.header.texture_count = br.assert_int32(1, 6)
+                    texture.header.unk2 = br.assert_int32(0xD)
 
             name_offset = br.read_uint32()
             has_float_struct = br.assert_int32(0, 1) == 1
 
             if (platform == TPF.TPFPlatform.PS4 or platform == TPF.TPFPlatform.Xbone):
-                cls.header.dxgi_format = br.read_int32()
+                texture.header.dxgi_format = br.read_int32()
             
+            texture.float_struct = None
             if has_float_struct:
-                cls.float_struct = TPF.FloatStruct.from_binary_reader(br)
+                texture.float_struct = TPF.FloatStruct.from_binary_reader(br)
 
-            cls.bytes = br.get_bytes(file_offset, file_size)
+            texture.bytes = br.get_bytes(file_offset, file_size)
 
-            if cls.flags1 == 2 or cls.flags1 == 3:
-                compression_type = DCX.CompressionType.UNKOWN
-                cls.bytes = DCX.decompress(cls.bytes, compression_type)
-                if(compression_type is not DCX.CompressionType.DCP_EDGE):
-                    raise NotImplementedError(f"TPF compression is expected to be DCP_EDGE, but it was {cls.type}")
+            if texture.flags1 == 2 or texture.flags1 == 3:
+                compressed = BinaryReaderEx(False, texture.bytes)
+                compression_type = DCX.detect(compressed)
+                if compression_type != DCX.CompressionType.DCP_EDGE:
+                    raise NotImplementedError(f"TPF compression is expected to be DCP_EDGE, but it was {compression_type}")
+                texture.bytes = DCX.decompress(compressed, compression_type)
 
             if encoding == 1:
-                cls.name = br.get_utf16(name_offset)
+                texture.name = br.get_utf16(name_offset)
             elif encoding == 0 or encoding == 2:
-                cls.name = br.get_shit_jis(name_offset)
-
-            return cls()
\ No newline at end of file
+                texture.name = br.get_shit_jis(name_offset)
+
+            return texture
+
+    textures: List["TPF.Texture"]
+    platform: "TPF.TPFPlatform"
+    encoding: int
+    flag2: int
+
+    def __init__(self):
+        self.textures = []
+        self.platform = TPF.TPFPlatform.PC
+        self.encoding = 1
+        self.flag2 = 3
+
+    def Is(self, br: BinaryReaderEx):
+        return Sniffer.sniff(br.buffer) == Sniffer.FormatKind.TPF
+
+    def read(self, br: BinaryReaderEx):
+        br.set_big_endian(False)
+        br.assert_ascii("TPF\0")
+        self.platform = TPF.TPFPlatform(br.get_uint8(0xC))
+        br.set_big_endian(self.platform == TPF.TPFPlatform.Xbox360 or self.platform == TPF.TPFPlatform.PS3)
+
+        br.read_int32()
+        file_count = br.read_int32()
+        br.skip(1)
+        self.flag2 = br.assert_byte(0, 1, 2, 3)
+        self.encoding = br.assert_byte(0, 1, 2)
+        br.assert_byte(0)
+
+        self.textures = []
+        for i in range(file_count):
+            self.textures.append(TPF.Texture.from_binary_reader(br, self.platform, self.flag2, self.encoding))
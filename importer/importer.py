@@ -1,52 +1,93 @@
 import bpy
-import bmesh
+import numpy as np
 from math import radians
-from mathutils import Vector
 from ..util.util import Util
+from ..util.profiler import Profiler
+from ..formats.flver import FLVER
 from ..formats.flver2.flver2 import FLVER2
 
 class Importer:
     @staticmethod
-    def do_import(path):
+    def do_import(path, profiler: Profiler = None):
+        profiler = Profiler.get(profiler)
         flver = FLVER2()
-        flver.read_path(path)
+        flver.read_path(path, profiler=profiler)
 
+        profiler.start()
         for i, mesh in enumerate(flver.meshes):
-            
+
             # Data from FLVER
-            vertices = [vertice.position for vertice in mesh.vertices]
-            uvs = [vertice.uvs[0] for vertice in mesh.vertices]
-            indices = mesh.face_sets[0].triangluate(len(mesh.vertices) < Util.UShort.MAX_VALUE)
-            faces = []
-            for j in range(0, len(indices) - 2, 3):
-                vi1 = indices[j]
-                vi2 = indices[j + 1]
-                vi3 = indices[j + 2]
-                faces.append((vi1, vi2, vi3))
+            vertex_count = mesh.vertex_data.vertex_count
+            positions = Importer.column(mesh.vertex_data.get(FLVER.LayoutMember.LayoutSemantic.POSITION), 3)
+            uvs = mesh.vertex_data.get(FLVER.LayoutMember.LayoutSemantic.UV, 0)
+            normals = mesh.vertex_data.get(FLVER.LayoutMember.LayoutSemantic.NORMAL)
+            indices = np.asarray(mesh.face_sets[0].triangluate(vertex_count < Util.UShort.MAX_VALUE), np.int32).ravel()
+            indices = indices[:len(indices) - len(indices) % 3]
+            profiler.lap("triangulate", count=len(indices) // 3)
 
             # Add Meshes
-            name = flver.materials[i].name
+            name = flver.materials[mesh.material_index].name
             bpy_mesh = bpy.data.meshes.new(name)
             bpy_obj = bpy.data.objects.new(name,bpy_mesh)
             bpy.context.collection.objects.link(bpy_obj)
             bpy.context.view_layer.objects.active = bpy_obj
             bpy_obj.select_set(True)
             bpy_obj.rotation_euler.x += radians(90)
-            bpy_mesh.from_pydata(vertices, [], faces)
+            # Read back by Exporter to find the mesh this object replaces.
+            bpy_obj["flver_path"] = path
+            bpy_obj["flver_mesh_index"] = i
+            Importer.build_mesh(bpy_mesh, positions, indices)
+
+            # Source vertex of every Blender vertex, read back by Exporter since edits renumber
+            # vertices. Stored plus one, so the 0 that vertices added in Blender get marks them new.
+            source_vertices = bpy_mesh.attributes.new("flver_vertex", 'INT', 'POINT')
+            source_vertices.data.foreach_set("value", np.arange(1, vertex_count + 1, dtype=np.int32))
 
             # Add UVs
-            bpy.ops.object.mode_set(mode='EDIT')
-            bm = bmesh.from_edit_mesh(bpy_mesh)
-            uv_layer = bm.loops.layers.uv.verify()
-            for i, vert in enumerate(bm.verts):
-                for loop in vert.link_loops:
-                    loop_uv = loop[uv_layer]
-                    loop_uv.uv = Vector((uvs[i][0], uvs[i][1]))
-            bmesh.update_edit_mesh(bpy_mesh)
-            bpy.ops.object.mode_set(mode='OBJECT')
+            if uvs is not None:
+                uvs = Importer.column(uvs, mesh.vertex_data.components[(FLVER.LayoutMember.LayoutSemantic.UV, 0)])
+                uv_layer = bpy_mesh.uv_layers.new(name="UVMap")
+                uv_layer.data.foreach_set("uv", np.ascontiguousarray(uvs[indices, :2]).ravel())
+
+            # Add Normals
+            if normals is not None:
+                normals = Importer.column(normals, mesh.vertex_data.components[(FLVER.LayoutMember.LayoutSemantic.NORMAL, 0)])
+                Importer.set_normals(bpy_mesh, normals[indices, :3])
 
             bpy_mesh.update()
+            profiler.lap("blender_build", count=vertex_count)
+
+    @staticmethod
+    def column(values, components: int) -> np.ndarray:
+        return np.asarray(values, np.float32).reshape(-1, components)
+
+    @staticmethod
+    def set_normals(bpy_mesh, loop_normals: np.ndarray):
+        # Authored normals as custom split normals, so an export without edits writes them back.
+        # Zero length normals are left at 0, which Blender reads as keeping its own.
+        lengths = np.linalg.norm(loop_normals, axis=1)[:, None]
+        loop_normals = np.divide(loop_normals, lengths, out=np.zeros_like(loop_normals), where=lengths > 0)
+        bpy_mesh.polygons.foreach_set("use_smooth", np.ones(len(bpy_mesh.polygons), bool))
+        # Custom normals need auto smooth before Blender 4.1, which removed the setting.
+        if hasattr(bpy_mesh, "use_auto_smooth"):
+            bpy_mesh.use_auto_smooth = True
+        bpy_mesh.normals_split_custom_set(loop_normals)
+
+    @staticmethod
+    def build_mesh(bpy_mesh, positions: np.ndarray, indices: np.ndarray):
+        # Fills the mesh straight from flat arrays, one loop per triangle corner.
+        loop_count = len(indices)
+        face_count = loop_count // 3
+
+        bpy_mesh.vertices.add(len(positions))
+        bpy_mesh.vertices.foreach_set("co", np.ascontiguousarray(positions, np.float32).ravel())
 
+        bpy_mesh.loops.add(loop_count)
+        bpy_mesh.loops.foreach_set("vertex_index", indices)
 
-            
+        bpy_mesh.polygons.add(face_count)
+        bpy_mesh.polygons.foreach_set("loop_start", np.arange(0, loop_count, 3, dtype=np.int32))
+        if not bpy_mesh.polygons.bl_rna.properties["loop_total"].is_readonly:
+            bpy_mesh.polygons.foreach_set("loop_total", np.full(face_count, 3, np.int32))
 
+        bpy_mesh.update(calc_edges=True)
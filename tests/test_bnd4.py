@@ -0,0 +1,62 @@
+import pytest
+from ..benchmarks.fixtures import Fixtures
+from ..binder.bnd4 import BND4
+from ..formats.sniffer import Sniffer
+from ..util.binary_reader_ex import BinaryReaderEx
+
+NAMES = [f"c{i:04d}" for i in range(60)]
+
+def open_binder(data: bytes) -> BND4:
+    bnd = BND4()
+    bnd.open(BinaryReaderEx(False, data))
+    return bnd
+
+def entries():
+    return [(i, Fixtures.entry_name(name), name.encode("ascii") * 3) for i, name in enumerate(NAMES)]
+
+@pytest.mark.parametrize("big_endian", [False, True])
+@pytest.mark.parametrize("hash_table", [False, True])
+def test_find(hash_table, big_endian):
+    bnd = open_binder(Fixtures.bnd4(entries(), compressed=range(0, 60, 3), big_endian=big_endian, hash_table=hash_table))
+    assert (bnd.hash_table is not None) == hash_table
+
+    for i, name in enumerate(NAMES):
+        path = Fixtures.entry_name(name)
+        for query in (path, path.upper(), path.lower().replace("\\", "/"), " " + path):
+            file_header = bnd.find(query)
+            assert file_header is not None and file_header.id == i, query
+        assert bytes(bnd.get(path).bytes) == name.encode("ascii") * 3
+        assert bytes(bnd.get_by_id(i).bytes) == name.encode("ascii") * 3
+
+    assert bnd.find(Fixtures.entry_name("missing")) is None
+    assert bnd.get(Fixtures.entry_name("missing")) is None
+    assert bnd.get_by_id(1000) is None
+
+@pytest.mark.parametrize("big_endian", [False, True])
+def test_names_decode_after_byte_order_changes(big_endian):
+    br = BinaryReaderEx(False, Fixtures.bnd4(entries(), big_endian=big_endian))
+    bnd = BND4()
+    bnd.open(br)
+    br.set_big_endian(not big_endian)
+    assert [file_header.name for file_header in bnd.file_headers] == [Fixtures.entry_name(name) for name in NAMES]
+
+def test_hash_table_and_index_agree():
+    with_table = open_binder(Fixtures.binder({name: bytes(0x10) for name in NAMES}, hash_table=True))
+    without_table = open_binder(Fixtures.binder({name: bytes(0x10) for name in NAMES}))
+    for name in NAMES:
+        query = Fixtures.entry_name(name).upper().replace("\\", "/")
+        assert with_table.find(query).id == without_table.find(query).id
+
+def test_iteration():
+    flver = Fixtures.flver(meshes=1, vertices=10)
+    bnd = open_binder(Fixtures.bnd4([(0, "a.flver", flver), (1, "b.tpf", b"TPF\0" + bytes(12)), (2, "c.flver", flver)], compressed=(2,)))
+    assert [file.name for file in bnd.iter_files()] == ["a.flver", "b.tpf", "c.flver"]
+    assert [file.name for file in bnd.iter_matching("*.FLVER")] == ["a.flver", "c.flver"]
+    # Compressed entries can only be sniffed once inflated, so they are always yielded.
+    assert [file.name for file in bnd.iter_kind(Sniffer.FormatKind.FLVER2)] == ["a.flver", "c.flver"]
+    assert [file.name for file in bnd.iter_kind(Sniffer.FormatKind.TPF)] == ["b.tpf", "c.flver"]
+
+def test_read():
+    bnd = BND4()
+    bnd.read(BinaryReaderEx(False, Fixtures.bnd4(entries(), compressed=(1,))))
+    assert [(file.id, file.name, bytes(file.bytes)) for file in bnd.files] == [(i, name, data) for i, name, data in entries()]
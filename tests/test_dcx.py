@@ -0,0 +1,96 @@
+import os
+import zlib
+import random
+import pytest
+from struct import pack_into
+from ..benchmarks.fixtures import Fixtures
+from ..formats.dcx import DCX
+from ..formats.dcx_cache import DCXCache
+from ..util.sf_util import SFUtil
+from ..util.binary_reader_ex import BinaryReaderEx
+
+def payload(size: int, seed: int = 0) -> bytes:
+    # Compressible runs mixed with random blocks, so EDGE fixtures hold deflated and stored chunks.
+    rnd = random.Random(seed)
+    data = bytearray()
+    while len(data) < size:
+        data += bytes(rnd.randrange(256) for _ in range(0x400)) if rnd.random() < 0.3 else bytes([rnd.randrange(8)]) * 0x2000
+    return bytes(data[:size])
+
+def decompress(data: bytes) -> bytearray:
+    return DCX.decompress(BinaryReaderEx(False, data), DCX.CompressionType.UNKOWN)
+
+def with_payload(dcx: bytes, compressed: bytes) -> bytes:
+    # Swaps the zlib stream of a DFLT fixture, fixing up the compressed size in its DCS block.
+    dcx = bytearray(dcx[:dcx.index(b"DCA\0") + 8] + compressed)
+    pack_into(">I", dcx, dcx.index(b"DCS\0") + 8, len(compressed))
+    return bytes(dcx)
+
+@pytest.mark.parametrize("size", [0x30000, 0x10000, 0x12345])
+def test_dflt(size):
+    data = payload(size)
+    dcx = Fixtures.dcx_dflt(data)
+    assert DCX.detect(BinaryReaderEx(False, dcx)) == DCX.CompressionType.DCX_DFLT_10000_44_9
+    assert decompress(dcx) == data
+    assert DCX.open(BinaryReaderEx(False, dcx)).read() == data
+
+@pytest.mark.parametrize("workers", [1, None])
+@pytest.mark.parametrize("size", [0x30000, 0x10000, 0x12345, 0x100])
+def test_edge(monkeypatch, size, workers):
+    monkeypatch.setattr(DCX, "edge_workers", workers)
+    data = payload(size, size)
+    dcx = Fixtures.dcx_edge(data)
+    assert DCX.detect(BinaryReaderEx(False, dcx)) == DCX.CompressionType.DCX_EDGE
+    assert decompress(dcx) == data
+
+def test_edge_size_mismatch():
+    # Headers agree on one byte less than the last chunk inflates to.
+    dcx = bytearray(Fixtures.dcx_edge(payload(0x12345)))
+    pack_into(">I", dcx, dcx.index(b"DCS\0") + 4, 0x12344)
+    pack_into(">i", dcx, dcx.index(b"EgdT") + 0x14, 0x2344)
+    with pytest.raises(ValueError, match="EDGE chunk 1"):
+        decompress(bytes(dcx))
+
+def test_dflt_corruption():
+    data = payload(0x30000)
+    compressed = zlib.compress(data, 9)
+    dcx = Fixtures.dcx_dflt(data)
+
+    # Adler-32 trailer.
+    with pytest.raises(zlib.error):
+        decompress(with_payload(dcx, compressed[:-1] + bytes([compressed[-1] ^ 1])))
+    with pytest.raises(ValueError, match="ended before"):
+        decompress(with_payload(dcx, compressed[:-8]))
+    with pytest.raises(ValueError, match="after the end"):
+        decompress(with_payload(dcx, compressed + bytes(4)))
+
+def test_cache_keys_files_by_path_and_mtime(tmp_path):
+    cache = DCXCache(str(tmp_path / "cache"))
+    data = payload(0x20000)
+    path = str(tmp_path / "file.dcx")
+    with open(path, "wb") as f:
+        f.write(Fixtures.dcx_dflt(data))
+
+    br = BinaryReaderEx.from_path(path)
+    key = cache.key(br, DCX.detect(br))
+    assert cache.key(BinaryReaderEx.from_path(path), DCX.detect(br)) == key
+    assert cache.key(BinaryReaderEx(False, bytes(br.buffer)), DCX.detect(br)) != key
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert cache.key(BinaryReaderEx.from_path(path), DCX.detect(br)) != key
+
+def test_cache_hits(monkeypatch, tmp_path):
+    cache = DCXCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(DCX, "cache", cache)
+    data = payload(0x20000)
+    dcx = Fixtures.dcx_edge(data)
+    path = str(tmp_path / "file.dcx")
+    with open(path, "wb") as f:
+        f.write(dcx)
+
+    for _ in range(2):
+        assert bytes(SFUtil.get_decompressed_br(BinaryReaderEx.from_path(path), DCX.CompressionType.UNKOWN).buffer) == data
+    for _ in range(2):
+        assert bytes(SFUtil.get_decompressed_br(BinaryReaderEx(False, dcx), DCX.CompressionType.UNKOWN).buffer) == data
+    assert (cache.hits, cache.misses) == (2, 2)
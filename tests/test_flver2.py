@@ -0,0 +1,106 @@
+import pickle
+import pytest
+from ..benchmarks.fixtures import Fixtures
+from ..formats.flver2.flver2 import FLVER2
+from ..formats.flver2.buffer_layout import BufferLayout, FrozenBufferLayout
+from ..formats.flver2.gx_list import GXList, FrozenGXList
+from ..util.binary_reader_ex import BinaryReaderEx
+from ..util.binary_writer_ex import BinaryWriterEx
+
+np = pytest.importorskip("numpy")
+
+FIXTURES = [
+    {},
+    {"layouts": ("static", "skinned", "wide"), "strip": True, "index_size": 32},
+    {"layouts": ("skinned",), "version": 0x2001A},
+    {"version": 0x20010},
+    {"version": 0x2000C, "index_size": 32},
+    {"layouts": ("wide", "static"), "big_endian": True},
+    {"dummies": 0, "bones": 0},
+]
+
+def read(data: bytes) -> FLVER2:
+    flver = FLVER2()
+    flver.read(BinaryReaderEx(False, data))
+    return flver
+
+def write(flver: FLVER2) -> bytes:
+    bw = BinaryWriterEx(False)
+    flver.write(bw)
+    return bytes(bw.finish())
+
+def assert_same(a: FLVER2, b: FLVER2):
+    assert vars(a.header) == vars(b.header)
+    assert [vars(dummy) for dummy in a.dummies] == [vars(dummy) for dummy in b.dummies]
+    assert [vars(bone) for bone in a.bones] == [vars(bone) for bone in b.bones]
+    for x, y in zip(a.materials, b.materials):
+        assert (x.name, x.mtd, x.flags, x.gx_index) == (y.name, y.mtd, y.flags, y.gx_index)
+        assert [vars(texture) for texture in x.textures] == [vars(texture) for texture in y.textures]
+    assert [[(item.id, item.unk04, bytes(item.data)) for item in gx_list] for gx_list in a.gx_lists] == \
+           [[(item.id, item.unk04, bytes(item.data)) for item in gx_list] for gx_list in b.gx_lists]
+    # Both were read, so their layouts are frozen tuples of named tuples.
+    assert a.buffer_layouts == b.buffer_layouts
+
+    assert len(a.meshes) == len(b.meshes)
+    for x, y in zip(a.meshes, b.meshes):
+        assert (x.dynamic, x.material_index, x.default_bone_index, list(x.bone_indices)) == (y.dynamic, y.material_index, y.default_bone_index, list(y.bone_indices))
+        assert vars(x.bounding_box) == vars(y.bounding_box)
+        assert x.vertex_data.arrays.keys() == y.vertex_data.arrays.keys()
+        for key in x.vertex_data.arrays:
+            assert np.array_equal(x.vertex_data.arrays[key], y.vertex_data.arrays[key]), key
+        for fx, fy in zip(x.face_sets, y.face_sets):
+            assert (fx.flags, fx.triangle_strip, fx.cull_backfaces, fx.unk06) == (fy.flags, fy.triangle_strip, fy.cull_backfaces, fy.unk06)
+            assert list(fx.indices) == list(fy.indices)
+
+@pytest.mark.parametrize("options", FIXTURES)
+def test_write_read_round_trip(options):
+    flver = read(Fixtures.flver(meshes=3, vertices=200, **options))
+    written = write(flver)
+    reread = read(written)
+    assert_same(flver, reread)
+    assert write(reread) == written
+
+def test_write_path_round_trip(tmp_path):
+    flver = read(Fixtures.flver(meshes=2, vertices=500, layouts=("static", "skinned")))
+    path = str(tmp_path / "model.flver")
+    flver.write_path(path)
+    reread = FLVER2()
+    reread.read_path(path)
+    assert_same(flver, reread)
+
+def test_layouts_and_gx_lists_are_shared_read_only():
+    a = read(Fixtures.flver(meshes=2, layouts=("skinned",)))
+    b = read(Fixtures.flver(meshes=3, layouts=("skinned",), seed=5))
+    assert isinstance(a.buffer_layouts[0], FrozenBufferLayout) and a.buffer_layouts[0] is b.buffer_layouts[0]
+    assert isinstance(a.gx_lists[0], FrozenGXList) and a.gx_lists[0] is b.gx_lists[0]
+    with pytest.raises(AttributeError):
+        a.buffer_layouts[0][0].index = 3
+
+def test_edits_copy_on_write():
+    a = read(Fixtures.flver(meshes=2, layouts=("skinned",)))
+    b = read(Fixtures.flver(meshes=2, layouts=("skinned",), seed=5))
+    layout = a.edit_buffer_layout(0)
+    layout.pop()
+    gx_list = a.edit_gx_list(0)
+    gx_list[0].data[0] = 99
+
+    assert isinstance(layout, BufferLayout) and isinstance(gx_list, GXList)
+    assert a.edit_buffer_layout(0) is layout
+    assert len(b.buffer_layouts[0]) == len(layout) + 1
+    assert b.gx_lists[0][0].data[0] != 99
+
+def test_frozen_tables_pickle():
+    flver = read(Fixtures.flver(meshes=2))
+    copy = pickle.loads(pickle.dumps(flver))
+    assert tuple(copy.gx_lists[0]) == tuple(flver.gx_lists[0])
+    assert copy.gx_lists[0].terminator_id == flver.gx_lists[0].terminator_id
+    assert tuple(copy.buffer_layouts[0]) == tuple(flver.buffer_layouts[0])
+
+def test_intern_limit(monkeypatch):
+    monkeypatch.setattr(BufferLayout, "INTERN_LIMIT", 1)
+    BufferLayout.clear_interned()
+    read(Fixtures.flver(meshes=2, layouts=("static", "skinned")))
+    assert len(BufferLayout.interned) == 1
+    BufferLayout.clear_interned()
+    GXList.clear_interned()
+    assert not BufferLayout.interned and not GXList.interned
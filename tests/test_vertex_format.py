@@ -0,0 +1,86 @@
+import random
+from struct import Struct, calcsize
+import pytest
+from ..benchmarks.fixtures import Fixtures
+from ..formats.flver import FLVER
+from ..formats.flver2.flver2 import FLVER2
+from ..formats.flver2.layout_compiler import LayoutCompiler
+from ..formats.flver2.vertex_decoder import VertexDecoder
+from ..formats.flver2.vertex_encoder import VertexEncoder
+from ..formats.flver2.vertex_format import VertexFormat
+from ..util.binary_reader_ex import BinaryReaderEx
+
+np = pytest.importorskip("numpy")
+
+MEMBERS = sorted(VertexFormat.members, key=lambda key: (key[0].value, key[1].value))
+
+def member_buffer(semantic, type, vertex_count: int, big_endian: bool, seed: int) -> bytes:
+    # Random fields that pass the member's checks, floats kept finite.
+    format = VertexFormat.members[(semantic, type)]
+    s = Struct((">" if big_endian else "<") + format.codes)
+    rnd = random.Random(seed)
+    limits = {"b": (-128, 127), "B": (0, 255), "h": (-32768, 32767), "H": (0, 65535)}
+    buffer = bytearray()
+    for _ in range(vertex_count):
+        values = [rnd.uniform(-2, 2) if code == "f" else rnd.randint(*limits[code]) for code in format.codes]
+        for field in format.zero_fields:
+            values[field] = 0
+        for field in format.whole_fields:
+            values[field] = float(rnd.randint(-3, 3))
+        buffer += s.pack(*values)
+    return bytes(buffer)
+
+def read(data: bytes) -> FLVER2:
+    flver = FLVER2()
+    flver.read(BinaryReaderEx(False, data))
+    return flver
+
+@pytest.mark.parametrize("semantic, type", MEMBERS)
+def test_codes_match_member_size(semantic, type):
+    assert calcsize("<" + VertexFormat.members[(semantic, type)].codes) == FLVER.LayoutMember(type, semantic, 0, 0).size()
+
+@pytest.mark.parametrize("big_endian", [False, True])
+@pytest.mark.parametrize("semantic, type", MEMBERS)
+def test_numpy_and_compiler_decode_match(semantic, type, big_endian):
+    layout = [FLVER.LayoutMember(type, semantic, 0, 0)]
+    buffer = member_buffer(semantic, type, 50, big_endian, type.value)
+    arrays = VertexDecoder.decode(layout, buffer, 50, big_endian, 2048.0)
+    columns, components = LayoutCompiler.compile(layout, big_endian, 2048.0).decode(buffer, 50)
+
+    assert arrays.keys() == columns.keys()
+    for key, array in arrays.items():
+        assert array.shape == (50, components[key])
+        assert array.dtype == (np.int32 if columns[key].typecode == "i" else np.float32)
+        assert np.array_equal(array.ravel(), np.array(columns[key], array.dtype))
+
+@pytest.mark.parametrize("big_endian", [False, True])
+@pytest.mark.parametrize("semantic, type", [key for key in MEMBERS if VertexFormat.members[key].outputs])
+def test_encode_restores_buffer(semantic, type, big_endian):
+    layout = [FLVER.LayoutMember(type, semantic, 0, 0)]
+    buffer = member_buffer(semantic, type, 50, big_endian, type.value)
+    arrays = VertexDecoder.decode(layout, buffer, 50, big_endian, 2048.0)
+    encoded = VertexEncoder.encode(layout, arrays, 50, big_endian, 2048.0, {})
+    # Fields no output reads (a FLOAT4 position's W) are written as 0, which the zero checks require anyway.
+    assert encoded == buffer
+
+def test_unsupported_member_raises():
+    layout = [FLVER.LayoutMember(FLVER.LayoutMember.LayoutType.BYTE4E, FLVER.LayoutMember.LayoutSemantic.UV, 0, 0)]
+    with pytest.raises(NotImplementedError, match="Read not implemented"):
+        VertexDecoder.decode(layout, bytes(4), 1, False, 1024.0)
+    with pytest.raises(NotImplementedError, match="Read not implemented"):
+        LayoutCompiler.compile(layout, False, 1024.0)
+    with pytest.raises(NotImplementedError, match="Write not implemented"):
+        VertexEncoder.encode(layout, {}, 1, False, 1024.0, {})
+
+@pytest.mark.parametrize("big_endian", [False, True])
+def test_flver_reads_the_same_without_numpy(monkeypatch, big_endian):
+    data = Fixtures.flver(meshes=3, vertices=300, layouts=("static", "skinned", "wide"), big_endian=big_endian, seed=7)
+    expected = read(data)
+    monkeypatch.setattr(VertexDecoder, "available", staticmethod(lambda: False))
+    actual = read(data)
+
+    for mesh, other in zip(expected.meshes, actual.meshes):
+        assert mesh.vertex_data.arrays.keys() == other.vertex_data.arrays.keys()
+        for key, array in mesh.vertex_data.arrays.items():
+            components = other.vertex_data.components[key]
+            assert np.array_equal(array, np.array(other.vertex_data.arrays[key], array.dtype).reshape(-1, components)), key
@@ -1,57 +1,165 @@
+import re
+import sys
+import codecs
+import mmap
 from io import BytesIO
+from array import array
 from enum import Enum, IntEnum
-from struct import unpack
-from typing import Callable, TypeVar, List
-from mathutils import Vector, Color
-from .binary_reader import BinaryReader, Endian, Whence
+from struct import Struct, unpack_from
+from typing import Callable, Dict, TypeVar, List, Tuple, Union
+from .vector import Vector2, Vector3, Vector4
+from .binary_reader import Whence
 
 class Encoding(Enum):
     ASCII = "ascii"
     SHIFT_JIS = "shift_jis"
     UTF_16 = "utf-16"
     UTF_16_BE = "utf-16-be"
+    UTF_16_LE = "utf-16-le"
+
+# Terminator scans for null terminated strings, run directly over the buffer. A UTF-16 string
+# ends at the first pair of null bytes aligned to the start of the string.
+NULL = re.compile(rb"\0")
+NULL_PAIR = re.compile(rb"\0\0")
+UTF_16_ENCODINGS = (Encoding.UTF_16_LE, Encoding.UTF_16_BE)
+# Codec functions looked up once, str(view, encoding) repeats the lookup on every call.
+DECODERS = {encoding: codecs.getdecoder(encoding.value) for encoding in Encoding}
+
+# Precompiled structs for every primitive, one table per byte order.
+STRUCTS = {
+    endian: {f: Struct(endian + f) for f in ("b", "B", "h", "H", "i", "I", "q", "Q", "f", "2f", "3f", "4f", "4B")}
+    for endian in ("<", ">")
+}
 
 class BinaryReaderEx:
-    stream: BytesIO
-    binary_reader: BinaryReader
-    stack = []
-    big_endian = False
-
-    def __init__(self, big_endian: bool, stream: BytesIO):
+    buffer: memoryview
+    position: int
+    length: int
+    stack: List[int]
+    strings: Dict[Tuple[int, Encoding], Tuple[str, int]]
+    # File the whole buffer was mapped from by from_path, None for any other stream.
+    path: str
+
+    def __init__(self, big_endian: bool, stream: Union[BytesIO, bytes, bytearray, memoryview, mmap.mmap]):
+        # BytesIO is accepted for compatibility, but only its buffer is kept:
+        # all reads go through a single memoryview and one integer cursor.
+        if isinstance(stream, BytesIO):
+            stream = stream.getbuffer()
+        self.buffer = memoryview(stream).cast("B")
+        self.position = 0
+        self.length = self.buffer.nbytes
+        self.stack = []
+        self.strings = {}
+        self.path = None
         self.big_endian = big_endian
-        self.stream = stream
-        endian = Endian.LITTLE
-        if big_endian:
-            endian = Endian.BIG
-        self.binary_reader = BinaryReader(stream.getvalue(), endian)
+
+    @staticmethod
+    def from_path(path: str, big_endian: bool = False) -> "BinaryReaderEx":
+        # Maps the file read-only instead of reading it onto the heap, pages are loaded as they are touched.
+        # The mapping is released once the reader and every view taken from it are gone.
+        with open(path, "rb") as f:
+            if f.seek(0, Whence.END) == 0:
+                br = BinaryReaderEx(big_endian, b"")
+            else:
+                br = BinaryReaderEx(big_endian, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        br.path = path
+        return br
+
+    @property
+    def big_endian(self) -> bool:
+        return self._big_endian
+
+    @big_endian.setter
+    def big_endian(self, big_endian: bool):
+        self._big_endian = big_endian
+        structs = STRUCTS[">" if big_endian else "<"]
+        self._utf16 = Encoding.UTF_16_BE if big_endian else Encoding.UTF_16_LE
+        self._s_byte = structs["b"]
+        self._byte = structs["B"]
+        self._int16 = structs["h"]
+        self._uint16 = structs["H"]
+        self._int32 = structs["i"]
+        self._uint32 = structs["I"]
+        self._int64 = structs["q"]
+        self._single = structs["f"]
+        self._vector2 = structs["2f"]
+        self._vector3 = structs["3f"]
+        self._vector4 = structs["4f"]
+        self._byte4 = structs["4B"]
+
+    @property
+    def stream(self) -> "BinaryReaderEx.StreamView":
+        return BinaryReaderEx.StreamView(self)
+
+    class StreamView:
+        # Minimal file-like view over the reader's cursor for code written against the old BytesIO stream.
+        def __init__(self, br: "BinaryReaderEx"):
+            self.br = br
+
+        def tell(self) -> int:
+            return self.br.position
+
+        def seek(self, offset: int, whence: int = Whence.BEGIN) -> int:
+            if whence == Whence.CUR:
+                offset += self.br.position
+            elif whence == Whence.END:
+                offset += self.br.length
+            self.br.seek(offset)
+            return offset
+
+        def read(self, size: int = -1) -> bytes:
+            if size < 0:
+                size = self.br.length - self.br.position
+            return self.br.read_bytes(min(size, self.br.length - self.br.position))
+
+        def getbuffer(self) -> memoryview:
+            return self.br.buffer
+
+        def getvalue(self) -> bytes:
+            return self.br.buffer.tobytes()
 
     #region HELPER FUNCTIONS
     def set_big_endian(self, big_endian: bool):
         self.big_endian = big_endian
-        endian = Endian.LITTLE
-        if big_endian:
-            endian = Endian.BIG
-        self.binary_reader.set_endian(endian)
 
     def endian(self, f: str | bytes) -> str | bytes:
         return f'>{f}' if self.big_endian else f'<{f}'
 
     def step_in(self, offset: int):
-        self.stack.append(self.stream.tell())
-        self.stream.seek(offset)
-        self.binary_reader.seek(self.stream.tell())
+        self.stack.append(self.position)
+        self.seek(offset)
 
     def step_out(self):
-        self.stream.seek(self.stack.pop())    
-        self.binary_reader.seek(self.stream.tell())
+        self.position = self.stack.pop()
 
     def skip(self, offset: int):
-        self.stream.seek(self.stream.tell() + offset)
-        self.binary_reader.seek(self.stream.tell())
+        self.seek(self.position + offset)
 
     def seek(self, pos: int):
-        self.stream.seek(pos)
-        self.binary_reader.seek(pos)
+        if pos < 0 or pos > self.length:
+            raise ValueError(f"Cannot seek to 0x{pos:X}, stream length is 0x{self.length:X}.")
+        self.position = pos
+
+    def unpack(self, s: Struct):
+        values = s.unpack_from(self.buffer, self.position)
+        self.position += s.size
+        return values
+
+    def get_unpacked(self, s: Struct, offset: int):
+        return s.unpack_from(self.buffer, offset)
+
+    def get_array(self, typecode: str, offset: int, length: int) -> array:
+        # Copies a run of fixed size values in one go, swapping bytes only if the data isn't native order.
+        values = array(typecode)
+        values.frombytes(self.get_view(offset, length * values.itemsize))
+        if self.big_endian != (sys.byteorder == "big"):
+            values.byteswap()
+        return values
+
+    def read_array(self, typecode: str, length: int) -> array:
+        values = self.get_array(typecode, self.position, length)
+        self.position += length * values.itemsize
+        return values
     #endregion
 
     #region VALUE
@@ -66,45 +174,56 @@ class BinaryReaderEx:
         result = read_values(length)
         self.step_out()
         return result
-     
+
     def assert_value(self, value, type_name, value_format, options):
         for option in options:
             if value == option:
                 return value
-            
+
         str_value = str.format(value_format, value)
         str_options = ', '.join(value_format.format(o) for o in options)
-        raise AssertionError(f"Read {type_name}: {str_value} | Expected: {str_options} | Ending position: 0x{self.stream.tell():X}")
+        raise AssertionError(f"Read {type_name}: {str_value} | Expected: {str_options} | Ending position: 0x{self.position:X}")
     #endregion
 
     #region BYTE
     def assert_byte(self, *options):
-        return self.assert_value(ord(self.read_byte()), "Byte", "0x{0:X}", options)
+        return self.assert_value(self.read_uint8(), "Byte", "0x{0:X}", options)
+
+    def read_uint8(self) -> int:
+        value = self._byte.unpack_from(self.buffer, self.position)[0]
+        self.position += 1
+        return value
+
+    def get_uint8(self, offset: int) -> int:
+        return self.buffer[offset]
 
     def read_byte(self):
-        self.stream.seek(1, Whence.CUR)
-        return self.binary_reader.read_bytes()
+        return self.read_bytes(1)
 
     def get_byte(self, offset: int):
-        return self.get_value(self.read_byte, offset)
+        return self.get_bytes(offset, 1)
 
     def get_bytes(self, offset: int, length: int):
-        self.step_in(offset)
-        result = self.read_bytes(length)
-        self.step_out()
-        return result
-    
+        return self.get_view(offset, length).tobytes()
+
     def read_s_byte(self):
-        self.stream.seek(1, Whence.CUR)
-        signed_byte = unpack('b', self.read_byte())[0]
-        return signed_byte
-    
+        value = self._s_byte.unpack_from(self.buffer, self.position)[0]
+        self.position += 1
+        return value
+
+    def read_view(self, length: int) -> memoryview:
+        view = self.get_view(self.position, length)
+        self.position += length
+        return view
+
+    def get_view(self, offset: int, length: int) -> memoryview:
+        end = offset + length
+        if length < 0 or offset < 0 or end > self.length:
+            raise ValueError("Remaining size of stream was smaller than requested number of bytes.")
+        return self.buffer[offset:end]
+
     def read_bytes(self, length: int):
-        self.stream.seek(length, Whence.CUR)
-        bytes = self.binary_reader.read_bytes(length)
-        if len(bytes) != length:
-             raise ValueError("Remaining size of stream was smaller than requested number of bytes.")
-        return bytes
+        return self.read_view(length).tobytes()
 
     def read_reversed_bytes(self, length: int):
         bytes = self.read_bytes(length)[::-1]
@@ -118,24 +237,20 @@ class BinaryReaderEx:
         for value in values:
             if s == value:
                 valid = True
-        
+
         if not valid:
             raise AssertionError(f"Read ASCII: {s} | Expected ASCII: {', '.join(values)} ")
 
         return s
 
     def read_chars(self, encoding: Encoding, length: int):
-        bytes = self.read_bytes(length)
-        return bytes.decode(encoding.value)
+        return str(self.read_view(length), encoding.value)
 
     def read_ascii(self, length: int):
         return self.read_chars(Encoding.ASCII, length)
 
     def get_ascii(self, offset, length):
-        self.step_in(offset)
-        result = self.read_ascii(length)
-        self.step_out()
-        return result
+        return str(self.get_view(offset, length), Encoding.ASCII.value)
     #endregion
 
     #region INT_16
@@ -143,37 +258,39 @@ class BinaryReaderEx:
         return self.assert_value(self.read_int16(), "Int16", "0x{0:X}", options)
 
     def read_int16(self) -> int:
-        return unpack(self.endian('h'), self.read_bytes(2))[0]
-    
+        value = self._int16.unpack_from(self.buffer, self.position)[0]
+        self.position += 2
+        return value
+
     def read_int16s(self, length: int) -> list:
-        result = []
-        for i in range(length):
-            result.append(self.read_int16())
+        result = self.get_int16s(self.position, length)
+        self.position += length * 2
         return result
-    
+
     def get_int16(self, offset: int):
-        return self.get_value(self.read_int16, offset)
-    
+        return self._int16.unpack_from(self.buffer, offset)[0]
+
     def get_int16s(self, offset: int, length: int) -> list:
-        return self.get_values(self.read_int16s, offset, length)
-    
+        return list(unpack_from(self.endian(f'{length}h'), self.buffer, offset))
+
     #endregion
 
     #region UINT_16
     def read_uint16(self):
-        return unpack(self.endian('H'), self.read_bytes(2))[0]
-    
+        value = self._uint16.unpack_from(self.buffer, self.position)[0]
+        self.position += 2
+        return value
+
     def read_uint16s(self, length: int):
-        result = []
-        for i in range(length):
-            result.append(self.read_uint16())
+        result = self.get_uint16s(self.position, length)
+        self.position += length * 2
         return result
 
     def get_uint16(self, offset: int):
-        return self.get_value(self.read_uint16, offset)
-    
+        return self._uint16.unpack_from(self.buffer, offset)[0]
+
     def get_uint16s(self, offset: int, length: int):
-        return self.get_values(self.read_uint16s, offset, length)
+        return list(unpack_from(self.endian(f'{length}H'), self.buffer, offset))
     #endregion
 
     #region INT_32
@@ -181,25 +298,28 @@ class BinaryReaderEx:
         return self.assert_value(self.read_int32(), "Int32", "0x{0:X}", options)
 
     def read_int32(self) -> int:
-        return unpack(self.endian('i'), self.read_bytes(4))[0]
-    
+        value = self._int32.unpack_from(self.buffer, self.position)[0]
+        self.position += 4
+        return value
+
     def read_int32s(self, length: int) -> list:
-        result = []
-        for i in range(length):
-            result.append(self.read_int32())
+        result = self.get_int32s(self.position, length)
+        self.position += length * 4
         return result
-        
+
     def get_int32(self, offset: int):
-        return self.get_value(self.read_int32, offset)
-    
+        return self._int32.unpack_from(self.buffer, offset)[0]
+
     def get_int32s(self, offset: int, length: int) -> list:
-        return self.get_values(self.read_int32s, offset, length)
+        return list(unpack_from(self.endian(f'{length}i'), self.buffer, offset))
 
     #endregion
 
     #region UINT_32
     def read_uint32(self):
-        return unpack(self.endian('I'), self.read_bytes(4))[0]
+        value = self._uint32.unpack_from(self.buffer, self.position)[0]
+        self.position += 4
+        return value
     #endregion
 
     #region INT_64
@@ -207,15 +327,17 @@ class BinaryReaderEx:
         return self.assert_value(self.read_int64(), "Int64", "0x{0:X}", options)
 
     def read_int64(self) -> int:
-        return unpack(self.endian('q'), self.read_bytes(8))[0]
+        value = self._int64.unpack_from(self.buffer, self.position)[0]
+        self.position += 8
+        return value
 
     def get_int64(self, offset: int):
-        return self.get_value(self.read_int64, offset)
+        return self._int64.unpack_from(self.buffer, offset)[0]
     #endregion
 
     #region BOOLEAN
     def read_boolean(self):
-        b = ord(self.read_byte())
+        b = self.read_uint8()
         if b == 0:
             return False
         elif b == 1:
@@ -227,130 +349,107 @@ class BinaryReaderEx:
     #region STRING
     def read_fixed_str(self, length: int):
         bytes = self.read_bytes(length)
-        
-        for terminator in range(length):
-            if bytes[terminator] == 0:
-                break
-        
+        terminator = bytes.find(0)
+        if terminator == -1:
+            terminator = length
         return bytes[0:terminator].decode(Encoding.SHIFT_JIS.value)
-    
+
+    def get_terminated(self, offset: int, encoding: Encoding) -> Tuple[str, int]:
+        # Decoded string and the offset past its terminator. Name tables repeat the same offsets
+        # and the same names, so results are kept per offset and the strings interned.
+        key = (offset, encoding)
+        result = self.strings.get(key)
+        if result is None:
+            if encoding in UTF_16_ENCODINGS:
+                match = NULL_PAIR.search(self.buffer, offset)
+                while match is not None and (match.start() - offset) % 2:
+                    match = NULL_PAIR.search(self.buffer, match.start() + 1)
+                terminator_size = 2
+            else:
+                match = NULL.search(self.buffer, offset)
+                terminator_size = 1
+            end = match.start() if match is not None else self.length
+            if end + terminator_size > self.length:
+                raise ValueError("Remaining size of stream was smaller than requested number of bytes.")
+            result = self.strings[key] = (sys.intern(DECODERS[encoding](self.buffer[offset:end])[0]), end + terminator_size)
+        return result
+
     def read_chars_terminated(self, encoding: Encoding):
-        bytes = bytearray()
-        
-        b = self.read_byte()
-        while(b != 0):
-            bytes.append(b)
-            b = self.read_byte()
-        
-        return bytes.decode(encoding.value)
+        value, self.position = self.get_terminated(self.position, encoding)
+        return value
 
     def read_utf16(self):
-        bytes = bytearray()
-        pair = self.read_bytes(2)
-        while(pair[0] != 0 or pair[1] != 0):
-            bytes.append(pair[0])
-            bytes.append(pair[1])
-            pair = self.read_bytes(2)
-        
-        if self.big_endian:
-            return bytes.decode(Encoding.UTF_16_BE.value)
-        else:
-            return bytes.decode(Encoding.UTF_16.value)
+        return self.read_chars_terminated(self._utf16)
 
     def get_utf16(self, offset: int):
-        self.step_in(offset)
-        result = self.read_utf16()
-        self.step_out()
-        return result
-    
+        return self.get_terminated(offset, self._utf16)[0]
+
     def read_shift_jis(self):
         return self.read_chars_terminated(Encoding.SHIFT_JIS)
 
-
     def get_shit_jis(self, offset: int):
-        self.step_in(offset)
-        result = self.read_shift_jis()
-        self.step_out()
-        return result
+        return self.get_terminated(offset, Encoding.SHIFT_JIS)[0]
     #endregion
-    
+
     #region SINGLE
     def read_single(self) -> float:
-        return unpack(self.endian('f'), self.read_bytes(4))[0]
-    
+        value = self._single.unpack_from(self.buffer, self.position)[0]
+        self.position += 4
+        return value
+
     def read_singles(self, length: int) -> List[float]:
-        result = []
-        for i in range(length):
-            result[i] = self.read_single()
+        result = list(unpack_from(self.endian(f'{length}f'), self.buffer, self.position))
+        self.position += length * 4
         return result
-        
+
     def get_single(self, offset: int) ->float:
-        return self.get_value(self.read_single(), offset)
-    
+        return self._single.unpack_from(self.buffer, offset)[0]
+
     def assert_single(self, *options) -> float:
         return self.assert_value(self.read_single(), "Single", "{0}", options)
     #endregion
 
     #region VECTOR
-    def read_vector2(self) -> Vector:
-        x: float = self.read_single()
-        y: float = self.read_single()
-        return Vector((x,y))
-
-    def read_vector3(self) -> Vector:   
-        x: float = self.read_single()
-        y: float = self.read_single()
-        z: float = self.read_single()
-        return Vector((x,y,z))
-
-    def read_vector4(self) -> Vector:
-        x: float = self.read_single()
-        y: float = self.read_single()
-        z: float = self.read_single()
-        w: float = self.read_single()
-        return Vector((x,y,z,w))
+    def read_vector2(self) -> Vector2:
+        return self.unpack(self._vector2)
+
+    def read_vector3(self) -> Vector3:
+        return self.unpack(self._vector3)
+
+    def read_vector4(self) -> Vector4:
+        return self.unpack(self._vector4)
     #endregion
 
     #region COLOR
-    def read_arbg(self) -> Vector:
-        a: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        r: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        b: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        g: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        return Vector((a, r, b, g))
-    
-    def read_abgr(self) -> Vector:
-        a: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        b: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        g: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        r: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        return Vector((a, r, b, g))
-    
-    def read_rgba(self) -> Vector:
-        r: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        g: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        b: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        a: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        return Vector((a, r, b, g))
-    
-    def read_bgra(self) -> Vector:
-        b: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        g: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        r: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        a: float = int.from_bytes(self.read_byte(), 'big' if self.big_endian else 'little')/255.0
-        return Vector((a, r, b, g))
+    def read_arbg(self) -> Vector4:
+        a, r, b, g = self.unpack(self._byte4)
+        return (a/255.0, r/255.0, b/255.0, g/255.0)
+
+    def read_abgr(self) -> Vector4:
+        a, b, g, r = self.unpack(self._byte4)
+        return (a/255.0, r/255.0, b/255.0, g/255.0)
+
+    def read_rgba(self) -> Vector4:
+        r, g, b, a = self.unpack(self._byte4)
+        return (a/255.0, r/255.0, b/255.0, g/255.0)
+
+    def read_bgra(self) -> Vector4:
+        b, g, r, a = self.unpack(self._byte4)
+        return (a/255.0, r/255.0, b/255.0, g/255.0)
     #endregion
 
     #region PATTERN
     def assert_pattern(self, length:int, pattern: int):
-        bytes = self.read_bytes(length)
+        bytes = self.read_view(length)
+        if bytes == pattern.to_bytes(1, 'little') * length:
+            return
 
         for i, b in enumerate(bytes):
             if b != pattern:
-                raise AssertionError(f"Expected {length} 0x{pattern:X2}, got {b:X2} at position {i}")
-                
+                raise AssertionError(f"Expected {length} 0x{pattern:02X}, got {b:02X} at position {i}")
+
     #endregion
-    
+
     #region ENUM
     T = TypeVar('T')
     def read_enum(self, enum_type: T, read_value: Callable, value_format: str) -> T:
@@ -359,7 +458,7 @@ class BinaryReaderEx:
             str_value = value_format.format(value)
             raise ValueError(f"Read Byte not present in enum: {str_value}")
         return enum_type(value)
-    
+
     def read_enum32(self, enum_type: T) -> T:
-        self.read_enum(enum_type, self.read_uint32, "0x{0:X}")
-    #endregion
\ No newline at end of file
+        return self.read_enum(enum_type, self.read_uint32, "0x{0:X}")
+    #endregion
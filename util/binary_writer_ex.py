@@ -0,0 +1,169 @@
+import sys
+from array import array
+from struct import Struct
+from typing import Dict, Tuple
+from .vector import Vector2, Vector3, Vector4
+from .binary_reader_ex import STRUCTS, Encoding
+
+class BinaryWriterEx:
+    # Counterpart of BinaryReaderEx that appends to a single bytearray. Offsets that are only known
+    # later are written as named placeholders with reserve_* and patched in place with fill_*.
+    buffer: bytearray
+    reservations: Dict[str, Tuple[int, Struct]]
+
+    def __init__(self, big_endian: bool):
+        self.buffer = bytearray()
+        self.reservations = {}
+        self.big_endian = big_endian
+
+    @property
+    def big_endian(self) -> bool:
+        return self._big_endian
+
+    @big_endian.setter
+    def big_endian(self, big_endian: bool):
+        self._big_endian = big_endian
+        self._structs = STRUCTS[">" if big_endian else "<"]
+
+    @property
+    def position(self) -> int:
+        return len(self.buffer)
+
+    def finish(self) -> bytearray:
+        if self.reservations:
+            raise RuntimeError(f"Not all reservations filled: {', '.join(self.reservations)}")
+        return self.buffer
+
+    #region HELPER FUNCTIONS
+    def pack(self, f: str, *values):
+        self.buffer += self._structs[f].pack(*values)
+
+    def pack_struct(self, s: Struct, *values):
+        # Multi-field records, the counterpart of BinaryReaderEx.unpack. s carries its own byte order.
+        self.buffer += s.pack(*values)
+
+    def pad(self, alignment: int):
+        self.buffer += bytes(-len(self.buffer) % alignment)
+
+    def reserve(self, name: str, f: str):
+        if name in self.reservations:
+            raise ValueError(f"Key already reserved: {name}")
+        self.reservations[name] = (self.position, self._structs[f])
+        self.buffer += bytes(self._structs[f].size)
+
+    def fill(self, name: str, value):
+        if name not in self.reservations:
+            raise ValueError(f"Key is not reserved: {name}")
+        position, s = self.reservations.pop(name)
+        s.pack_into(self.buffer, position, value)
+
+    def reserve_int32(self, name: str):
+        self.reserve(name, "i")
+
+    def fill_int32(self, name: str, value: int):
+        self.fill(name, value)
+
+    def reserve_int64(self, name: str):
+        self.reserve(name, "q")
+
+    def fill_int64(self, name: str, value: int):
+        self.fill(name, value)
+
+    def write_array(self, values):
+        # Bulk copy of an array.array or ndarray, swapped to the writer's byte order if needed.
+        if isinstance(values, array):
+            if self.big_endian != (sys.byteorder == "big") and values.itemsize > 1:
+                values = array(values.typecode, values)
+                values.byteswap()
+            self.buffer += values.tobytes()
+        else:
+            endian = ">" if self.big_endian else "<"
+            if values.dtype.itemsize > 1 and values.dtype.byteorder not in (endian, "|"):
+                values = values.astype(values.dtype.newbyteorder(endian))
+            self.buffer += values.tobytes()
+    #endregion
+
+    #region VALUE
+    def write_byte(self, value: int):
+        self.buffer.append(value)
+
+    def write_s_byte(self, value: int):
+        self.pack("b", value)
+
+    def write_bytes(self, value):
+        self.buffer += value
+
+    def write_pattern(self, length: int, pattern: int):
+        self.buffer += pattern.to_bytes(1, "little") * length
+
+    def write_boolean(self, value: bool):
+        self.buffer.append(1 if value else 0)
+
+    def write_int16(self, value: int):
+        self.pack("h", value)
+
+    def write_int16s(self, values):
+        for value in values:
+            self.pack("h", value)
+
+    def write_uint16(self, value: int):
+        self.pack("H", value)
+
+    def write_int32(self, value: int):
+        self.pack("i", value)
+
+    def write_int32s(self, values):
+        for value in values:
+            self.pack("i", value)
+
+    def write_uint32(self, value: int):
+        self.pack("I", value)
+
+    def write_int64(self, value: int):
+        self.pack("q", value)
+
+    def write_single(self, value: float):
+        self.pack("f", value)
+    #endregion
+
+    #region STRING
+    def write_fixed_str(self, value: str, length: int):
+        encoded = value.encode(Encoding.SHIFT_JIS.value)[:length]
+        self.buffer += encoded + bytes(length - len(encoded))
+
+    def write_utf16(self, value: str, terminate: bool = True):
+        self.buffer += value.encode((Encoding.UTF_16_BE if self.big_endian else Encoding.UTF_16_LE).value)
+        if terminate:
+            self.buffer += b"\0\0"
+
+    def write_shift_jis(self, value: str, terminate: bool = True):
+        self.buffer += value.encode(Encoding.SHIFT_JIS.value)
+        if terminate:
+            self.buffer.append(0)
+    #endregion
+
+    #region VECTOR
+    def write_vector2(self, value: Vector2):
+        self.pack("2f", *value)
+
+    def write_vector3(self, value: Vector3):
+        self.pack("3f", *value)
+
+    def write_vector4(self, value: Vector4):
+        self.pack("4f", *value)
+    #endregion
+
+    #region COLOR
+    # Colors are the (a, r, b, g) tuples produced by BinaryReaderEx.
+    @staticmethod
+    def color_bytes(value: Vector4) -> Tuple[int, int, int, int]:
+        return tuple(max(0, min(255, round(c * 255.0))) for c in value)
+
+    def write_arbg(self, value: Vector4):
+        a, r, b, g = BinaryWriterEx.color_bytes(value)
+        self.pack("4B", a, r, b, g)
+
+    def write_bgra(self, value: Vector4):
+        a, r, b, g = BinaryWriterEx.color_bytes(value)
+        self.pack("4B", b, g, r, a)
+    #endregion
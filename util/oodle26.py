@@ -2,7 +2,8 @@ from ctypes import *
 from enum import Enum
 from os import getcwd
 
-oodle26DLL = cdll.LoadLibrary(getcwd() + "\\lib\\oo2core_6_win64.dll")
+# Loaded on first use, only KRAK compressed DCX files need it.
+oodle26DLL = None
 
 class oodlelz_fuzzsafe(Enum):
     OODLELZ_FUZZSAFE_NO = 0 
@@ -28,8 +29,20 @@ class oodlelz_decode_threadphase(Enum):
 
 
 class Oodle26:
+    @staticmethod
+    def load():
+        global oodle26DLL
+        if oodle26DLL is None:
+            path = getcwd() + "\\lib\\oo2core_6_win64.dll"
+            try:
+                oodle26DLL = cdll.LoadLibrary(path)
+            except OSError as e:
+                raise RuntimeError(f"Oodle is required to decompress KRAK DCX files but could not be loaded from {path}.") from e
+        return oodle26DLL
+
     @staticmethod
     def decompress(source: bytes, uncompressed_size: int) -> bytearray:
+        oodle26DLL = Oodle26.load()
         decoded_buffer_size = oodle26DLL.OodleLZ_GetDecodeBufferSize(uncompressed_size, True)
         raw_buf = bytearray(decoded_buffer_size)
         char_array = c_char * decoded_buffer_size
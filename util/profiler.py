@@ -0,0 +1,98 @@
+import json
+from time import perf_counter
+from contextlib import contextmanager, nullcontext
+from typing import Dict
+from .binary_reader_ex import BinaryReaderEx
+
+class Profiler:
+    # Opt-in per phase timing, passed as profiler= to FLVER2.read_path, FLVER2.read and Importer.do_import.
+    # Phases are recorded either as laps, the time since the previous lap or start, or as sections
+    # wrapping a block. With br given, the bytes of a lap are how far the reader advanced.
+    class Section:
+        def __init__(self, name: str):
+            self.name = name
+            self.seconds = 0.0
+            self.bytes = 0
+            self.count = 0
+            self.calls = 0
+
+    class Disabled:
+        # Used in place of a profiler when none is passed, so the hot path only pays a no-op call per phase.
+        # Callers check enabled before computing counts or bytes that only a lap would use.
+        enabled = False
+
+        def start(self, br: BinaryReaderEx = None):
+            pass
+
+        def lap(self, name: str, br: BinaryReaderEx = None, count: int = 0, bytes: int = 0):
+            pass
+
+        def section(self, name: str, count: int = 0, bytes: int = 0):
+            return nullcontext()
+
+    DISABLED = Disabled()
+
+    enabled = True
+    sections: Dict[str, Section]
+
+    def __init__(self):
+        self.sections = {}
+        self.created = perf_counter()
+        self.start()
+
+    @staticmethod
+    def get(profiler: "Profiler") -> "Profiler":
+        return Profiler.DISABLED if profiler is None else profiler
+
+    def add(self, name: str, seconds: float, count: int = 0, bytes: int = 0):
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = Profiler.Section(name)
+        section.seconds += seconds
+        section.count += count
+        section.bytes += bytes
+        section.calls += 1
+
+    def start(self, br: BinaryReaderEx = None):
+        self.__lap_time = perf_counter()
+        self.__lap_position = br.position if br is not None else 0
+
+    def lap(self, name: str, br: BinaryReaderEx = None, count: int = 0, bytes: int = 0):
+        now = perf_counter()
+        if br is not None:
+            bytes += br.position - self.__lap_position
+            self.__lap_position = br.position
+        self.add(name, now - self.__lap_time, count, bytes)
+        self.__lap_time = perf_counter()
+
+    @contextmanager
+    def section(self, name: str, count: int = 0, bytes: int = 0):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start, count, bytes)
+            self.__lap_time = perf_counter()
+
+    def report(self) -> Dict:
+        total = sum(section.seconds for section in self.sections.values())
+        return {
+            "elapsed_seconds": perf_counter() - self.created,
+            "total_seconds": total,
+            "sections": {name: {
+                "seconds": section.seconds,
+                "percent": section.seconds / total * 100 if total else 0.0,
+                "bytes": section.bytes,
+                "count": section.count,
+                "calls": section.calls,
+            } for name, section in self.sections.items()},
+        }
+
+    def to_json(self, indent: int = 1) -> str:
+        return json.dumps(self.report(), indent=indent)
+
+    def format(self) -> str:
+        lines = [f"{'section':20} {'ms':>10} {'%':>6} {'bytes':>12} {'count':>8}"]
+        for name, section in self.report()["sections"].items():
+            lines.append(f"{name:20} {section['seconds'] * 1000:10.3f} {section['percent']:6.1f} {section['bytes']:12} {section['count']:8}")
+        return "\n".join(lines)
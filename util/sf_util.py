@@ -1,4 +1,3 @@
-from io import BytesIO
 from typing import List
 from datetime import *
 from ..formats.dcx import DCX
@@ -8,11 +7,25 @@ class SFUtil:
     @staticmethod
     def get_decompressed_br(br: BinaryReaderEx, compression: DCX.CompressionType) -> BinaryReaderEx:
         if DCX.is_dcx(br): 
+            if DCX.cache is not None:
+                return DCX.cache.decompress(br)
             bytes: bytearray = DCX.decompress(br, compression)
-            return BinaryReaderEx(False, BytesIO(bytes))
+            return BinaryReaderEx(False, bytes)
         else:
             return br
 
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        path = path.strip().replace("\\", "/").lower()
+        return path if path.startswith("/") else "/" + path
+
+    @staticmethod
+    def from_path_hash(path: str) -> int:
+        hash = 0
+        for c in SFUtil.normalize_path(path):
+            hash = (hash * 37 + ord(c)) & 0xFFFFFFFF
+        return hash
+
     @staticmethod
     def date_to_binder_timestamp(date_time: datetime):
         year: int = date_time.year - 2000
@@ -0,0 +1,7 @@
+from typing import Tuple
+
+# The format layer keeps vectors and colors as plain tuples, so it has no Blender dependency
+# and reading one costs a single unpack. Convert to mathutils types only on the Blender side.
+Vector2 = Tuple[float, float]
+Vector3 = Tuple[float, float, float]
+Vector4 = Tuple[float, float, float, float]